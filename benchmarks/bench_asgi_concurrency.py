@@ -0,0 +1,107 @@
+"""Requests/sec of the WSGI and ASGI apps at high concurrency.
+
+Serves the Flask app from `create_app` with Werkzeug's threaded server
+and the ASGI app with uvicorn, then fires GET /api/projects/<id>/tasks at
+each from --concurrency concurrent clients. Runs against the database
+named by DATABASE_URL. Seeded rows are removed afterwards.
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_asgi_concurrency.py --concurrency 200
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import httpx
+from sqlalchemy import delete, insert
+
+from projects.entrypoints.flask import create_app, db
+from projects.adapters.projects.orm import projects
+from projects.adapters.tasks.orm import tasks
+from projects.adapters.users.orm import users
+from projects.domain.user import User
+
+
+def serve_wsgi(port):
+    from werkzeug.serving import run_simple
+    run_simple('127.0.0.1', port, create_app(), threaded=True)
+
+
+def serve_asgi(port):
+    import uvicorn
+    from projects.entrypoints.asgi import create_app as create_asgi_app
+    uvicorn.run(create_asgi_app(), host='127.0.0.1', port=port, log_level='warning',
+                timeout_keep_alive=60)
+
+
+async def load(url, headers, requests, concurrency):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        for _ in range(50):
+            try:
+                await client.get(url, headers=headers)
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+
+        remaining = requests
+        failures = 0
+
+        async def worker():
+            nonlocal remaining, failures
+            while remaining > 0:
+                remaining -= 1
+                try:
+                    response = await client.get(url, headers=headers)
+                except httpx.TransportError:
+                    failures += 1
+                else:
+                    failures += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--port', type=int, default=8950)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        user = User(username='bench-asgi', email='bench-asgi@example.com', is_manager=True)
+        user.issue_token()
+        db.session.add(user)
+        project_id = db.session.execute(
+            insert(projects).values(name='bench-asgi').returning(projects.c.id)).scalar()
+        db.session.execute(insert(tasks), [
+            {'project_id': project_id, 'name': f'task-{i}', 'status': 'NEW'} for i in range(20)])
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {user.token}'}
+
+    try:
+        for port, (name, serve) in enumerate((('wsgi', serve_wsgi), ('asgi', serve_asgi)), args.port):
+            server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+            server.start()
+            try:
+                url = f'http://127.0.0.1:{port}/api/projects/{project_id}/tasks'
+                elapsed, failures = asyncio.run(
+                    load(url, headers, args.requests, args.concurrency))
+            finally:
+                server.terminate()
+                server.join()
+            print(f"{name}: {args.requests} requests, concurrency {args.concurrency}, "
+                  f"{args.requests / elapsed:.0f} req/s, {failures} failed")
+    finally:
+        with app.app_context():
+            db.session.execute(delete(tasks).where(tasks.c.project_id == project_id))
+            db.session.execute(delete(projects).where(projects.c.id == project_id))
+            db.session.execute(delete(users).where(users.c.username == 'bench-asgi'))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Bulk vs. per-task creation of tasks.
+
+Creates the same number of tasks through POST /api/projects/<id>/tasks
+(one request per task) and through POST /api/projects/<id>/tasks/bulk,
+against the database named by DATABASE_URL. Seeded rows are removed
+afterwards.
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_bulk_task_create.py --tasks 2000
+"""
+import argparse
+import time
+
+from sqlalchemy import delete
+
+from projects.entrypoints.flask import create_app, db
+from projects.adapters.projects.orm import projects
+from projects.adapters.tasks.orm import tasks
+from projects.adapters.users.orm import users
+from projects.domain.user import User
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        user = User(username='bench-bulk', email='bench-bulk@example.com', is_manager=True)
+        user.issue_token()
+        db.session.add(user)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {user.token}'}
+
+    project_ids = []
+    try:
+        for mode in ('per-task', 'bulk'):
+            project_id = client.post(
+                '/api/projects', json={'name': f'bench-{mode}'}, headers=headers
+            ).get_json()['id']
+            project_ids.append(project_id)
+            payload = [{'name': f'task-{i}', 'status': 'NEW'} for i in range(args.tasks)]
+
+            start = time.perf_counter()
+            if mode == 'bulk':
+                response = client.post(
+                    f'/api/projects/{project_id}/tasks/bulk', json=payload, headers=headers)
+                assert response.status_code == 201, response.get_json()
+            else:
+                for item in payload:
+                    response = client.post(
+                        f'/api/projects/{project_id}/tasks', json=item, headers=headers)
+                    assert response.status_code == 201, response.get_json()
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>9}: {args.tasks} tasks in {elapsed:.2f}s "
+                  f"({args.tasks / elapsed:.0f} tasks/s)")
+    finally:
+        with app.app_context():
+            db.session.execute(delete(tasks).where(tasks.c.project_id.in_(project_ids)))
+            db.session.execute(delete(projects).where(projects.c.id.in_(project_ids)))
+            db.session.execute(delete(users).where(users.c.username == 'bench-bulk'))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Import time of the projects package, measured with ``python -X importtime``.
+
+Imports --module in a fresh interpreter --runs times and reports the
+median cumulative import time and the modules with the largest own
+import time. Exits non-zero when one of the lazily loaded components
+(spec generation, Swagger UI, migrations) is imported eagerly again, or
+when the median exceeds --budget-ms.
+
+    python benchmarks/bench_import_time.py --runs 7 --budget-ms 600
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+LAZY = ('apispec', 'marshmallow', 'flask_migrate', 'alembic', 'flask_swagger_ui')
+
+
+def import_times(module):
+    """Runs one import and returns {module: (self_us, cumulative_us)}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='projects.entrypoints.flask')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=0)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [times[args.module][1] / 1000 for times in runs]
+    median = statistics.median(totals)
+    print(f"{args.module}: median {median:.1f}ms over {args.runs} runs "
+          f"(min {min(totals):.1f}ms, max {max(totals):.1f}ms)")
+
+    last = runs[-1]
+    packages = {}
+    for name, (own, _) in last.items():
+        top = name.split('.')[0]
+        packages[top] = packages.get(top, 0) + own
+    print(f"\nown import time by top-level package (last run):")
+    for top, own in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{own / 1000:>9.1f}ms  {top}")
+
+    failed = False
+    eager = sorted(top for top in packages if top in LAZY)
+    if eager:
+        print(f"\nFAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms and median > args.budget_ms:
+        print(f"\nFAIL: median {median:.1f}ms is over the {args.budget_ms:.0f}ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
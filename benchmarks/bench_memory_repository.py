@@ -0,0 +1,59 @@
+"""Service-layer handler throughput on the in-memory repositories.
+
+Times the task and token handlers against InMemoryUnitOfWork, with no
+database, so changes to the handlers themselves can be measured in
+isolation.
+
+    python benchmarks/bench_memory_repository.py --projects 100 --tasks 100
+"""
+import argparse
+import time
+
+# Importing the Flask package maps the domain classes onto the tables.
+import projects.entrypoints.flask  # noqa: F401
+from projects.domain.user import User
+from projects.service_layer.projects import handlers as project_handlers
+from projects.service_layer.tasks import handlers as task_handlers
+from projects.service_layer.tasks.summary_cache import summary_cache
+from projects.service_layer.users import handlers as user_handlers
+from projects.service_layer.unit_of_work import InMemoryUnitOfWork
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {count} calls in {elapsed * 1000:.1f}ms "
+          f"({count / elapsed:,.0f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--tasks', type=int, default=100)
+    args = parser.parse_args()
+
+    summary_cache.configure(0)
+    uow = InMemoryUnitOfWork()
+    project_ids = []
+    timed('create_project', args.projects, lambda i: project_ids.append(
+        project_handlers.create_project(f'project-{i}', None, uow).id))
+    timed('create_task', args.projects * args.tasks, lambda i: task_handlers.create_task(
+        project_ids[i % args.projects], f'task-{i}', 'NEW' if i % 3 else 'DONE', uow))
+    timed('get_tasks_for_project', args.projects * 10, lambda i: task_handlers.get_tasks_for_project(
+        project_ids[i % args.projects], uow, status='DONE', limit=20))
+    timed('update_task_status', args.projects * 10, lambda i: task_handlers.update_task_status(
+        project_ids[i % args.projects], i + 1, 'IN_PROGRESS', uow))
+    timed('get_task_summary', args.projects, lambda i: task_handlers.get_task_summary(
+        uow, project_ids[i]))
+
+    users = [User(username=f'user-{i}', email=f'user-{i}@example.com') for i in range(1000)]
+    for user in users:
+        uow.users.create(user)
+    tokens = [user_handlers.issue_new_token(user, 60, uow) for user in users]
+    timed('check_token', len(tokens), lambda i: user_handlers.check_token(tokens[i], uow))
+
+
+if __name__ == '__main__':
+    main()
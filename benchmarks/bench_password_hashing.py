@@ -0,0 +1,46 @@
+"""Login throughput vs. password hashing pool size.
+
+Simulates concurrent logins, each verifying one password hash, against
+PasswordHasher configured with increasing pool sizes.
+
+    python benchmarks/bench_password_hashing.py --logins 64 --threads 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+from projects.service_layer.users.password_hasher import PasswordHasher
+
+
+def run(hasher: PasswordHasher, password_hash: str, logins: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(
+            lambda _: hasher.verify(password_hash, 'secret'), range(logins)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--method', default='scrypt')
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--pool-sizes', default='0,1,2,4,8')
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash('secret', args.method)
+    print(f"{'workers':>8} {'logins/s':>10}")
+    for workers in [int(n) for n in args.pool_sizes.split(',')]:
+        hasher = PasswordHasher(args.method, workers, max_queue=args.logins)
+        hasher.verify(password_hash, 'secret')  # start the pool
+        rate = run(hasher, password_hash, args.logins, args.threads)
+        hasher.configure(args.method, 0, 0)
+        print(f"{workers:>8} {rate:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
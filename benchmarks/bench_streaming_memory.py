@@ -0,0 +1,108 @@
+"""Peak RSS of GET /api/projects/<id>/tasks?stream=1 vs. row count.
+
+Seeds one project per row count into the database named by DATABASE_URL,
+then measures each request in a fresh subprocess so peak RSS is not
+shared between runs. The "list" mode materializes the same rows the way
+the non-streaming handlers do, for comparison. Seeded rows are removed
+afterwards.
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_streaming_memory.py
+"""
+import argparse
+import resource
+import subprocess
+import sys
+
+from sqlalchemy import delete, insert
+
+from projects.entrypoints.flask import create_app, db
+from projects.adapters.projects.orm import projects
+from projects.adapters.tasks.orm import tasks
+from projects.adapters.users.orm import users
+from projects.domain.user import User
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode, project_id, token):
+    app = create_app()
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/', headers=headers)
+    before = peak_rss_kb()
+    if mode == 'stream':
+        response = client.get(
+            f'/api/projects/{project_id}/tasks?stream=1', headers=headers)
+        size = sum(len(chunk) for chunk in response.response)
+    else:
+        from projects.service_layer import unit_of_work
+        from projects.service_layer.tasks import handlers
+        with app.app_context():
+            rows = handlers.get_tasks_for_project(
+                project_id, unit_of_work.SqlAlchemyUnitOfWork(db))
+            size = len(app.json.dumps(
+                [{"id": t.id, "name": t.name, "status": t.status} for t in rows]))
+    print(peak_rss_kb() - before, size)
+
+
+def seed(counts):
+    user = User(username='bench-streaming', email='bench-streaming@example.com',
+                is_manager=True)
+    user.issue_token()
+    db.session.add(user)
+    db.session.flush()
+    project_ids = {}
+    for count in counts:
+        project_id = db.session.execute(
+            insert(projects).values(name=f'bench-{count}').returning(projects.c.id)
+        ).scalar()
+        for start in range(0, count, 10000):
+            db.session.execute(insert(tasks), [
+                {'project_id': project_id, 'name': f'task-{i}', 'status': 'NEW'}
+                for i in range(start, min(count, start + 10000))
+            ])
+        project_ids[count] = project_id
+    db.session.commit()
+    return user.token, project_ids
+
+
+def cleanup(project_ids):
+    ids = list(project_ids.values())
+    db.session.execute(delete(tasks).where(tasks.c.project_id.in_(ids)))
+    db.session.execute(delete(projects).where(projects.c.id.in_(ids)))
+    db.session.execute(delete(users).where(users.c.username == 'bench-streaming'))
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--counts', default='1000,10000,100000')
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'PROJECT_ID', 'TOKEN'))
+    args = parser.parse_args()
+
+    if args.child:
+        mode, project_id, token = args.child
+        child(mode, int(project_id), token)
+        return
+
+    counts = [int(n) for n in args.counts.split(',')]
+    app = create_app()
+    with app.app_context():
+        token, project_ids = seed(counts)
+        try:
+            print(f"{'rows':>8} {'mode':>7} {'peak RSS +KiB':>14} {'bytes':>12}")
+            for count in counts:
+                for mode in ('stream', 'list'):
+                    out = subprocess.run(
+                        [sys.executable, __file__, '--child', mode,
+                         str(project_ids[count]), token],
+                        check=True, capture_output=True, text=True).stdout.split()
+                    print(f"{count:>8} {mode:>7} {int(out[-2]):>14} {int(out[-1]):>12}")
+        finally:
+            cleanup(project_ids)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""First-request latency of a freshly forked worker, with and without warmup().
+
+Builds the app once, as a preloading server does, then forks --runs
+workers per mode. Each worker calls after_fork(), and in the 'warmup'
+mode also warmup(). It then times its first GET /api/projects/<id>
+against the median of the next --requests. Runs against the database
+named by DATABASE_URL. Seeded rows are removed afterwards.
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_worker_warmup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from sqlalchemy import delete, insert
+
+from projects.entrypoints.flask import create_app, db
+from projects.entrypoints.flask.startup import after_fork, warmup
+from projects.adapters.projects.orm import projects
+from projects.adapters.users.orm import users
+from projects.domain.user import User
+
+
+def run_worker(app, url, headers, requests, warm):
+    after_fork(app)
+    if warm:
+        warmup(app)
+    client = app.test_client()
+
+    def request():
+        started = time.perf_counter()
+        assert client.get(url, headers=headers).status_code == 200
+        return time.perf_counter() - started
+
+    first = request()
+    return {'first': first, 'steady': statistics.median(request() for _ in range(requests))}
+
+
+def in_child(fn):
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        with os.fdopen(write, 'w') as out:
+            json.dump(fn(), out)
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as result:
+        output = result.read()
+    os.waitpid(pid, 0)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        user = User(username='bench-warmup', email='bench-warmup@example.com', is_manager=True)
+        user.issue_token()
+        db.session.add(user)
+        project_id = db.session.execute(
+            insert(projects).values(name='bench-warmup').returning(projects.c.id)).scalar()
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {user.token}'}
+    url = f'/api/projects/{project_id}'
+    # The test client encodes the host name with idna on first use; a server does not.
+    import encodings.idna  # noqa: F401
+
+    try:
+        print(f"{'mode':>8} {'first ms':>9} {'steady ms':>10} {'ratio':>6}")
+        for mode in ('cold', 'warmup'):
+            results = [in_child(lambda: run_worker(app, url, headers, args.requests, mode == 'warmup'))
+                       for _ in range(args.runs)]
+            first = statistics.median(r['first'] for r in results)
+            steady = statistics.median(r['steady'] for r in results)
+            print(f"{mode:>8} {first * 1000:>9.2f} {steady * 1000:>10.2f} {first / steady:>6.1f}")
+    finally:
+        with app.app_context():
+            db.session.execute(delete(projects).where(projects.c.id == project_id))
+            db.session.execute(delete(users).where(users.c.username == 'bench-warmup'))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""add tasks (project_id, status, id) index
+
+Revision ID: 8a4e61d0c5f2
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 10:14:37.902113
+
+The index serves the task list filtered by status (ordered by id), the
+per-status summary and the project delete. Its leading columns cover the
+tasks.project_id foreign key and (project_id, status) lookups. It cannot
+return one project's tasks in id order across statuses, so the
+unfiltered task list has its own (project_id, id) index (c41d7b2e9f03).
+
+On Postgres the index is built with CREATE INDEX CONCURRENTLY outside the
+migration transaction, so the tasks table stays writable while it builds.
+An invalid index left behind by an interrupted build is dropped first.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e61d0c5f2'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_tasks_project_id_status_id'
+
+
+def drop_invalid_index(name):
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name='tasks', postgresql_concurrently=True)
+
+
+def upgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        op.create_index(INDEX, 'tasks', ['project_id', 'status', 'id'], unique=False)
+        return
+    with op.get_context().autocommit_block():
+        drop_invalid_index(INDEX)
+        op.create_index(INDEX, 'tasks', ['project_id', 'status', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        op.drop_index(INDEX, table_name='tasks')
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='tasks', postgresql_concurrently=True, if_exists=True)
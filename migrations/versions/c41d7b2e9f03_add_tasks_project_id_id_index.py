@@ -0,0 +1,55 @@
+"""add tasks (project_id, id) index
+
+Revision ID: c41d7b2e9f03
+Revises: 8a4e61d0c5f2
+Create Date: 2026-10-18 14:36:52.117604
+
+The index serves the unfiltered task list of a project, a keyset page
+ordered by id (WHERE project_id = ? AND id > ? ORDER BY id LIMIT n), as
+one range scan. The (project_id, status, id) index cannot return those
+rows in id order.
+
+As in 8a4e61d0c5f2, the index is built with CREATE INDEX CONCURRENTLY on
+Postgres, outside the migration transaction, so the tasks table stays
+writable while it builds. An invalid index left behind by an
+interrupted build is dropped first.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7b2e9f03'
+down_revision = '8a4e61d0c5f2'
+branch_labels = None
+depends_on = None
+
+INDEX = 'ix_tasks_project_id_id'
+
+
+def drop_invalid_index(name):
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, table_name='tasks', postgresql_concurrently=True)
+
+
+def upgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        op.create_index(INDEX, 'tasks', ['project_id', 'id'], unique=False)
+        return
+    with op.get_context().autocommit_block():
+        drop_invalid_index(INDEX)
+        op.create_index(INDEX, 'tasks', ['project_id', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_context().dialect.name != 'postgresql':
+        op.drop_index(INDEX, table_name='tasks')
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='tasks', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""cascade task deletes from their project
+
+Revision ID: e5b83f1a6c27
+Revises: c41d7b2e9f03
+Create Date: 2026-10-18 16:02:44.530718
+
+Recreates the tasks.project_id foreign key with ON DELETE CASCADE, so
+deleting a project row removes its tasks even when the delete does not
+go through delete_project.
+
+On Postgres the new key is added NOT VALID and validated in its own
+transaction. Adding it only locks the tasks table briefly. The
+validating scan still allows writes to the table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b83f1a6c27'
+down_revision = 'c41d7b2e9f03'
+branch_labels = None
+depends_on = None
+
+# The baseline left the key unnamed; this is Postgres's default name.
+FOREIGN_KEY = 'tasks_project_id_fkey'
+# Names the unnamed key on SQLite, whose tables batch mode copies.
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def replace_foreign_key(ondelete):
+    if op.get_context().dialect.name != 'postgresql':
+        with op.batch_alter_table('tasks', naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(FOREIGN_KEY, type_='foreignkey')
+            batch_op.create_foreign_key(FOREIGN_KEY, 'projects', ['project_id'], ['id'],
+                                        ondelete=ondelete)
+        return
+    op.drop_constraint(FOREIGN_KEY, 'tasks', type_='foreignkey')
+    op.create_foreign_key(FOREIGN_KEY, 'tasks', 'projects', ['project_id'], ['id'],
+                          ondelete=ondelete, postgresql_not_valid=True)
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f'ALTER TABLE tasks VALIDATE CONSTRAINT {FOREIGN_KEY}'))
+
+
+def upgrade():
+    replace_foreign_key('CASCADE')
+
+
+def downgrade():
+    replace_foreign_key(None)
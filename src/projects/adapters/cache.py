@@ -0,0 +1,267 @@
+import abc
+import fnmatch
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class AbstractCacheBackend(abc.ABC):
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LocalCacheBackend(AbstractCacheBackend):
+    """Bounded in-process LRU cache whose entries expire after their ttl."""
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InMemoryKeyValueStore:
+    """Local stand-in for an out-of-process store such as Redis.
+
+    Implements the subset of the redis-py client used by
+    ``KeyValueCacheBackend``: ``get``, ``set(ex=...)``, ``delete`` and
+    ``scan_iter``. Values are bytes, as they would be on the wire.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                del self._values[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ex: Optional[float] = None) -> None:
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def scan_iter(self, match: str = '*'):
+        with self._lock:
+            keys = [key for key in self._values if fnmatch.fnmatchcase(key, match)]
+        return iter(keys)
+
+
+class KeyValueCacheBackend(AbstractCacheBackend):
+    """Stores entries as JSON in a shared key-value store.
+
+    ``client`` is anything with the redis-py ``get``/``set``/``delete``/
+    ``scan_iter`` methods, e.g. ``redis.Redis.from_url(...)``; entries are
+    then shared by every worker process. Keys are namespaced by ``prefix``.
+    """
+
+    def __init__(self, client=None, prefix: str = 'projects:') -> None:
+        self.client = client if client is not None else InMemoryKeyValueStore()
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value).encode(), ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in list(self.client.scan_iter(match=self.prefix + '*')):
+            self.client.delete(key)
+
+
+def make_keyvalue_client(url: str):
+    """A redis-py client for KEYVALUE_STORE_URL, or a per-process store when it is empty."""
+    if not url:
+        return InMemoryKeyValueStore()
+    try:
+        import redis
+    except ImportError:
+        raise ValueError("KEYVALUE_STORE_URL needs the redis package (pip install redis)") from None
+    return redis.Redis.from_url(url)
+
+
+def make_backend(name: str, maxsize: int, client=None) -> Optional[AbstractCacheBackend]:
+    """Builds the backend named by ENTITY_CACHE_BACKEND, or None for 'none'."""
+    if name == 'local':
+        return LocalCacheBackend(maxsize)
+    if name == 'keyvalue':
+        return KeyValueCacheBackend(client)
+    if name == 'none':
+        return None
+    raise ValueError(f"Unknown entity cache backend: {name}")
+
+
+class EntityCache:
+    """Read-through cache of entity fields, keyed by kind and id.
+
+    Keeps hit and miss counters per kind so the hit rate can be reported.
+    """
+
+    def __init__(self, backend: Optional[AbstractCacheBackend] = None, ttl: float = 30) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self._counts: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, backend: Optional[AbstractCacheBackend], ttl: float) -> None:
+        with self._lock:
+            self.backend = backend
+            self.ttl = ttl
+            self._counts.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    def get(self, kind: str, id: int) -> Optional[Any]:
+        value = self.backend.get(f'{kind}:{id}')
+        with self._lock:
+            counts = self._counts.setdefault(kind, [0, 0])
+            counts[0 if value is not None else 1] += 1
+        return value
+
+    def set(self, kind: str, id: int, entity: Any) -> None:
+        self.backend.set(f'{kind}:{id}', entity, self.ttl)
+
+    def invalidate(self, kind: str, id: Optional[int]) -> None:
+        if id is not None:
+            self.backend.delete(f'{kind}:{id}')
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+        with self._lock:
+            self._counts.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds = {
+                kind: {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                }
+                for kind, (hits, misses) in self._counts.items()
+            }
+        hits = sum(k['hits'] for k in kinds.values())
+        misses = sum(k['misses'] for k in kinds.values())
+        return {
+            'backend': type(self.backend).__name__ if self.backend is not None else None,
+            'ttl': self.ttl,
+            'size': len(self.backend) if self.backend is not None else 0,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'kinds': kinds,
+        }
+
+
+class CachingRepositoryMixin:
+    """Read-through ``get`` and write-through invalidation for a repository.
+
+    ``repo`` is the wrapped repository. The cache holds a dict of the
+    entity's ``fields``; ``_restore`` turns it back into a detached entity,
+    which ``repo.attach`` binds to the session. ``defer``, when given,
+    schedules a callable to run after the surrounding transaction commits,
+    so an entry that another reader cached from the pre-commit row is
+    dropped again.
+    """
+    kind: str
+    fields: Tuple[str, ...]
+
+    def __init__(self, repo, cache: EntityCache,
+                 defer: Optional[Callable[[Callable[[], None]], None]] = None) -> None:
+        self.repo = repo
+        self.cache = cache
+        self.defer = defer
+
+    def _cached_get(self, id: int, load: Callable[[], Any]):
+        cached = self.cache.get(self.kind, id)
+        if cached is not None:
+            return self.repo.attach(self._restore(cached))
+        entity = load()
+        if entity is not None:
+            self.cache.set(self.kind, id, {field: getattr(entity, field) for field in self.fields})
+        return entity
+
+    def _restore(self, fields: dict):
+        raise NotImplementedError
+
+    def _invalidate(self, id: Optional[int]) -> None:
+        self.cache.invalidate(self.kind, id)
+        if self.defer is not None:
+            self.defer(lambda: self.cache.invalidate(self.kind, id))
+
+    def detach(self, entity):
+        return self.repo.detach(entity)
+
+    def attach(self, entity):
+        return self.repo.attach(entity)
+
+
+entity_cache = EntityCache()
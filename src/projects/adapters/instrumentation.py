@@ -0,0 +1,73 @@
+import contextvars
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+_current: contextvars.ContextVar[Optional['QueryRecorder']] = contextvars.ContextVar(
+    'query_recorder', default=None)
+
+
+class QueryRecorder:
+    """Counts the statements one request sends and the time they take.
+
+    Statements are grouped by their SQL text, which is already
+    parameterised, so the same query run for many different ids shows up
+    as one shape with a high count.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.time += elapsed
+        self.shapes[' '.join(statement.split())] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run at least ``threshold`` times, most frequent first."""
+        if threshold <= 0:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def start_recording() -> contextvars.Token:
+    return _current.set(QueryRecorder())
+
+
+def stop_recording(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def current_recorder() -> Optional[QueryRecorder]:
+    return _current.get()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Reports every statement executed on ``engine`` to the active recorder."""
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _current.get()
+    if recorder is not None and conn.info.get('query_start'):
+        recorder.record(statement, time.perf_counter() - conn.info['query_start'].pop())
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = context.connection
+    if conn is not None and conn.info.get('query_start'):
+        conn.info['query_start'].pop()
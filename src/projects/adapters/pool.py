@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+
+from sqlalchemy import Engine, event, exc, make_url
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self._stats_lock = threading.Lock()
+        self._waiting = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outermost call.
+        if getattr(self._waiting, 'active', False):
+            return super()._do_get()
+        self._waiting.active = True
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self._waiting.active = False
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_time += elapsed
+                self.max_wait = max(self.max_wait, elapsed)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_time_total': self.wait_time,
+                'wait_time_avg': self.wait_time / self.checkouts if self.checkouts else 0.0,
+                'wait_time_max': self.max_wait,
+            }
+
+
+def uses_queue_pool(url) -> bool:
+    """Whether SQLAlchemy pools ``url`` with a QueuePool when no poolclass is given.
+
+    In-memory SQLite gets a StaticPool or SingletonThreadPool instead.
+    """
+    url = make_url(url)
+    return not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'))
+
+
+def engine_options(config, url, poolclass=None) -> dict:
+    """SQLAlchemy engine options for ``url`` built from the DB_POOL_* settings.
+
+    ``poolclass`` and the sizing options are left out unless the engine
+    ends up with a QueuePool; the other pool classes reject them.
+    """
+    options = {
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+    if uses_queue_pool(url) and (poolclass is None or issubclass(poolclass, QueuePool)):
+        if poolclass is not None:
+            options['poolclass'] = poolclass
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+        )
+    return options
+
+
+def set_statement_timeout(engine: Engine, timeout_ms: int) -> None:
+    """Makes Postgres cancel any statement on ``engine`` running longer than ``timeout_ms``."""
+    if not timeout_ms or engine.dialect.name != 'postgresql':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_statement_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'SET statement_timeout = {int(timeout_ms)}')
+        cursor.close()
+        # Commit so the pool's rollback-on-return does not undo the SET.
+        dbapi_connection.commit()
+
+
+def pool_stats(engine: Engine) -> dict:
+    pool = engine.pool
+    stats = {'pid': os.getpid(), 'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.stats())
+    return stats
@@ -0,0 +1,96 @@
+from typing import AsyncIterator, List, Optional
+import abc
+
+from sqlalchemy import delete, orm, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from projects.domain import project
+
+
+class AbstractAsyncProjectRepository(abc.ABC):
+
+    @abc.abstractmethod
+    async def create(self, project: project.Project):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update(self, project: project.Project) -> Optional[project.Project]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, id: int, include_tasks: bool = False):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, project: project.Project):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list(self, include_tasks: bool = False) -> List[project.Project]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def stream(self, batch_size: int = 1000,
+                     include_tasks: bool = False) -> AsyncIterator[project.Project]:
+        """Yields all projects by id without materializing the whole result."""
+        raise NotImplementedError
+
+
+class SqlAlchemyAsyncProjectRepository(AbstractAsyncProjectRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, project: project.Project):
+        self.session.add(project)
+
+    _columns = (project.Project.id, project.Project.name, project.Project.description)
+
+    async def update(self, p: project.Project) -> Optional[project.Project]:
+        """Writes the project with one UPDATE, or returns None if there is no such row."""
+        if p in self.session:
+            # The UPDATE below writes the changes; keep the flush from repeating it.
+            self.session.expunge(p)
+        values = {'name': p.name, 'description': p.description}
+        stmt = update(project.Project).where(project.Project.id == p.id).values(
+            **values).execution_options(synchronize_session=False)
+        if self.session.get_bind().dialect.update_returning:
+            row = (await self.session.execute(stmt.returning(*self._columns))).first()
+            row = row._asdict() if row is not None else None
+        else:
+            result = await self.session.execute(stmt)
+            row = {'id': p.id, **values} if result.rowcount else None
+        if row is None:
+            return None
+        for key, value in row.items():
+            setattr(p, key, value)
+        if orm.object_session(p) is None and orm.attributes.instance_state(p).key is None:
+            orm.make_transient_to_detached(p)
+        return p
+
+    def _select(self, include_tasks: bool = False):
+        query = select(project.Project)
+        if include_tasks:
+            query = query.options(orm.selectinload(project.Project.tasks))
+        return query
+
+    async def get(self, id: int, include_tasks: bool = False) -> project.Project:
+        return (await self.session.scalars(
+            self._select(include_tasks).filter_by(id=id))).one_or_none()
+
+    async def delete(self, p: project.Project) -> None:
+        """Deletes the project row; the foreign key cascades the delete to its tasks."""
+        id = p.id
+        # session.delete() would load every task to null out its project_id.
+        self.session.expunge(p)
+        await self.session.execute(
+            delete(project.Project).where(project.Project.id == id)
+            .execution_options(synchronize_session=False))
+
+    async def list(self, include_tasks: bool = False) -> List[project.Project]:
+        return (await self.session.scalars(self._select(include_tasks))).all()
+
+    async def stream(self, batch_size: int = 1000,
+                     include_tasks: bool = False) -> AsyncIterator[project.Project]:
+        return await self.session.stream_scalars(
+            self._select(include_tasks).order_by(project.Project.id)
+            .execution_options(yield_per=batch_size))
@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String
-from projects.domain import project
+from projects.domain import project, task
 from projects.entrypoints.flask import db
-from sqlalchemy.orm import registry
+from sqlalchemy.orm import registry, relationship
 
 projects = db.Table(
     "projects",
@@ -12,4 +12,6 @@ projects = db.Table(
 
 def start_mappers():
     mapper_registry = registry()
-    mapper_registry.map_imperatively(project.Project, projects)
\ No newline at end of file
+    mapper_registry.map_imperatively(project.Project, projects, properties={
+        "tasks": relationship(task.Task, order_by=lambda: task.Task.id),
+    })
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional
 import abc
+import itertools
 
-from sqlalchemy import exc
+from sqlalchemy import delete, exc, insert, update
 from sqlalchemy import orm
 
+from projects.adapters import cache
+from projects.adapters.tasks import repository as task_repository
 from projects.domain import project
 
 
@@ -14,11 +17,15 @@ class AbstractProjectRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def update(self, project: project.Project):
+    def update(self, project: project.Project) -> Optional[project.Project]:
+        """Writes the project's fields to the row with its id.
+
+        Returns the updated project, or None when no such row exists.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get(self, id: int):
+    def get(self, id: int, include_tasks: bool = False):
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -26,28 +33,182 @@ class AbstractProjectRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def list(self) -> List[project.Project]:
+    def list(self, include_tasks: bool = False) -> List[project.Project]:
         raise NotImplementedError
 
+    def stream(self, batch_size: int = 1000, include_tasks: bool = False) -> Iterator[project.Project]:
+        """Yields all projects without materializing the whole result."""
+        return iter(self.list(include_tasks=include_tasks))
+
+    def detach(self, project: project.Project) -> project.Project:
+        """Returns a copy of the project that is safe to keep across sessions."""
+        return project
+
+    def attach(self, project: project.Project) -> project.Project:
+        """Binds a detached copy to the current session without a query."""
+        return project
+
 
 class SqlAlchemyProjectRepository(AbstractProjectRepository):
-    def __init__(self, session: orm.Session):
-        self.session = session
+    """Projects in the database.
 
-    def create(self, project: project.Project):
-        self.session.add(project)
+    ``create`` and ``update`` write with ``INSERT/UPDATE ... RETURNING`` and
+    hand back a detached, fully loaded project, so reading it after the
+    commit does not trigger a refresh SELECT.
+    """
 
-    def update(self, project: project.Project) -> project.Project:
-        return project
+    def __init__(self, session: orm.Session):
+        self.session = session
 
-    def get(self, id: int) -> project.Project:
+    _columns = (project.Project.id, project.Project.name, project.Project.description)
+
+    def _values(self, p: project.Project) -> dict:
+        return {'name': p.name, 'description': p.description}
+
+    def _load(self, p: project.Project, row: dict) -> project.Project:
+        for key, value in row.items():
+            setattr(p, key, value)
+        if orm.object_session(p) is None and orm.attributes.instance_state(p).key is None:
+            orm.make_transient_to_detached(p)
+        return p
+
+    def create(self, p: project.Project) -> project.Project:
+        dialect = self.session.get_bind().dialect
+        stmt = insert(project.Project).values(**self._values(p))
+        if dialect.insert_returning:
+            row = self.session.execute(stmt.returning(*self._columns)).one()._asdict()
+        else:
+            result = self.session.execute(stmt)
+            row = {'id': result.inserted_primary_key[0], **self._values(p)}
+        self._load(p, row)
+        # A new project has no tasks; record that so reading them needs no query.
+        orm.attributes.set_committed_value(p, 'tasks', [])
+        return p
+
+    def update(self, p: project.Project) -> Optional[project.Project]:
+        if p in self.session:
+            # The UPDATE below writes the changes; keep the flush from repeating it.
+            self.session.expunge(p)
+        dialect = self.session.get_bind().dialect
+        stmt = update(project.Project).where(project.Project.id == p.id).values(
+            **self._values(p)).execution_options(synchronize_session=False)
+        if dialect.update_returning:
+            row = self.session.execute(stmt.returning(*self._columns)).first()
+            row = row._asdict() if row is not None else None
+        else:
+            result = self.session.execute(stmt)
+            row = {'id': p.id, **self._values(p)} if result.rowcount else None
+        return self._load(p, row) if row is not None else None
+
+    def _query(self, include_tasks: bool = False) -> orm.Query:
+        query = self.session.query(project.Project)
+        if include_tasks:
+            query = query.options(orm.selectinload(project.Project.tasks))
+        return query
+
+    def get(self, id: int, include_tasks: bool = False) -> project.Project:
         try:
-            return self.session.query(project.Project).filter_by(id=id).one()
+            return self._query(include_tasks).filter_by(id=id).one()
         except exc.NoResultFound:
             pass
 
+    def delete(self, p: project.Project) -> None:
+        """Deletes the project row; the foreign key cascades the delete to its tasks."""
+        id = p.id
+        if p in self.session:
+            # session.delete() would load every task to null out its project_id.
+            self.session.expunge(p)
+        self.session.execute(
+            delete(project.Project).where(project.Project.id == id)
+            .execution_options(synchronize_session=False))
+
+    def list(self, include_tasks: bool = False) -> List[project.Project]:
+        return self._query(include_tasks).all()
+
+    def stream(self, batch_size: int = 1000, include_tasks: bool = False) -> Iterator[project.Project]:
+        return self._query(include_tasks).order_by(
+            project.Project.id).yield_per(batch_size)
+
+    def detach(self, p: project.Project) -> project.Project:
+        copy = project.Project(id=p.id, name=p.name, description=p.description)
+        orm.make_transient_to_detached(copy)
+        return copy
+
+    def attach(self, p: project.Project) -> project.Project:
+        return self.session.merge(p, load=False)
+
+
+class InMemoryProjectRepository(AbstractProjectRepository):
+    """Projects held in a dict keyed by id, for tests and benchmarks.
+
+    ``tasks`` is the task repository that ``include_tasks`` reads from.
+    """
+
+    def __init__(self, tasks: Optional[task_repository.AbstractTaskRepository] = None):
+        self.tasks = tasks
+        self._projects: Dict[int, project.Project] = {}
+        self._ids = itertools.count(1)
+
+    def create(self, project: project.Project):
+        if project.id is None:
+            project.id = next(self._ids)
+        self._projects[project.id] = project
+
+    def update(self, project: project.Project) -> Optional[project.Project]:
+        stored = self._projects.get(project.id)
+        if stored is not None and stored is not project:
+            stored.name = project.name
+            stored.description = project.description
+        return stored
+
+    def get(self, id: int, include_tasks: bool = False) -> project.Project:
+        p = self._projects.get(id)
+        if p is not None and include_tasks:
+            self._load_tasks(p)
+        return p
+
     def delete(self, project: project.Project) -> None:
-        self.session.delete(project)
+        self._projects.pop(project.id, None)
+
+    def list(self, include_tasks: bool = False) -> List[project.Project]:
+        projects = [self._projects[id] for id in sorted(self._projects)]
+        if include_tasks:
+            for p in projects:
+                self._load_tasks(p)
+        return projects
+
+    def _load_tasks(self, p: project.Project) -> None:
+        p.tasks = self.tasks.list(p.id) if self.tasks is not None else []
+
+
+class CachingProjectRepository(cache.CachingRepositoryMixin, AbstractProjectRepository):
+    """Serves ``get`` from the entity cache; projects with tasks are not cached."""
+    kind = 'project'
+    fields = ('id', 'name', 'description')
+
+    def _restore(self, fields: dict) -> project.Project:
+        p = project.Project(**fields)
+        orm.make_transient_to_detached(p)
+        return p
+
+    def create(self, project: project.Project):
+        self.repo.create(project)
+
+    def update(self, project: project.Project) -> Optional[project.Project]:
+        self._invalidate(project.id)
+        return self.repo.update(project)
+
+    def get(self, id: int, include_tasks: bool = False) -> project.Project:
+        if include_tasks:
+            return self.repo.get(id, include_tasks=True)
+        return self._cached_get(id, lambda: self.repo.get(id))
+
+    def delete(self, project: project.Project) -> None:
+        self._invalidate(project.id)
+        self.repo.delete(project)
+
+    def list(self, include_tasks: bool = False) -> List[project.Project]:
+        return self.repo.list(include_tasks=include_tasks)
 
-    def list(self) -> List[project.Project]:
-        return self.session.query(project.Project).all()
\ No newline at end of file
+    def stream(self, batch_size: int = 1000, include_tasks: bool = False) -> Iterator[project.Project]:
+        return self.repo.stream(batch_size, include_tasks=include_tasks)
@@ -0,0 +1,56 @@
+import itertools
+from typing import List, Optional
+
+import flask_sqlalchemy.session
+from flask import Flask, current_app
+from sqlalchemy import Engine, create_engine, event
+
+from projects.adapters.pool import TimedQueuePool, engine_options
+
+_round_robin = itertools.count()
+
+
+def init_replicas(app: Flask, overrides: Optional[dict] = None) -> None:
+    """Creates one engine per SQLALCHEMY_REPLICA_URIS entry for the app.
+
+    ``overrides`` are engine options applied on top of the DB_POOL_* ones.
+    """
+    overrides = overrides or {}
+    poolclass = overrides.get('poolclass', TimedQueuePool)
+    app.extensions['replica_engines'] = [
+        create_engine(url, **{**engine_options(app.config, url, poolclass), **overrides})
+        for url in app.config['SQLALCHEMY_REPLICA_URIS']]
+
+
+def replica_engines() -> List[Engine]:
+    return current_app.extensions.get('replica_engines', [])
+
+
+class RoutingSession(flask_sqlalchemy.session.Session):
+    """Sends reads to a replica while ``info['use_replica']`` is set.
+
+    Flushes, DML, ``SELECT ... FOR UPDATE`` and every statement after the
+    session has written go to the primary, so a request reads its own
+    writes. Replicas are picked round-robin per statement.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._writes(clause) and self.info.get('use_replica'):
+            engines = replica_engines()
+            if engines:
+                return engines[next(_round_robin) % len(engines)]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _writes(self, clause) -> bool:
+        if self._flushing or self.info.get('has_written'):
+            return True
+        if clause is not None and (getattr(clause, 'is_dml', False)
+                                   or getattr(clause, '_for_update_arg', None) is not None):
+            self.info['has_written'] = True
+            return True
+        return False
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_written(session, flush_context):
+    session.info['has_written'] = True
@@ -0,0 +1,156 @@
+from typing import AsyncIterator, Dict, List, Optional
+import abc
+
+from sqlalchemy import delete, exc, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from projects.domain import task
+
+
+class AbstractAsyncTaskRepository(abc.ABC):
+
+    @abc.abstractmethod
+    async def create(self, task: task.Task):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update(self, task: task.Task):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, id: int):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, task: task.Task):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list(self, project_id: int, status: Optional[str] = None,
+                   after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def stream(self, project_id: int, status: Optional[str] = None,
+                     batch_size: int = 1000) -> AsyncIterator[task.Task]:
+        """Yields a project's tasks by id without materializing the whole result."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                            current_status: Optional[str] = None) -> List[task.Task]:
+        raise NotImplementedError
+
+
+class SqlAlchemyAsyncTaskRepository(AbstractAsyncTaskRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, task: task.Task):
+        self.session.add(task)
+
+    async def update(self, task: task.Task) -> task.Task:
+        return task
+
+    async def get(self, id: int) -> task.Task:
+        return (await self.session.scalars(
+            select(task.Task).filter_by(id=id))).one_or_none()
+
+    async def delete(self, task: task.Task) -> None:
+        await self.session.delete(task)
+
+    async def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        """Deletes the project's tasks with one set-based DELETE, as the sync repository does."""
+        criteria = task.Task.project_id == project_id
+        if limit is not None:
+            criteria = task.Task.id.in_(
+                select(task.Task.id).where(criteria).order_by(task.Task.id).limit(limit)
+                .scalar_subquery())
+        stmt = delete(task.Task).where(criteria).execution_options(synchronize_session=False)
+        if self.session.get_bind().dialect.delete_returning:
+            return (await self.session.scalars(stmt.returning(task.Task.id))).all()
+        ids = (await self.session.scalars(
+            select(task.Task.id).where(criteria).with_for_update())).all()
+        await self.session.execute(
+            delete(task.Task).where(task.Task.id.in_(ids))
+            .execution_options(synchronize_session=False))
+        return ids
+
+    async def list(self, project_id: int, status: Optional[str] = None,
+                   after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
+        query = select(task.Task).filter_by(project_id=project_id)
+        if status is not None:
+            query = query.filter_by(status=status)
+        if after is not None:
+            query = query.where(task.Task.id > after)
+        return (await self.session.scalars(query.order_by(task.Task.id).limit(limit))).all()
+
+    async def stream(self, project_id: int, status: Optional[str] = None,
+                     batch_size: int = 1000) -> AsyncIterator[task.Task]:
+        query = select(task.Task).filter_by(project_id=project_id)
+        if status is not None:
+            query = query.filter_by(status=status)
+        return await self.session.stream_scalars(
+            query.order_by(task.Task.id).execution_options(yield_per=batch_size))
+
+    async def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        query = select(
+            task.Task.project_id, task.Task.status, func.count(task.Task.id)
+        ).group_by(task.Task.project_id, task.Task.status)
+        if project_id is not None:
+            query = query.where(task.Task.project_id == project_id)
+        counts = {}
+        for row_project_id, status, count in await self.session.execute(query):
+            counts.setdefault(row_project_id, {})[status] = count
+        return counts
+
+    async def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        """Inserts tasks in executemany batches and returns their ids in input order."""
+        rows = [{"project_id": project_id, "name": t["name"], "status": t.get("status")} for t in tasks]
+        ids = []
+        if self.session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            stmt = insert(task.Task).returning(task.Task.id, sort_by_parameter_order=True)
+            for start in range(0, len(rows), batch_size):
+                ids.extend((await self.session.scalars(stmt, rows[start:start + batch_size])).all())
+        elif rows:
+            # Without ordered RETURNING the batches are plain executemany
+            # INSERTs, and the new ids are read back in key order, which is
+            # the insert order for sequence and auto-increment keys.
+            last_id = (await self.session.scalar(select(func.max(task.Task.id)))) or 0
+            for start in range(0, len(rows), batch_size):
+                await self.session.execute(insert(task.Task), rows[start:start + batch_size])
+            ids = (await self.session.scalars(
+                select(task.Task.id)
+                .where(task.Task.project_id == project_id, task.Task.id > last_id)
+                .order_by(task.Task.id))).all()
+            if len(ids) != len(rows):
+                raise exc.InvalidRequestError(
+                    f"Tasks were added to project {project_id} concurrently; "
+                    "their ids cannot be told apart from the new ones")
+        return ids
+
+    async def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                            current_status: Optional[str] = None) -> List[task.Task]:
+        """Sets the status of matching tasks in one UPDATE ... RETURNING."""
+        criteria = [task.Task.project_id == project_id]
+        if ids is not None:
+            criteria.append(task.Task.id.in_(ids))
+        if current_status is not None:
+            criteria.append(task.Task.status == current_status)
+        rows = (await self.session.execute(
+            update(task.Task).where(*criteria).values(status=status).returning(
+                task.Task.id, task.Task.project_id, task.Task.name, task.Task.status)
+        )).all()
+        return sorted((task.Task(**row._mapping) for row in rows), key=lambda t: t.id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Table, Index
 from projects.domain import project, task
 from projects.entrypoints.flask import db
 from sqlalchemy.orm import registry
@@ -6,9 +6,11 @@ from sqlalchemy.orm import registry
 tasks = db.Table(
     "tasks",
     Column("id", Integer, primary_key=True, autoincrement=True),
-    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
     Column("name", String(100), nullable=False),
-    Column("status", String(100), nullable=True)
+    Column("status", String(100), nullable=True),
+    Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+    Index("ix_tasks_project_id_id", "project_id", "id"),
 )
 
 def start_mappers():
@@ -1,9 +1,12 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 import abc
+import bisect
+import itertools
 
-from sqlalchemy import exc
+from sqlalchemy import delete, exc, func, insert, select, update
 from sqlalchemy import orm
 
+from projects.adapters import cache
 from projects.domain import  task
 
 class AbstractTaskRepository(abc.ABC):
@@ -13,7 +16,11 @@ class AbstractTaskRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def update(self, task: task.Task):
+    def update(self, task: task.Task) -> Optional[task.Task]:
+        """Writes the task's fields to the row with its id.
+
+        Returns the updated task, or None when no such row exists.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -25,18 +32,90 @@ class AbstractTaskRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def list(self) -> List[task.Task]:
+    def list(self, project_id: int, status: Optional[str] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                      current_status: Optional[str] = None) -> List[task.Task]:
+        raise NotImplementedError
+
+    def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        """Deletes the project's tasks, at most ``limit`` of them, and returns their ids."""
+        tasks = self.list(project_id, limit=limit)
+        for t in tasks:
+            self.delete(t)
+        return [t.id for t in tasks]
+
+    def stream(self, project_id: int, status: Optional[str] = None,
+               batch_size: int = 1000) -> Iterator[task.Task]:
+        """Yields the project's tasks without materializing the whole result."""
+        return iter(self.list(project_id, status=status))
+
+    def detach(self, task: task.Task) -> task.Task:
+        """Returns a copy of the task that is safe to keep across sessions."""
+        return task
+
+    def attach(self, task: task.Task) -> task.Task:
+        """Binds a detached copy to the current session without a query."""
+        return task
+
 class SqlAlchemyTaskRepository(AbstractTaskRepository):
+    """Tasks in the database.
+
+    ``create`` and ``update`` write with ``INSERT/UPDATE ... RETURNING`` and
+    hand back a detached, fully loaded task, so reading it after the
+    commit does not trigger a refresh SELECT.
+    """
+
     def __init__(self, session: orm.Session):
         self.session = session
 
-    def create(self, task: task.Task):
-        self.session.add(task)
+    _columns = (task.Task.id, task.Task.project_id, task.Task.name, task.Task.status)
 
-    def update(self, task: task.Task) -> task.Task:
-        return task
+    def _values(self, t: task.Task) -> dict:
+        return {'project_id': t.project_id, 'name': t.name, 'status': t.status}
+
+    def _load(self, t: task.Task, row: dict) -> task.Task:
+        for key, value in row.items():
+            setattr(t, key, value)
+        if orm.object_session(t) is None and orm.attributes.instance_state(t).key is None:
+            orm.make_transient_to_detached(t)
+        return t
+
+    def create(self, t: task.Task) -> task.Task:
+        dialect = self.session.get_bind().dialect
+        stmt = insert(task.Task).values(**self._values(t))
+        if dialect.insert_returning:
+            row = self.session.execute(stmt.returning(*self._columns)).one()._asdict()
+        else:
+            result = self.session.execute(stmt)
+            row = {'id': result.inserted_primary_key[0], **self._values(t)}
+        return self._load(t, row)
+
+    def update(self, t: task.Task) -> Optional[task.Task]:
+        if t in self.session:
+            # The UPDATE below writes the changes; keep the flush from repeating it.
+            self.session.expunge(t)
+        dialect = self.session.get_bind().dialect
+        stmt = update(task.Task).where(task.Task.id == t.id).values(
+            **self._values(t)).execution_options(synchronize_session=False)
+        if dialect.update_returning:
+            row = self.session.execute(stmt.returning(*self._columns)).first()
+            row = row._asdict() if row is not None else None
+        else:
+            result = self.session.execute(stmt)
+            row = {'id': t.id, **self._values(t)} if result.rowcount else None
+        return self._load(t, row) if row is not None else None
 
     def get(self, id: int) -> task.Task:
         try:
@@ -47,5 +126,271 @@ class SqlAlchemyTaskRepository(AbstractTaskRepository):
     def delete(self, task: task.Task) -> None:
         self.session.delete(task)
 
-    def list(self, project_id: int) -> List[task.Task]:
-        return self.session.query(task.Task).filter_by(project_id=project_id).all()
+    def list(self, project_id: int, status: Optional[str] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
+        query = self.session.query(task.Task).filter_by(project_id=project_id)
+        if status is not None:
+            query = query.filter_by(status=status)
+        if after is not None:
+            query = query.filter(task.Task.id > after)
+        return query.order_by(task.Task.id).limit(limit).all()
+
+    def stream(self, project_id: int, status: Optional[str] = None,
+               batch_size: int = 1000) -> Iterator[task.Task]:
+        query = self.session.query(task.Task).filter_by(project_id=project_id)
+        if status is not None:
+            query = query.filter_by(status=status)
+        return query.order_by(task.Task.id).yield_per(batch_size)
+
+    def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        query = self.session.query(
+            task.Task.project_id, task.Task.status, func.count(task.Task.id)
+        ).group_by(task.Task.project_id, task.Task.status)
+        if project_id is not None:
+            query = query.filter(task.Task.project_id == project_id)
+        counts = {}
+        for row_project_id, status, count in query:
+            counts.setdefault(row_project_id, {})[status] = count
+        return counts
+
+    def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        """Inserts tasks in executemany batches and returns their ids in input order."""
+        rows = [{"project_id": project_id, "name": t["name"], "status": t.get("status")} for t in tasks]
+        ids = []
+        if self.session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            stmt = insert(task.Task).returning(task.Task.id, sort_by_parameter_order=True)
+            for start in range(0, len(rows), batch_size):
+                ids.extend(self.session.scalars(stmt, rows[start:start + batch_size]).all())
+        elif rows:
+            # Without ordered RETURNING the batches are plain executemany
+            # INSERTs, and the new ids are read back in key order, which is
+            # the insert order for sequence and auto-increment keys.
+            last_id = self.session.scalar(select(func.max(task.Task.id))) or 0
+            for start in range(0, len(rows), batch_size):
+                self.session.execute(insert(task.Task), rows[start:start + batch_size])
+            ids = self.session.scalars(
+                select(task.Task.id)
+                .where(task.Task.project_id == project_id, task.Task.id > last_id)
+                .order_by(task.Task.id)).all()
+            if len(ids) != len(rows):
+                raise exc.InvalidRequestError(
+                    f"Tasks were added to project {project_id} concurrently; "
+                    "their ids cannot be told apart from the new ones")
+        return ids
+
+    def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                      current_status: Optional[str] = None) -> List[task.Task]:
+        """Sets the status of matching tasks in one UPDATE.
+
+        Returns snapshots of the updated rows that are not attached to the
+        session, so reading them after commit does not trigger a refresh.
+        """
+        columns = (task.Task.id, task.Task.project_id, task.Task.name, task.Task.status)
+        criteria = [task.Task.project_id == project_id]
+        if ids is not None:
+            criteria.append(task.Task.id.in_(ids))
+        if current_status is not None:
+            criteria.append(task.Task.status == current_status)
+
+        if self.session.get_bind().dialect.update_returning:
+            rows = self.session.execute(
+                update(task.Task).where(*criteria).values(status=status).returning(*columns)
+            ).all()
+        else:
+            matched = self.session.scalars(
+                select(task.Task.id).where(*criteria).with_for_update()
+            ).all()
+            self.session.execute(
+                update(task.Task).where(task.Task.id.in_(matched)).values(status=status)
+            )
+            rows = self.session.execute(
+                select(*columns).where(task.Task.id.in_(matched))
+            ).all()
+        return sorted((task.Task(**row._mapping) for row in rows), key=lambda t: t.id)
+
+    def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        """Deletes the project's tasks with one set-based DELETE.
+
+        With ``limit``, only the ``limit`` lowest ids go, so a large project
+        can be cleared in short transactions.
+        """
+        criteria = task.Task.project_id == project_id
+        if limit is not None:
+            criteria = task.Task.id.in_(
+                select(task.Task.id).where(criteria).order_by(task.Task.id).limit(limit)
+                .scalar_subquery())
+        stmt = delete(task.Task).where(criteria).execution_options(synchronize_session=False)
+        if self.session.get_bind().dialect.delete_returning:
+            return self.session.scalars(stmt.returning(task.Task.id)).all()
+        ids = self.session.scalars(
+            select(task.Task.id).where(criteria).with_for_update()).all()
+        self.session.execute(
+            delete(task.Task).where(task.Task.id.in_(ids))
+            .execution_options(synchronize_session=False))
+        return ids
+
+    def detach(self, t: task.Task) -> task.Task:
+        copy = task.Task(id=t.id, project_id=t.project_id, name=t.name, status=t.status)
+        orm.make_transient_to_detached(copy)
+        return copy
+
+    def attach(self, t: task.Task) -> task.Task:
+        return self.session.merge(t, load=False)
+
+
+class InMemoryTaskRepository(AbstractTaskRepository):
+    """Tasks held in a dict keyed by id, for tests and benchmarks.
+
+    Sorted id lists per ``project_id`` and per ``(project_id, status)``
+    serve ``list`` and ``count_by_status`` the way the composite index on
+    the tasks table does. Tasks are indexed by the status they had when
+    last passed to ``create``, ``update`` or ``update_status``.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[int, task.Task] = {}
+        self._by_project: Dict[int, List[int]] = {}
+        self._by_project_status: Dict[Tuple[int, Optional[str]], List[int]] = {}
+        self._indexed: Dict[int, Tuple[int, Optional[str]]] = {}
+        self._ids = itertools.count(1)
+
+    def _index(self, t: task.Task) -> None:
+        self._unindex(t.id)
+        key = (t.project_id, t.status)
+        bisect.insort(self._by_project.setdefault(t.project_id, []), t.id)
+        bisect.insort(self._by_project_status.setdefault(key, []), t.id)
+        self._indexed[t.id] = key
+
+    def _unindex(self, id: int) -> None:
+        key = self._indexed.pop(id, None)
+        if key is None:
+            return
+        for index, index_key in ((self._by_project, key[0]), (self._by_project_status, key)):
+            ids = index[index_key]
+            del ids[bisect.bisect_left(ids, id)]
+            if not ids:
+                del index[index_key]
+
+    def create(self, task: task.Task):
+        if task.id is None:
+            task.id = next(self._ids)
+        self._tasks[task.id] = task
+        self._index(task)
+
+    def update(self, task: task.Task) -> Optional[task.Task]:
+        stored = self._tasks.get(task.id)
+        if stored is None:
+            return None
+        if stored is not task:
+            stored.project_id = task.project_id
+            stored.name = task.name
+            stored.status = task.status
+        self._index(stored)
+        return stored
+
+    def get(self, id: int) -> task.Task:
+        return self._tasks.get(id)
+
+    def delete(self, task: task.Task) -> None:
+        self._unindex(task.id)
+        self._tasks.pop(task.id, None)
+
+    def _ids_for(self, project_id: int, status: Optional[str] = None,
+                 after: Optional[int] = None) -> List[int]:
+        if status is None:
+            ids = self._by_project.get(project_id, [])
+        else:
+            ids = self._by_project_status.get((project_id, status), [])
+        if after is not None:
+            ids = ids[bisect.bisect_right(ids, after):]
+        return ids
+
+    def list(self, project_id: int, status: Optional[str] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
+        ids = self._ids_for(project_id, status, after)
+        return [self._tasks[id] for id in ids[:limit]]
+
+    def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        counts = {}
+        for (row_project_id, status), ids in self._by_project_status.items():
+            if project_id is None or row_project_id == project_id:
+                counts.setdefault(row_project_id, {})[status] = len(ids)
+        return counts
+
+    def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        ids = []
+        for t in tasks:
+            new_task = task.Task(project_id=project_id, name=t["name"], status=t.get("status"))
+            self.create(new_task)
+            ids.append(new_task.id)
+        return ids
+
+    def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                      current_status: Optional[str] = None) -> List[task.Task]:
+        matched = self._ids_for(project_id, current_status)
+        if ids is not None:
+            wanted = set(ids)
+            matched = [id for id in matched if id in wanted]
+        tasks = [self._tasks[id] for id in matched]
+        for t in tasks:
+            t.status = status
+            self._index(t)
+        return tasks
+
+    def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        ids = self._ids_for(project_id)[:limit]
+        for id in ids:
+            self.delete(self._tasks[id])
+        return ids
+
+
+class CachingTaskRepository(cache.CachingRepositoryMixin, AbstractTaskRepository):
+    """Serves ``get`` from the entity cache and drops entries on writes."""
+    kind = 'task'
+    fields = ('id', 'project_id', 'name', 'status')
+
+    def _restore(self, fields: dict) -> task.Task:
+        t = task.Task(**fields)
+        orm.make_transient_to_detached(t)
+        return t
+
+    def create(self, task: task.Task):
+        self.repo.create(task)
+
+    def update(self, task: task.Task) -> Optional[task.Task]:
+        self._invalidate(task.id)
+        return self.repo.update(task)
+
+    def get(self, id: int) -> task.Task:
+        return self._cached_get(id, lambda: self.repo.get(id))
+
+    def delete(self, task: task.Task) -> None:
+        self._invalidate(task.id)
+        self.repo.delete(task)
+
+    def list(self, project_id: int, status: Optional[str] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> List[task.Task]:
+        return self.repo.list(project_id, status=status, after=after, limit=limit)
+
+    def stream(self, project_id: int, status: Optional[str] = None,
+               batch_size: int = 1000) -> Iterator[task.Task]:
+        return self.repo.stream(project_id, status=status, batch_size=batch_size)
+
+    def count_by_status(self, project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+        return self.repo.count_by_status(project_id)
+
+    def create_many(self, project_id: int, tasks: List[dict], batch_size: int = 1000) -> List[int]:
+        return self.repo.create_many(project_id, tasks, batch_size)
+
+    def update_status(self, project_id: int, status: str, ids: Optional[List[int]] = None,
+                      current_status: Optional[str] = None) -> List[task.Task]:
+        tasks = self.repo.update_status(project_id, status, ids=ids, current_status=current_status)
+        for t in tasks:
+            self._invalidate(t.id)
+        return tasks
+
+    def delete_for_project(self, project_id: int, limit: Optional[int] = None) -> List[int]:
+        ids = self.repo.delete_for_project(project_id, limit)
+        for id in ids:
+            self._invalidate(id)
+        return ids
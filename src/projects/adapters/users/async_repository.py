@@ -0,0 +1,130 @@
+from typing import AsyncIterator, List, Optional
+import abc
+
+from sqlalchemy import orm, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from projects.domain import user
+
+
+class AbstractAsyncRepository(abc.ABC):
+
+    @abc.abstractmethod
+    async def create(self, user: user.User):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update(self, user: user.User):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, id: int):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_username(self, username: str) -> user.User:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_email(self, email: str) -> user.User:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_by_token(self, token: str) -> user.User:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, user: user.User):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def create_many(self, users: List[user.User], batch_size: int = 1000) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def stream(self, batch_size: int = 1000) -> AsyncIterator[user.User]:
+        """Yields all users by username without materializing the whole result."""
+        raise NotImplementedError
+
+    def detach(self, user: user.User) -> user.User:
+        """Returns a copy of the user that is safe to keep across sessions."""
+        return user
+
+    async def attach(self, user: user.User) -> user.User:
+        """Binds a detached copy to the current session without a query."""
+        return user
+
+
+class SqlAlchemyAsyncRepository(AbstractAsyncRepository):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, user: user.User):
+        self.session.add(user)
+
+    async def update(self, user: user.User) -> user.User:
+        return user
+
+    async def _one(self, **criteria) -> Optional[user.User]:
+        return (await self.session.scalars(
+            select(user.User).filter_by(**criteria))).one_or_none()
+
+    async def get(self, id: int) -> user.User:
+        return await self._one(id=id)
+
+    async def get_by_username(self, username: str) -> user.User:
+        return await self._one(username=username)
+
+    async def get_by_email(self, email: str) -> user.User:
+        return await self._one(email=email)
+
+    async def get_by_token(self, token: str) -> user.User:
+        return await self._one(token=token)
+
+    async def delete(self, user: user.User) -> None:
+        await self.session.delete(user)
+
+    async def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
+        query = select(user.User).order_by(user.User.username)
+        if after is not None:
+            query = query.where(user.User.username > after)
+        if limit is not None:
+            query = query.limit(limit)
+        return (await self.session.scalars(query)).all()
+
+    async def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        """Returns existing users holding any of the usernames or emails, in one query."""
+        return (await self.session.scalars(
+            select(user.User).where(
+                user.User.username.in_(usernames) | user.User.email.in_(emails)))).all()
+
+    async def create_many(self, users: List[user.User], batch_size: int = 1000) -> None:
+        for start in range(0, len(users), batch_size):
+            self.session.add_all(users[start:start + batch_size])
+            await self.session.flush()
+
+    async def stream(self, batch_size: int = 1000) -> AsyncIterator[user.User]:
+        return await self.session.stream_scalars(
+            select(user.User).order_by(user.User.username)
+            .execution_options(yield_per=batch_size))
+
+    def detach(self, u: user.User) -> user.User:
+        copy = user.User(u.username, u.email, u.is_manager)
+        copy.id = u.id
+        copy.password_hash = u.password_hash
+        copy.token = u.token
+        copy.token_expiration = u.token_expiration
+        orm.make_transient_to_detached(copy)
+        return copy
+
+    async def attach(self, u: user.User) -> user.User:
+        return await self.session.merge(u, load=False)
@@ -1,8 +1,12 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional
 import abc
+import bisect
+import itertools
 
 import flask_sqlalchemy
+from sqlalchemy import orm
 
+from projects.adapters import cache
 from projects.domain import user
 
 
@@ -37,9 +41,28 @@ class AbstractRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def list(self) -> List[user.User]:
+    def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        raise NotImplementedError
+
+    def create_many(self, users: List[user.User], batch_size: int = 1000) -> None:
+        for u in users:
+            self.create(u)
+
+    def stream(self, batch_size: int = 1000) -> Iterator[user.User]:
+        """Yields all users by username without materializing the whole result."""
+        return iter(self.list())
+
+    def detach(self, user: user.User) -> user.User:
+        """Returns a copy of the user that is safe to keep across sessions."""
+        return user
+
+    def attach(self, user: user.User) -> user.User:
+        """Binds a detached copy to the current session without a query."""
+        return user
 
 
 class FlaskSqlAlchemyRepository(AbstractRepository):
@@ -75,7 +98,166 @@ class FlaskSqlAlchemyRepository(AbstractRepository):
     def delete(self, user: user.User) -> None:
         self.db.session.delete(user)
 
-    def list(self) -> List[user.User]:
+    def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        """Returns existing users holding any of the usernames or emails, in one query."""
+        return self.db.session.execute(
+                self.db.select(user.User).where(
+                    user.User.username.in_(usernames) | user.User.email.in_(emails))
+        ).scalars().all()
+
+    def create_many(self, users: List[user.User], batch_size: int = 1000) -> None:
+        for start in range(0, len(users), batch_size):
+            self.db.session.add_all(users[start:start + batch_size])
+            self.db.session.flush()
+
+    def detach(self, u: user.User) -> user.User:
+        copy = user.User(u.username, u.email, u.is_manager)
+        copy.id = u.id
+        copy.password_hash = u.password_hash
+        copy.token = u.token
+        copy.token_expiration = u.token_expiration
+        orm.make_transient_to_detached(copy)
+        return copy
+
+    def attach(self, u: user.User) -> user.User:
+        return self.db.session.merge(u, load=False)
+
+    def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
+        query = self.db.select(user.User).order_by(user.User.username)
+        if after is not None:
+            query = query.where(user.User.username > after)
+        if limit is not None:
+            query = query.limit(limit)
+        return self.db.session.execute(query).scalars()
+
+    def stream(self, batch_size: int = 1000) -> Iterator[user.User]:
         return self.db.session.execute(
                 self.db.select(user.User).order_by(user.User.username)
+                .execution_options(yield_per=batch_size)
         ).scalars()
+
+
+class InMemoryUserRepository(AbstractRepository):
+    """Users held in a dict keyed by id, for tests and benchmarks.
+
+    Hash indexes on username, email and token are refreshed by ``create``
+    and ``update``; a sorted list of usernames serves ``list``.
+    """
+
+    def __init__(self):
+        self._users: Dict[int, user.User] = {}
+        self._indexes: Dict[str, Dict[str, int]] = {'username': {}, 'email': {}, 'token': {}}
+        self._indexed: Dict[int, Dict[str, Optional[str]]] = {}
+        self._usernames: List[str] = []
+        self._ids = itertools.count(1)
+
+    def _index(self, u: user.User) -> None:
+        self._unindex(u.id)
+        keys = {field: getattr(u, field) for field in self._indexes}
+        for field, key in keys.items():
+            if key is not None:
+                self._indexes[field][key] = u.id
+        bisect.insort(self._usernames, u.username)
+        self._indexed[u.id] = keys
+
+    def _unindex(self, id: int) -> None:
+        keys = self._indexed.pop(id, None)
+        if keys is None:
+            return
+        for field, key in keys.items():
+            if self._indexes[field].get(key) == id:
+                del self._indexes[field][key]
+        del self._usernames[bisect.bisect_left(self._usernames, keys['username'])]
+
+    def _lookup(self, field: str, key: str) -> Optional[user.User]:
+        id = self._indexes[field].get(key)
+        return self._users.get(id) if id is not None else None
+
+    def create(self, user: user.User):
+        if user.id is None:
+            user.id = next(self._ids)
+        self._users[user.id] = user
+        self._index(user)
+
+    def update(self, user: user.User) -> user.User:
+        self._index(user)
+        return user
+
+    def get(self, id: int) -> user.User:
+        return self._users.get(id)
+
+    def get_by_username(self, username: str) -> user.User:
+        return self._lookup('username', username)
+
+    def get_by_email(self, email: str) -> user.User:
+        return self._lookup('email', email)
+
+    def get_by_token(self, token: str) -> user.User:
+        return self._lookup('token', token)
+
+    def delete(self, user: user.User) -> None:
+        self._unindex(user.id)
+        self._users.pop(user.id, None)
+
+    def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
+        start = bisect.bisect_right(self._usernames, after) if after is not None else 0
+        usernames = self._usernames[start:start + limit if limit is not None else None]
+        return [self.get_by_username(username) for username in usernames]
+
+    def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        ids = {self._indexes['username'].get(u) for u in usernames}
+        ids |= {self._indexes['email'].get(e) for e in emails}
+        ids.discard(None)
+        return [self._users[id] for id in sorted(ids)]
+
+
+class CachingUserRepository(cache.CachingRepositoryMixin, AbstractRepository):
+    """Serves ``get`` by id from the entity cache and drops entries on writes.
+
+    The password hash and the token are not cached: a cached user loads
+    them from the database if they are read.
+    """
+    kind = 'user'
+    fields = ('id', 'username', 'email', 'is_manager')
+
+    def _restore(self, fields: dict) -> user.User:
+        u = user.User(fields['username'], fields['email'], fields['is_manager'])
+        u.id = fields['id']
+        orm.make_transient_to_detached(u)
+        return u
+
+    def create(self, user: user.User):
+        self.repo.create(user)
+
+    def update(self, user: user.User) -> user.User:
+        user = self.repo.update(user)
+        self._invalidate(user.id)
+        return user
+
+    def get(self, id: int) -> user.User:
+        return self._cached_get(id, lambda: self.repo.get(id))
+
+    def get_by_username(self, username: str) -> user.User:
+        return self.repo.get_by_username(username)
+
+    def get_by_email(self, email: str) -> user.User:
+        return self.repo.get_by_email(email)
+
+    def get_by_token(self, token: str) -> user.User:
+        return self.repo.get_by_token(token)
+
+    def delete(self, user: user.User) -> None:
+        self._invalidate(user.id)
+        self.repo.delete(user)
+
+    def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[user.User]:
+        return self.repo.list(after=after, limit=limit)
+
+    def find_conflicts(self, usernames: List[str], emails: List[str]) -> List[user.User]:
+        return self.repo.find_conflicts(usernames, emails)
+
+    def create_many(self, users: List[user.User], batch_size: int = 1000) -> None:
+        self.repo.create_many(users, batch_size)
+
+    def stream(self, batch_size: int = 1000) -> Iterator[user.User]:
+        return self.repo.stream(batch_size)
@@ -7,7 +7,74 @@ load_dotenv(os.path.join(basedir, '.flaskenv'))
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'secretsecret'
+    # 'production' skips db.create_all() (the schema comes from migrations)
+    # and leaves the first database connection to the first request.
+    START_MODE = os.environ.get('START_MODE', 'development')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', '').replace(
         'postgres://', 'postgresql://') or \
         'sqlite:///' + os.path.join(basedir, 'app.db')
+    # Comma-separated read replica URLs; read-only handlers are routed to them.
+    SQLALCHEMY_REPLICA_URIS = [
+        url.replace('postgres://', 'postgresql://')
+        for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url]
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1').lower() not in ('0', 'false', 'no')
+    # Connections warmup() opens per engine in each worker.
+    WARMUP_CONNECTIONS = int(os.environ.get('WARMUP_CONNECTIONS', 1))
+    # Milliseconds; 0 leaves the server default (no timeout).
+    DB_STATEMENT_TIMEOUT = int(os.environ.get('DB_STATEMENT_TIMEOUT', 0))
+    # Adds X-DB-Queries / X-DB-Time (ms) headers to every response.
+    DB_QUERY_HEADERS = os.environ.get('DB_QUERY_HEADERS', '').lower() in ('1', 'true', 'yes')
+    # Requests over either budget are logged; 0 disables the check.
+    DB_QUERY_BUDGET = int(os.environ.get('DB_QUERY_BUDGET', 0))
+    DB_TIME_BUDGET_MS = float(os.environ.get('DB_TIME_BUDGET_MS', 0))
+    # Statements repeated this often within one request are logged as a likely N+1.
+    DB_N_PLUS_ONE_THRESHOLD = int(os.environ.get('DB_N_PLUS_ONE_THRESHOLD', 5))
     LOG_TO_STDOUT = os.environ.get('LOG_TO_STDOUT')
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 1024))
+    # Each process caches token lookups for this many seconds. A revoked
+    # opaque token is rejected everywhere only when TOKEN_DENYLIST_BACKEND
+    # is shared; with 'local', and for role changes, other workers keep the
+    # old user for up to this long.
+    TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 10))
+    TOKEN_AUTH_MODE = os.environ.get('TOKEN_AUTH_MODE', 'opaque')
+    # Revoked access tokens are only rejected by processes that share the
+    # denylist: with 'local' other workers accept them until they expire,
+    # so keep the lifetime short or use 'keyvalue' with KEYVALUE_STORE_URL.
+    ACCESS_TOKEN_EXPIRES_IN = int(os.environ.get('ACCESS_TOKEN_EXPIRES_IN', 300))
+    TOKEN_DENYLIST_BACKEND = os.environ.get('TOKEN_DENYLIST_BACKEND', 'local')
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 64))
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 1000))
+    TASK_SUMMARY_TTL = float(os.environ.get('TASK_SUMMARY_TTL', 5))
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 10000))
+    # 'sqlalchemy', or 'memory' to keep all data in process (tests, benchmarks).
+    REPOSITORY_BACKEND = os.environ.get('REPOSITORY_BACKEND', 'sqlalchemy')
+    # Delete a project's tasks this many at a time, committing each chunk;
+    # 0 deletes them with one statement in the project's transaction.
+    PROJECT_DELETE_CHUNK_SIZE = int(os.environ.get('PROJECT_DELETE_CHUNK_SIZE', 0))
+    # With a chunk size, DELETE /api/projects/<id> answers 202 and deletes in the background;
+    # `flask main delete-project <id>` finishes a delete cut short by a restart.
+    PROJECT_DELETE_IN_BACKGROUND = os.environ.get(
+        'PROJECT_DELETE_IN_BACKGROUND', '').lower() in ('1', 'true', 'yes')
+    # Serve the Swagger UI at /swagger; 0 leaves flask_swagger_ui unimported.
+    SWAGGER_UI = os.environ.get('SWAGGER_UI', '1').lower() not in ('0', 'false', 'no')
+    # Where /static/swagger.json gets the spec: 'lazy' builds it on the first
+    # request, 'eager' at startup, 'file' reads OPENAPI_SPEC_FILE as written
+    # by `flask main build-spec`.
+    OPENAPI_SPEC_MODE = os.environ.get('OPENAPI_SPEC_MODE', 'lazy')
+    OPENAPI_SPEC_FILE = os.environ.get('OPENAPI_SPEC_FILE') or os.path.join(basedir, 'openapi.json')
+    # redis:// URL of the store shared by the 'keyvalue' backends; empty
+    # keeps their entries in this process.
+    KEYVALUE_STORE_URL = os.environ.get('KEYVALUE_STORE_URL', '')
+    # Caches projects, tasks and users by id: 'none', 'local' or 'keyvalue'.
+    # 'local' is only invalidated in the process that wrote, so it suits a
+    # single-process deployment; several workers or nodes need 'keyvalue'.
+    ENTITY_CACHE_BACKEND = os.environ.get('ENTITY_CACHE_BACKEND', 'none')
+    ENTITY_CACHE_SIZE = int(os.environ.get('ENTITY_CACHE_SIZE', 4096))
+    ENTITY_CACHE_TTL = float(os.environ.get('ENTITY_CACHE_TTL', 30))
@@ -1,9 +1,12 @@
-from typing import Optional
+from typing import List, Optional
+
+from projects.domain.task import Task
 
 class Project:
     id: Optional[int]
     name: str
     description: Optional[str] = None
+    tasks: List[Task]
 
     def __repr__(self):
         return f'<Project {self.name}>'
@@ -3,11 +3,14 @@ from typing import Optional
 from datetime import datetime, timezone, timedelta
 
 from werkzeug.security import generate_password_hash, check_password_hash
-#import jwt
+import jwt
 
 
 class User:
 
+    # Set from PASSWORD_HASH_METHOD when the app is created.
+    password_hash_method = 'scrypt'
+
     id: Optional[int]
     password_hash: Optional[str]
     token: Optional[str]
@@ -35,7 +38,7 @@ class User:
         return '<User {}>'.format(self.username)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, self.password_hash_method)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -50,9 +53,40 @@ class User:
     def get_roles(self):
         return "manager" if self.is_manager else None
 
-    #def revoke_token(self) -> None:
-    #    self.token_expiration = datetime.now(timezone.utc) - timedelta(
-    #        seconds=1)
+    def get_access_token(self, secret: str, expires_in: int = 900) -> str:
+        now = datetime.now(timezone.utc)
+        return jwt.encode(
+            {
+                'sub': str(self.id),
+                'username': self.username,
+                'role': self.get_roles(),
+                'jti': secrets.token_hex(16),
+                'iat': now,
+                'exp': now + timedelta(seconds=expires_in),
+            },
+            secret, algorithm='HS256')
+
+    @staticmethod
+    def decode_access_token(token: str, secret: str) -> Optional[dict]:
+        try:
+            return jwt.decode(token, secret, algorithms=['HS256'],
+                              options={'require': ['sub', 'jti', 'exp']})
+        except jwt.InvalidTokenError:
+            return None
+
+    @staticmethod
+    def from_access_token_claims(claims: dict) -> 'User':
+        user = User(
+            username=claims.get('username'),
+            email=None,
+            is_manager=claims.get('role') == 'manager',
+        )
+        user.id = int(claims['sub'])
+        return user
+
+    def revoke_token(self) -> None:
+        self.token_expiration = datetime.now(timezone.utc) - timedelta(
+            seconds=1)
 
     #def get_reset_password_token(self, expires_in=600):
     #    return jwt.encode(
@@ -0,0 +1,73 @@
+"""ASGI entrypoint serving the ``/api`` routes on the asyncio SQLAlchemy stack.
+
+Run with ``uvicorn --factory projects.entrypoints.asgi:create_app``. The
+schema is owned by the Flask app and its migrations; this app does not
+create tables.
+"""
+import contextlib
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from projects.adapters.pool import engine_options, set_statement_timeout
+from projects.config import Config
+# Importing the Flask package maps the domain classes onto the tables.
+import projects.entrypoints.flask  # noqa: F401
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+psycopg',
+    'postgresql+psycopg2': 'postgresql+psycopg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swaps the sync driver of a database URL for its asyncio counterpart."""
+    scheme, sep, rest = url.partition('://')
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def create_app(config_class=Config) -> Starlette:
+    config = {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+
+    from projects.service_layer.users.token_cache import token_cache
+    token_cache.configure(config['TOKEN_CACHE_SIZE'], config['TOKEN_CACHE_TTL'])
+
+    from projects.adapters.cache import make_keyvalue_client
+    from projects.service_layer.users.token_denylist import make_denylist_backend, token_denylist
+    token_denylist.configure(make_denylist_backend(
+        config['TOKEN_DENYLIST_BACKEND'], make_keyvalue_client(config['KEYVALUE_STORE_URL'])))
+
+    from projects.service_layer.users.password_hasher import password_hasher
+    password_hasher.configure(config['PASSWORD_HASH_METHOD'],
+                              config['PASSWORD_HASH_WORKERS'],
+                              config['PASSWORD_HASH_QUEUE'])
+    from projects.domain.user import User
+    User.password_hash_method = config['PASSWORD_HASH_METHOD']
+
+    from projects.service_layer.tasks.summary_cache import summary_cache
+    summary_cache.configure(config['TASK_SUMMARY_TTL'])
+
+    url = config.get('ASYNC_DATABASE_URL') or async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+    engine = create_async_engine(url, **engine_options(config, url))
+    set_statement_timeout(engine.sync_engine, config['DB_STATEMENT_TIMEOUT'])
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    from projects.entrypoints.asgi.api import routes
+    from projects.entrypoints.asgi.api.errors import exception_handlers
+    app = Starlette(
+        routes=[Mount('/api', routes=routes, name='api')],
+        exception_handlers=exception_handlers,
+        lifespan=lifespan,
+    )
+    app.state.config = config
+    app.state.engine = engine
+    # Entities are read after commit to build responses, and lazy refreshes
+    # are not possible on an AsyncSession.
+    app.state.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    return app
@@ -0,0 +1,3 @@
+from projects.entrypoints.asgi.api import projects, tasks, tokens, users
+
+routes = [*tokens.routes, *users.routes, *projects.routes, *tasks.routes]
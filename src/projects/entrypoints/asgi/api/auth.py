@@ -0,0 +1,87 @@
+import base64
+import binascii
+import functools
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from projects.service_layer.async_unit_of_work import AsyncSqlAlchemyUnitOfWork
+from projects.service_layer.users import async_handlers, handlers
+from projects.entrypoints.asgi.api.errors import error_response
+
+
+async def closing(body_iterator, uow):
+    """Passes the body through and closes ``uow`` when it ends or is abandoned."""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        await uow.close()
+
+
+class Auth:
+    """Authenticates a request and opens the unit of work it runs in.
+
+    ``login_required`` stores the unit of work and the user on
+    ``request.state`` and closes the session once the endpoint returns, or,
+    for a streaming response, once its body has been sent.
+    """
+    scheme: str
+
+    async def verify(self, request: Request, credentials: str, uow):
+        raise NotImplementedError
+
+    def login_required(self, endpoint=None, role=None):
+        def decorator(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(request: Request):
+                uow = AsyncSqlAlchemyUnitOfWork(request.app.state.session_factory)
+                try:
+                    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+                    user = None
+                    if scheme.lower() == self.scheme and credentials:
+                        user = await self.verify(request, credentials, uow)
+                    if user is None:
+                        return error_response(401)
+                    if role is not None and user.get_roles() != role:
+                        return error_response(403)
+                    request.state.uow = uow
+                    request.state.user = user
+                    response = await endpoint(request)
+                    if isinstance(response, StreamingResponse):
+                        response.body_iterator = closing(response.body_iterator, uow)
+                        uow = None
+                    return response
+                finally:
+                    if uow is not None:
+                        await uow.close()
+            return wrapper
+        return decorator(endpoint) if endpoint is not None else decorator
+
+
+class BasicAuth(Auth):
+    scheme = 'basic'
+
+    async def verify(self, request, credentials, uow):
+        try:
+            username, _, password = base64.b64decode(credentials).decode('utf-8').partition(':')
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+        user = await async_handlers.get_user_by_username(username, uow)
+        if user and await async_handlers.verify_password(user, password, uow):
+            return user
+
+
+class TokenAuth(Auth):
+    scheme = 'bearer'
+
+    async def verify(self, request, token, uow):
+        config = request.app.state.config
+        request.state.token = token
+        if config['TOKEN_AUTH_MODE'] == 'jwt':
+            return handlers.check_access_token(token, config['SECRET_KEY'])
+        return await async_handlers.check_token(token, uow)
+
+
+basic_auth = BasicAuth()
+token_auth = TokenAuth()
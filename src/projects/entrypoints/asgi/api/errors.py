@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from projects.service_layer.users.password_hasher import PasswordHasherBusy
+
+
+def error_response(status_code, message=None):
+    payload = {'error': HTTPStatus(status_code).phrase}
+    if message:
+        payload['message'] = message
+    return JSONResponse(payload, status_code)
+
+
+def bad_request(message):
+    return error_response(400, message)
+
+
+async def get_json(request: Request):
+    """Returns the decoded body, or raises a 400 if it is not valid JSON."""
+    try:
+        return await request.json()
+    except ValueError:
+        raise HTTPException(400)
+
+
+async def handle_exception(request, e):
+    return error_response(e.status_code)
+
+
+async def handle_hasher_busy(request, e):
+    return error_response(503, 'too many concurrent logins, retry later')
+
+
+exception_handlers = {
+    HTTPException: handle_exception,
+    PasswordHasherBusy: handle_hasher_busy,
+}
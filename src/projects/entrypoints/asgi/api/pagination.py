@@ -0,0 +1,47 @@
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def get_int_arg(request: Request, name, default=None):
+    try:
+        return int(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def get_limit(request: Request):
+    return max(1, min(get_int_arg(request, 'limit', DEFAULT_LIMIT), MAX_LIMIT))
+
+
+def _url_for(request, endpoint, path_params, **query):
+    url = request.app.url_path_for(endpoint, **path_params)
+    query = {k: v for k, v in query.items() if v is not None}
+    return f'{url}?{urlencode(query)}' if query else str(url)
+
+
+def to_collection_dict(request, rows, limit, to_dict, cursor_of, endpoint,
+                       path_params=None, **kwargs):
+    """Builds the same keyset-paginated payload as the Flask API."""
+    path_params = path_params or {}
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = cursor_of(rows[-1]) if has_more else None
+    return {
+        'items': [to_dict(row) for row in rows],
+        '_meta': {
+            'limit': limit,
+            'next_cursor': next_cursor,
+        },
+        '_links': {
+            'self': _url_for(request, endpoint, path_params, limit=limit,
+                             after=request.query_params.get('after'), **kwargs),
+            'next': _url_for(request, endpoint, path_params, limit=limit,
+                             after=next_cursor, **kwargs)
+                if next_cursor is not None else None,
+        },
+    }
@@ -0,0 +1,92 @@
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from projects.entrypoints.asgi.api.auth import token_auth
+from projects.entrypoints.asgi.api.errors import bad_request, error_response, get_json
+from projects.entrypoints.asgi.api.streaming import batch_size, stream_json_array, wants_stream
+from projects.entrypoints.flask.api.projects import project_to_dict, summary_to_dict
+from projects.service_layer.projects import async_handlers as project_handlers
+from projects.service_layer.tasks import async_handlers as task_handlers
+
+
+def includes_tasks(request: Request):
+    return 'tasks' in request.query_params.get('include', '').split(',')
+
+
+@token_auth.login_required
+async def get_projects(request: Request):
+    include_tasks = includes_tasks(request)
+    if wants_stream(request):
+        return stream_json_array(
+            await project_handlers.stream_projects(
+                request.state.uow, batch_size(request), include_tasks=include_tasks),
+            lambda project: project_to_dict(project, include_tasks))
+    projects = await project_handlers.get_projects(request.state.uow, include_tasks=include_tasks)
+    return JSONResponse([project_to_dict(project, include_tasks) for project in projects])
+
+
+@token_auth.login_required
+async def get_projects_summary(request: Request):
+    summary = await task_handlers.get_task_summary(request.state.uow)
+    return JSONResponse(
+        [summary_to_dict(project_id, counts) for project_id, counts in sorted(summary.items())])
+
+
+@token_auth.login_required
+async def get_project_summary(request: Request):
+    id = request.path_params['id']
+    summary = await task_handlers.get_task_summary(request.state.uow, id)
+    return JSONResponse(summary_to_dict(id, summary.get(id, {})))
+
+
+@token_auth.login_required
+async def get_project(request: Request):
+    include_tasks = includes_tasks(request)
+    project = await project_handlers.get_project(
+        request.path_params['id'], request.state.uow, include_tasks=include_tasks)
+    if not project:
+        return error_response(404, "Project not found")
+    return JSONResponse(project_to_dict(project, include_tasks))
+
+
+@token_auth.login_required(role='manager')
+async def create_project(request: Request):
+    data = await get_json(request)
+    if 'name' not in data:
+        return bad_request('must include name')
+    project = await project_handlers.create_project(
+        data.get('name'), data.get("description"), request.state.uow)
+    return JSONResponse(project_to_dict(project), 201)
+
+
+@token_auth.login_required(role='manager')
+async def update_project(request: Request):
+    data = await get_json(request)
+    if 'name' not in data:
+        return bad_request('must include name')
+    project = await project_handlers.update_project(
+        request.path_params['id'], data["name"], data.get("description"), request.state.uow)
+    if not project:
+        return error_response(404, "Project not found")
+    return JSONResponse(project_to_dict(project))
+
+
+@token_auth.login_required(role='manager')
+async def delete_project(request: Request):
+    chunk_size = request.app.state.config['PROJECT_DELETE_CHUNK_SIZE']
+    if not await project_handlers.delete_project(request.path_params['id'], request.state.uow,
+                                                 chunk_size):
+        return error_response(404, "Project not found")
+    return Response(status_code=204)
+
+
+routes = [
+    Route('/projects', get_projects, methods=['GET']),
+    Route('/projects/summary', get_projects_summary, methods=['GET']),
+    Route('/projects/{id:int}/summary', get_project_summary, methods=['GET']),
+    Route('/projects/{id:int}', get_project, methods=['GET']),
+    Route('/projects', create_project, methods=['POST']),
+    Route('/projects/{id:int}', update_project, methods=['PUT']),
+    Route('/projects/{id:int}', delete_project, methods=['DELETE']),
+]
@@ -0,0 +1,30 @@
+import json
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+
+def wants_stream(request: Request):
+    return request.query_params.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def batch_size(request: Request):
+    return request.app.state.config['STREAM_BATCH_SIZE']
+
+
+def dumps(value):
+    # Same encoding as JSONResponse.
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+
+
+def stream_json_array(rows, to_dict):
+    """Returns a chunked response that emits the async iterable ``rows`` as one JSON array."""
+    async def generate():
+        yield '['
+        separator = ''
+        async for row in rows:
+            yield separator + dumps(to_dict(row))
+            separator = ','
+        yield ']'
+
+    return StreamingResponse(generate(), media_type='application/json')
@@ -0,0 +1,123 @@
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from projects.entrypoints.asgi.api.auth import token_auth
+from projects.entrypoints.asgi.api.errors import bad_request, error_response, get_json
+from projects.entrypoints.asgi.api.pagination import get_int_arg, get_limit, to_collection_dict
+from projects.entrypoints.asgi.api.streaming import batch_size, stream_json_array, wants_stream
+from projects.service_layer.projects import async_handlers as project_handlers
+from projects.service_layer.tasks import async_handlers as task_handlers
+
+
+def task_to_dict(task):
+    return {"id": task.id, "name": task.name, "status": task.status}
+
+
+@token_auth.login_required
+async def get_tasks(request: Request):
+    project_id = request.path_params['project_id']
+    status = request.query_params.get('status')
+    if wants_stream(request):
+        return stream_json_array(
+            await task_handlers.stream_tasks_for_project(
+                project_id, request.state.uow, status, batch_size(request)),
+            task_to_dict)
+    limit = get_limit(request)
+    after = get_int_arg(request, 'after')
+    tasks = await task_handlers.get_tasks_for_project(
+        project_id, request.state.uow, status=status, after=after, limit=limit + 1)
+    if not tasks and status is None and after is None:
+        return error_response(404, "No tasks or project found")
+    return JSONResponse(to_collection_dict(
+        request, tasks, limit, task_to_dict, lambda task: task.id,
+        'api:get_tasks', path_params={'project_id': project_id}, status=status,
+    ))
+
+
+@token_auth.login_required(role='manager')
+async def create_task(request: Request):
+    project_id = request.path_params['project_id']
+    data = await get_json(request)
+    uow = request.state.uow
+    async with uow:
+        if not await project_handlers.get_project(project_id, uow):
+            return error_response(404, "No project found")
+        task = await task_handlers.create_task(project_id, data.get("name"), data.get("status"), uow)
+        await uow.commit()
+    return JSONResponse(task_to_dict(task), 201)
+
+
+@token_auth.login_required(role='manager')
+async def create_tasks(request: Request):
+    project_id = request.path_params['project_id']
+    config = request.app.state.config
+    data = await get_json(request)
+    if not isinstance(data, list) or not data:
+        return bad_request('must be a non-empty list of tasks')
+    if len(data) > config['BULK_MAX_ITEMS']:
+        return bad_request(f"at most {config['BULK_MAX_ITEMS']} tasks per request")
+    for i, item in enumerate(data):
+        if not isinstance(item, dict) or not item.get('name') or not isinstance(item['name'], str):
+            return bad_request(f'task {i} must include name')
+        if not isinstance(item.get('status'), (str, type(None))):
+            return bad_request(f'task {i} status must be a string')
+    uow = request.state.uow
+    async with uow:
+        if not await project_handlers.get_project(project_id, uow):
+            return error_response(404, "No project found")
+        ids = await task_handlers.create_tasks(project_id, data, uow, config['BULK_BATCH_SIZE'])
+        await uow.commit()
+    return JSONResponse({"ids": ids}, 201)
+
+
+@token_auth.login_required(role='manager')
+async def update_task_status(request: Request):
+    project_id = request.path_params['project_id']
+    data = await get_json(request)
+    if not isinstance(data, dict) or 'status' not in data:
+        return bad_request('must include status')
+    task = await task_handlers.update_task_status(
+        project_id, request.path_params['task_id'], data['status'], request.state.uow)
+    if not task:
+        return error_response(404, "No task or project found")
+    return JSONResponse(task_to_dict(task))
+
+
+@token_auth.login_required(role='manager')
+async def update_tasks_status(request: Request):
+    data = await get_json(request)
+    if not isinstance(data, dict) or 'status' not in data:
+        return bad_request('must include status')
+    if not isinstance(data['status'], str):
+        return bad_request('status must be a string')
+    ids = data.get('ids')
+    task_filter = data.get('filter')
+    if ids is None and task_filter is None:
+        return bad_request('must include ids or filter')
+    if ids is not None and (not isinstance(ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+        return bad_request('ids must be a list of integers')
+    if task_filter is not None and (not isinstance(task_filter, dict) or set(task_filter) - {'status'}):
+        return bad_request('filter only supports status')
+    # An empty filter would select every task in the project.
+    if task_filter is not None and not isinstance(task_filter.get('status'), str):
+        return bad_request('filter must include a status')
+    project_id = request.path_params['project_id']
+    uow = request.state.uow
+    tasks = await task_handlers.update_tasks_status(
+        project_id, data['status'], uow,
+        ids=ids, current_status=(task_filter or {}).get('status'))
+    # Only an update that matched nothing pays for the project lookup.
+    if not tasks and not await project_handlers.get_project(project_id, uow):
+        return error_response(404, "No project found")
+    return JSONResponse([task_to_dict(task) for task in tasks])
+
+
+routes = [
+    Route('/projects/{project_id:int}/tasks', get_tasks, methods=['GET']),
+    Route('/projects/{project_id:int}/tasks', create_task, methods=['POST']),
+    Route('/projects/{project_id:int}/tasks/bulk', create_tasks, methods=['POST']),
+    Route('/projects/{project_id:int}/tasks/{task_id:int}', update_task_status, methods=['PUT']),
+    Route('/projects/{project_id:int}/tasks', update_tasks_status, methods=['PATCH']),
+]
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone, timedelta
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from projects.entrypoints.asgi.api.auth import basic_auth, token_auth
+from projects.service_layer.users import async_handlers, handlers
+
+
+@basic_auth.login_required
+async def get_token(request: Request):
+    config = request.app.state.config
+    user = request.state.user
+    if config['TOKEN_AUTH_MODE'] == 'jwt':
+        token = handlers.issue_access_token(
+            user, config['ACCESS_TOKEN_EXPIRES_IN'], config['SECRET_KEY'])
+        return JSONResponse({'token': token})
+
+    now = datetime.now(timezone.utc)
+    if user.token and user.token_expiration.replace(
+            tzinfo=timezone.utc) > now + timedelta(seconds=60):
+        return JSONResponse({'token': user.token})
+
+    token = await async_handlers.issue_new_token(user, 86400, request.state.uow)
+    return JSONResponse({'token': token})
+
+
+@token_auth.login_required(role='manager')
+async def revoke_token(request: Request):
+    config = request.app.state.config
+    if config['TOKEN_AUTH_MODE'] == 'jwt':
+        handlers.revoke_access_token(request.state.token, config['SECRET_KEY'])
+        return Response(status_code=204)
+
+    await async_handlers.revoke_token(request.state.user, request.state.uow)
+    return Response(status_code=204)
+
+
+routes = [
+    Route('/tokens', get_token, methods=['POST']),
+    Route('/tokens', revoke_token, methods=['DELETE']),
+]
@@ -0,0 +1,113 @@
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from projects.domain.user import User
+from projects.entrypoints.asgi.api.auth import token_auth
+from projects.entrypoints.asgi.api.errors import bad_request, error_response, get_json
+from projects.entrypoints.asgi.api.pagination import get_limit, to_collection_dict
+from projects.entrypoints.asgi.api.streaming import batch_size, stream_json_array, wants_stream
+from projects.service_layer.users import async_handlers as handlers
+
+
+@token_auth.login_required
+async def get_user(request: Request):
+    user = await handlers.get_user(request.path_params['id'], request.state.uow)
+    if not user:
+        return error_response(404, "User Not Found")
+    return JSONResponse(user.to_dict())
+
+
+@token_auth.login_required
+async def user_by_username(request: Request):
+    user = await handlers.get_user_by_username(request.path_params['username'], request.state.uow)
+    if not user:
+        return error_response(404, "User Not Found")
+    return JSONResponse({
+        "username": user.username,
+        "email": user.email,
+    })
+
+
+@token_auth.login_required
+async def get_users(request: Request):
+    if wants_stream(request):
+        return stream_json_array(
+            await handlers.stream_users(request.state.uow, batch_size(request)),
+            lambda user: {"username": user.username, "email": user.email})
+    limit = get_limit(request)
+    users = await handlers.get_users(
+        request.state.uow, after=request.query_params.get('after'), limit=limit + 1)
+    return JSONResponse(to_collection_dict(
+        request, users, limit,
+        lambda user: {"username": user.username, "email": user.email},
+        lambda user: user.username,
+        'api:get_users',
+    ))
+
+
+@token_auth.login_required(role='manager')
+async def promote_to_manager(request: Request):
+    uow = request.state.uow
+    user = await handlers.get_user_by_username(request.path_params['username'], uow)
+    if not user:
+        return error_response(404, "User Not Found")
+    await handlers.promote_to_manager(user, uow)
+    return JSONResponse({"status": "ok"})
+
+
+@token_auth.login_required(role='manager')
+async def create_user(request: Request):
+    data = await get_json(request)
+    if 'username' not in data or 'email' not in data or 'password' not in data:
+        return bad_request('must include username, email and password fields')
+
+    uow = request.state.uow
+    if await handlers.get_user_by_username(data['username'], uow):
+        return bad_request('please use a different username')
+
+    if await handlers.get_user_by_email(data['email'], uow):
+        return bad_request('please use a different e-mail')
+
+    user = User(
+            username=data.get("username"),
+            email=data.get("email"),
+    )
+    await handlers.set_password(user, data['password'])
+    await handlers.create_user(user, uow)
+    return JSONResponse(user.to_dict(), 201)
+
+
+@token_auth.login_required(role='manager')
+async def create_users(request: Request):
+    config = request.app.state.config
+    data = await get_json(request)
+    if not isinstance(data, list) or not data:
+        return bad_request('must be a non-empty list of users')
+    if len(data) > config['BULK_MAX_ITEMS']:
+        return bad_request(f"at most {config['BULK_MAX_ITEMS']} users per request")
+
+    created, errors = await handlers.create_users(data, request.state.uow, config['BULK_BATCH_SIZE'])
+    payload = {
+        "created": [dict(index=i, **user.to_dict()) for i, user in created],
+        "errors": errors,
+    }
+    return JSONResponse(payload, 201 if created else 400)
+
+
+@token_auth.login_required(role='manager')
+async def delete_user(request: Request):
+    if not await handlers.delete_user(request.path_params['id'], request.state.uow):
+        return error_response(404, "User not found")
+    return Response(status_code=204)
+
+
+routes = [
+    Route('/users/{id:int}', get_user, methods=['GET']),
+    Route('/users/user-by-username/{username}', user_by_username, methods=['GET']),
+    Route('/users', get_users, methods=['GET']),
+    Route('/users/promote/{username}', promote_to_manager, methods=['PATCH']),
+    Route('/users', create_user, methods=['POST']),
+    Route('/users/bulk', create_users, methods=['POST']),
+    Route('/user/{id:int}', delete_user, methods=['DELETE']),
+]
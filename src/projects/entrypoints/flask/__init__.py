@@ -1,75 +1,86 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import os
-from flask import Flask, request, current_app, jsonify
+import click
+from flask import Flask, Response, g, request, current_app
 
-from apispec import APISpec
-from apispec.ext.marshmallow import MarshmallowPlugin
-from apispec_webframeworks.flask import FlaskPlugin
-from flask_swagger_ui import get_swaggerui_blueprint
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from projects.config import Config
+from projects.adapters import instrumentation
+from projects.adapters.pool import TimedQueuePool, engine_options, set_statement_timeout
+from projects.adapters.routing import RoutingSession, init_replicas, replica_engines
+from projects.entrypoints.flask.spec import load_document, spec_document
+from projects.entrypoints.flask.startup import StartupTimer
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def init_migrations(app):
+    """Sets up Flask-Migrate, which imports Alembic, for the `flask db` commands."""
+    from flask_migrate import Migrate
+    Migrate(app, db)
 
 
 
 def create_app(config_class=Config):
+    timer = StartupTimer()
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.extensions['startup_timer'] = timer
+    timer.mark('config')
+    overrides = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config, app.config['SQLALCHEMY_DATABASE_URI'],
+                         overrides.get('poolclass', TimedQueuePool)),
+        **overrides}
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    init_replicas(app, overrides)
+    with app.app_context():
+        for engine in [*db.engines.values(), *replica_engines()]:
+            set_statement_timeout(engine, app.config['DB_STATEMENT_TIMEOUT'])
+            instrumentation.instrument_engine(engine)
+    # Only CLI commands run migrations; servers skip importing Alembic.
+    if click.get_current_context(silent=True) is not None:
+        init_migrations(app)
+    timer.mark('database')
+
+    from projects.service_layer.users.token_cache import token_cache
+    token_cache.configure(app.config['TOKEN_CACHE_SIZE'],
+                          app.config['TOKEN_CACHE_TTL'])
+
+    from projects.service_layer.users.password_hasher import password_hasher
+    password_hasher.configure(app.config['PASSWORD_HASH_METHOD'],
+                              app.config['PASSWORD_HASH_WORKERS'],
+                              app.config['PASSWORD_HASH_QUEUE'])
+    from projects.domain.user import User
+    User.password_hash_method = app.config['PASSWORD_HASH_METHOD']
+
+    from projects.service_layer.tasks.summary_cache import summary_cache
+    summary_cache.configure(app.config['TASK_SUMMARY_TTL'])
+
+    from projects.adapters.cache import entity_cache, make_backend, make_keyvalue_client
+    keyvalue_client = make_keyvalue_client(app.config['KEYVALUE_STORE_URL'])
+    entity_cache.configure(make_backend(app.config['ENTITY_CACHE_BACKEND'],
+                                        app.config['ENTITY_CACHE_SIZE'], keyvalue_client),
+                           app.config['ENTITY_CACHE_TTL'])
+
+    from projects.service_layer.users.token_denylist import make_denylist_backend, token_denylist
+    token_denylist.configure(make_denylist_backend(app.config['TOKEN_DENYLIST_BACKEND'],
+                                                   keyvalue_client))
+
+    from projects.service_layer.unit_of_work import init_repositories
+    init_repositories(app)
+    timer.mark('services')
 
     with app.app_context():
-        db.create_all()
-        
-        spec = APISpec(
-        title="User API",
-        version="1.0.0",
-        openapi_version="3.0.3",
-        plugins=[FlaskPlugin(), MarshmallowPlugin()],
-    )   
-        
-    spec.components.security_scheme(
-    "bearerAuth",
-    {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT",  
-    }
-    )
-          
-    spec.tag({
-    'name': 'Authentication',
-    'description': 'Operations related to user authentication',
-    'x-order': 1
-    })
-
-    spec.tag({
-        'name': 'User',
-        'description': 'Operations related to user management',
-        'x-order': 2
-    })
-    
-    spec.tag({
-    'name': 'Project',
-    'description': 'Operations related to project management',
-    'x-order': 3
-    })
-
-    spec.tag({
-        'name': 'Task',
-        'description': 'Operations related to task management in a project',
-        'x-order': 4
-    })
-        
-        
-    app.spec = spec 
-    
+        # In production the schema comes from migrations, and the first
+        # connection waits for the first request or an explicit warmup().
+        if app.config['REPOSITORY_BACKEND'] == 'sqlalchemy' and \
+                app.config['START_MODE'] != 'production':
+            db.create_all()
+        timer.mark('schema')
 
     from projects.entrypoints.flask.errors import bp as errors_bp
     app.register_blueprint(errors_bp)
@@ -82,31 +93,57 @@ def create_app(config_class=Config):
 
     from projects.entrypoints.flask.api import bp as api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
-    
-    
-    # Registration of routes and specifications
-    from projects.entrypoints.flask.api.tokens import register_routes_and_specs
-    register_routes_and_specs(app)
-    
-    from projects.entrypoints.flask.api.users import register_routes_and_specs
-    register_routes_and_specs(app)
-    
-    from projects.entrypoints.flask.api.projects import register_routes_and_specs
-    register_routes_and_specs(app)
-    
-    from projects.entrypoints.flask.api.tasks import register_routes_and_specs
-    register_routes_and_specs(app)
+    timer.mark('blueprints')
 
-    # Route to return the specification in JSON format
+    # Route to return the specification in JSON format, prebuilt or built once
     @app.route("/static/swagger.json")
     def swagger_json():
-        return jsonify(app.spec.to_dict())  # API specification
+        document = spec_document(app)
+        response = Response(document.body, mimetype='application/json')
+        response.set_etag(document.etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    load_document(app)
     
     #  Swagger UI
-    SWAGGER_URL = '/swagger'
-    API_URL = '/static/swagger.json'
-    swaggerui_blueprint = get_swaggerui_blueprint(SWAGGER_URL, API_URL)
-    app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL) 
+    if app.config['SWAGGER_UI']:
+        from flask_swagger_ui import get_swaggerui_blueprint
+        SWAGGER_URL = '/swagger'
+        API_URL = '/static/swagger.json'
+        swaggerui_blueprint = get_swaggerui_blueprint(SWAGGER_URL, API_URL)
+        app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL) 
+    timer.mark('spec')
+
+    @app.before_request
+    def start_query_recording():
+        g.query_recording = instrumentation.start_recording()
+
+    @app.after_request
+    def report_queries(response):
+        recorder = instrumentation.current_recorder()
+        if recorder is None:
+            return response
+        db_time_ms = recorder.time * 1000
+        if app.config['DB_QUERY_HEADERS']:
+            response.headers['X-DB-Queries'] = str(recorder.count)
+            response.headers['X-DB-Time'] = f'{db_time_ms:.2f}'
+        query_budget = app.config['DB_QUERY_BUDGET']
+        time_budget = app.config['DB_TIME_BUDGET_MS']
+        if (query_budget and recorder.count > query_budget) or \
+                (time_budget and db_time_ms > time_budget):
+            app.logger.warning('%s %s over DB budget: %d queries, %.2f ms',
+                               request.method, request.path, recorder.count, db_time_ms)
+        for shape, count in recorder.repeated(app.config['DB_N_PLUS_ONE_THRESHOLD']):
+            app.logger.warning('%s %s: likely N+1, statement ran %d times: %s',
+                               request.method, request.path, count, shape)
+        return response
+
+    @app.teardown_request
+    def stop_query_recording(exc):
+        token = g.pop('query_recording', None)
+        if token is not None:
+            instrumentation.stop_recording(token)
 
     if not app.debug and not app.testing:
 
@@ -126,7 +163,10 @@ def create_app(config_class=Config):
             app.logger.addHandler(file_handler)
 
         app.logger.setLevel(logging.INFO)
-        app.logger.info('Projects App startup')
+
+    timer.mark('logging')
+    if not app.debug and not app.testing:
+        app.logger.info('Projects App startup in %s', timer)
 
     return app
 
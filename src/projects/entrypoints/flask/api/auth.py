@@ -1,6 +1,7 @@
+from flask import current_app
 from flask_httpauth import HTTPBasicAuth, HTTPTokenAuth
 
-from projects.adapters.users import repository
+from projects.service_layer import unit_of_work
 from projects.service_layer.users import handlers
 from projects.entrypoints.flask import db
 from projects.entrypoints.flask.api.errors import error_response
@@ -12,9 +13,10 @@ token_auth = HTTPTokenAuth()
 @basic_auth.verify_password
 def verify_password(username, password):
     user = handlers.\
-        get_user_by_username(username, repository.FlaskSqlAlchemyRepository(db))
+        get_user_by_username(username, unit_of_work.make_unit_of_work(db))
 
-    if user and user.check_password(password):
+    if user and handlers.verify_password(
+            user, password, unit_of_work.make_unit_of_work(db)):
         return user
 
 @basic_auth.error_handler
@@ -23,8 +25,12 @@ def basic_auth_error(status):
 
 @token_auth.verify_token
 def verify_token(token):
+    if not token:
+        return None
+    if current_app.config['TOKEN_AUTH_MODE'] == 'jwt':
+        return handlers.check_access_token(token, current_app.config['SECRET_KEY'])
     return handlers.\
-        check_token(token, repository.FlaskSqlAlchemyRepository(db)) if token else None
+        check_token(token, unit_of_work.make_unit_of_work(db))
 
 @token_auth.error_handler
 def token_auth_error(status):
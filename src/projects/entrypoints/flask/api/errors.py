@@ -1,6 +1,7 @@
 from werkzeug.http import HTTP_STATUS_CODES
 from werkzeug.exceptions import HTTPException
 from projects.entrypoints.flask.api import bp
+from projects.service_layer.users.password_hasher import PasswordHasherBusy
 
 
 def error_response(status_code, message=None):
@@ -17,3 +18,8 @@ def bad_request(message):
 @bp.errorhandler(HTTPException)
 def handle_exception(e):
     return error_response(e.code)
+
+
+@bp.errorhandler(PasswordHasherBusy)
+def handle_hasher_busy(e):
+    return error_response(503, 'too many concurrent logins, retry later')
@@ -0,0 +1,33 @@
+from flask import request, url_for
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def get_limit():
+    return max(1, min(request.args.get('limit', DEFAULT_LIMIT, type=int), MAX_LIMIT))
+
+
+def to_collection_dict(rows, limit, to_dict, cursor_of, endpoint, **kwargs):
+    """Builds a keyset-paginated payload.
+
+    ``rows`` is expected to hold up to ``limit + 1`` items; the extra row only
+    signals that another page exists and is not returned.
+    """
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = cursor_of(rows[-1]) if has_more else None
+    return {
+        'items': [to_dict(row) for row in rows],
+        '_meta': {
+            'limit': limit,
+            'next_cursor': next_cursor,
+        },
+        '_links': {
+            'self': url_for(endpoint, limit=limit,
+                            after=request.args.get('after'), **kwargs),
+            'next': url_for(endpoint, limit=limit, after=next_cursor, **kwargs)
+                if next_cursor is not None else None,
+        },
+    }
@@ -1,12 +1,33 @@
-from projects.adapters.projects import repository as project_repository
+from concurrent.futures import ThreadPoolExecutor
+
+from projects.service_layer import unit_of_work
 from projects.service_layer.projects import handlers as project_handlers
+from projects.service_layer.tasks import handlers as task_handlers
 from projects.entrypoints.flask.api.auth import token_auth
 from projects.entrypoints.flask.api import bp
 from projects.entrypoints.flask.api.errors import bad_request
 from projects.entrypoints.flask import db
-from flask import jsonify, request
-from projects.entrypoints.flask.schema import ProjectSchema
+from flask import current_app, jsonify, request
 from projects.entrypoints.flask.api.errors import error_response 
+from projects.entrypoints.flask.api.streaming import batch_size, stream_json_array, wants_stream
+
+# Runs background project deletions one at a time.
+_background_deletes = ThreadPoolExecutor(max_workers=1, thread_name_prefix='project-delete')
+
+
+def includes_tasks():
+    return 'tasks' in request.args.get('include', '').split(',')
+
+def project_to_dict(project, include_tasks=False):
+    data = {"id": project.id, "name": project.name, "description": project.description}
+    if include_tasks:
+        data["tasks"] = [{"id": task.id, "name": task.name, "status": task.status} for task in project.tasks]
+    return data
+
+def summary_to_dict(project_id, counts):
+    # Tasks without a status are reported under "none"; JSON keys must be strings.
+    statuses = {(status if status is not None else "none"): count for status, count in counts.items()}
+    return {"project_id": project_id, "total": sum(counts.values()), "statuses": statuses}
 
 # Get all
 @bp.route('/projects', methods=['GET'])
@@ -21,6 +42,20 @@ def get_projects():
         - bearerAuth: []  # Using tokens for authentication
       tags:
         - Project
+      parameters:
+        - name: stream
+          in: query
+          required: false
+          schema:
+            type: boolean
+          description: Stream the array in chunks, reading projects from the database in batches.
+        - name: include
+          in: query
+          required: false
+          schema:
+            type: string
+            enum: [tasks]
+          description: Embed each project's tasks, loaded in one batched query.
       responses:
         200:
           description: Successfully retrieved list of projects.
@@ -30,11 +65,97 @@ def get_projects():
         401:
           description: Unauthorized access.
     """
-    repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    projects = project_handlers.get_projects(repo)
-    data = [{"id": project.id, "name": project.name, "description": project.description} for project in projects]
+    include_tasks = includes_tasks()
+    uow = unit_of_work.make_unit_of_work(db)
+    if wants_stream():
+        return stream_json_array(
+            project_handlers.stream_projects(uow, batch_size(), include_tasks=include_tasks),
+            lambda project: project_to_dict(project, include_tasks))
+    projects = project_handlers.get_projects(uow, include_tasks=include_tasks)
+    data = [project_to_dict(project, include_tasks) for project in projects]
     return jsonify(data)
 
+# Task counts per status for every project
+@bp.route('/projects/summary', methods=['GET'])
+@token_auth.login_required
+def get_projects_summary():
+    """
+    ---
+    get:
+      summary: Task counts per status for all projects
+      description: Get the number of tasks in each status for every project that has tasks. Results may be a few seconds stale.
+      security:
+        - bearerAuth: []  # Using tokens for authentication
+      tags:
+        - Project
+      responses:
+        200:
+          description: Successfully retrieved the summary.
+          content:
+            application/json:
+              schema:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    project_id:
+                      type: integer
+                    total:
+                      type: integer
+                    statuses:
+                      type: object
+                      additionalProperties:
+                        type: integer
+        401:
+          description: Unauthorized access.
+    """
+    uow = unit_of_work.make_unit_of_work(db)
+    summary = task_handlers.get_task_summary(uow)
+    return jsonify([summary_to_dict(project_id, counts) for project_id, counts in sorted(summary.items())])
+
+# Task counts per status for a specific project
+@bp.route('/projects/<int:id>/summary', methods=['GET'])
+@token_auth.login_required
+def get_project_summary(id):
+    """
+    ---
+    get:
+      summary: Task counts per status for a project
+      description: Get the number of tasks in each status for a specific project. Projects without tasks report zero counts. Results may be a few seconds stale.
+      security:
+        - bearerAuth: []  # Using tokens for authentication
+      tags:
+        - Project
+      parameters:
+        - name: id
+          in: path
+          required: true
+          schema:
+            type: integer
+          description: The ID of the project.
+      responses:
+        200:
+          description: Successfully retrieved the summary.
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  project_id:
+                    type: integer
+                  total:
+                    type: integer
+                  statuses:
+                    type: object
+                    additionalProperties:
+                      type: integer
+        401:
+          description: Unauthorized access.
+    """
+    uow = unit_of_work.make_unit_of_work(db)
+    summary = task_handlers.get_task_summary(uow, id)
+    return jsonify(summary_to_dict(id, summary.get(id, {})))
+
 # Getting a specific project by id
 @bp.route('/projects/<int:id>', methods=['GET'])
 @token_auth.login_required
@@ -55,6 +176,13 @@ def get_project(id):
           schema:
             type: integer
           description: The ID of the project to retrieve.
+        - name: include
+          in: query
+          required: false
+          schema:
+            type: string
+            enum: [tasks]
+          description: Embed the project's tasks, loaded in one batched query.
       responses:
         200:
           description: Successfully retrieved project details.
@@ -66,10 +194,11 @@ def get_project(id):
         401:
           description: Unauthorized access.
     """
-    repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.get_project(id, repo)
+    include_tasks = includes_tasks()
+    uow = unit_of_work.make_unit_of_work(db)
+    project = project_handlers.get_project(id, uow, include_tasks=include_tasks)
     if project:
-        return jsonify({"id": project.id, "name": project.name, "description": project.description})
+        return jsonify(project_to_dict(project, include_tasks))
     else:
         return error_response(404, "Project not found")
 
@@ -115,8 +244,8 @@ def create_project():
     data = request.get_json()
     if 'name' not in data :
         return bad_request('must include name')
-    repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.create_project(data.get('name'), data.get("description"), repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    project = project_handlers.create_project(data.get('name'), data.get("description"), uow)
     return jsonify({"id": project.id, "name": project.name, "description": project.description}), 201
 
 # Update
@@ -169,8 +298,8 @@ def update_project(id):
           description: Project not found.
     """    
     data = request.get_json()
-    repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.update_project(id, data["name"], data.get("description"), repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    project = project_handlers.update_project(id, data["name"], data.get("description"), uow)
     if not project:
       return error_response(404, "Project not found")
     return jsonify({"id": project.id, "name": project.name, "description": project.description})
@@ -196,6 +325,8 @@ def delete_project(id):
             type: integer
           description: The ID of the project to delete.
       responses:
+        202:
+          description: Project deletion started in the background.
         204:
           description: Project successfully deleted.
         401:
@@ -203,16 +334,36 @@ def delete_project(id):
         404:
           description: Project not found.
     """   
-    repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.get_project(id, repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    project = project_handlers.get_project(id, uow)
     if not project:
       return error_response(404, "Project not found")
-    project_handlers.delete_project(id, repo)
+    chunk_size = current_app.config['PROJECT_DELETE_CHUNK_SIZE']
+    if chunk_size and current_app.config['PROJECT_DELETE_IN_BACKGROUND']:
+      # The queue lives in this process; the log line is what survives a restart.
+      current_app.logger.info(
+        "Queued background delete of project %s; if it does not finish, "
+        "run `flask main delete-project %s`", id, id)
+      _background_deletes.submit(
+        delete_project_in_background, current_app._get_current_object(), id, chunk_size)
+      return jsonify({"status": "Project deletion started"}), 202
+    project_handlers.delete_project(id, uow, chunk_size)
     return jsonify({"status": "Project deleted"}), 204
 
+def delete_project_in_background(app, id, chunk_size):
+    with app.app_context():
+      try:
+        project_handlers.delete_project(id, unit_of_work.make_unit_of_work(db), chunk_size)
+        app.logger.info("Background delete of project %s finished", id)
+      except Exception:
+        app.logger.exception(
+          "Background delete of project %s failed; run `flask main delete-project %s`", id, id)
+
 def register_routes_and_specs(app):
     with app.app_context(): 
         app.spec.path(view=get_projects)
+        app.spec.path(view=get_projects_summary)
+        app.spec.path(view=get_project_summary)
         app.spec.path(view=get_project)
         app.spec.path(view=create_project)
         app.spec.path(view=update_project)
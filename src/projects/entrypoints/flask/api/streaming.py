@@ -0,0 +1,24 @@
+from flask import Response, current_app, request, stream_with_context
+
+
+def wants_stream():
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def batch_size():
+    return current_app.config['STREAM_BATCH_SIZE']
+
+
+def stream_json_array(rows, to_dict):
+    """Returns a chunked response that emits ``rows`` as one JSON array."""
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield '['
+        separator = ''
+        for row in rows:
+            yield separator + dumps(to_dict(row))
+            separator = ','
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -1,13 +1,13 @@
-from projects.adapters.tasks import repository as task_repository
-from projects.adapters.projects import repository as project_repository
+from projects.service_layer import unit_of_work
 from projects.service_layer.tasks import handlers as task_handlers
 from projects.service_layer.projects import handlers as project_handlers
 from projects.entrypoints.flask.api.auth import token_auth
 from projects.entrypoints.flask.api import bp
 from projects.entrypoints.flask import db
-from flask import jsonify, request
-from projects.entrypoints.flask.schema import TaskSchema
-from projects.entrypoints.flask.api.errors import error_response 
+from flask import current_app, jsonify, request
+from projects.entrypoints.flask.api.errors import bad_request, error_response 
+from projects.entrypoints.flask.api.pagination import get_limit, to_collection_dict
+from projects.entrypoints.flask.api.streaming import batch_size, stream_json_array, wants_stream
 
 # Get all tasks for a specific project
 @bp.route('/projects/<int:project_id>/tasks', methods=['GET'])
@@ -17,7 +17,7 @@ def get_tasks(project_id):
     ---
     get:
       summary: Get all tasks for a project
-      description: Retrieve all tasks associated with a specific project.
+      description: Retrieve a page of tasks associated with a specific project, ordered by task ID.
       security:
         - bearerAuth: [] # Using tokens for authentication
       tags:
@@ -29,20 +29,80 @@ def get_tasks(project_id):
           description: The ID of the project to retrieve tasks for.
           schema:
             type: integer
+        - in: query
+          name: status
+          required: false
+          description: Only return tasks with this status.
+          schema:
+            type: string
+        - in: query
+          name: limit
+          required: false
+          description: Maximum number of tasks to return.
+          schema:
+            type: integer
+            default: 100
+            maximum: 1000
+        - in: query
+          name: after
+          required: false
+          description: Cursor from the previous page; returns tasks with a greater ID.
+          schema:
+            type: integer
+        - in: query
+          name: stream
+          required: false
+          description: Stream all matching tasks as one chunked JSON array instead of a page.
+          schema:
+            type: boolean
       responses:
         200:
-          description: A list of tasks.
+          description: A page of tasks.
           content:
             application/json:
-              schema: TaskSchema
+              schema:
+                type: object
+                properties:
+                  items:
+                    type: array
+                    items: TaskSchema
+                  _meta:
+                    type: object
+                    properties:
+                      limit:
+                        type: integer
+                      next_cursor:
+                        type: integer
+                        nullable: true
+                  _links:
+                    type: object
+                    properties:
+                      self:
+                        type: string
+                      next:
+                        type: string
+                        nullable: true
         404:
           description: No tasks or project found.
     """
-    repo = task_repository.SqlAlchemyTaskRepository(db.session)
-    tasks = task_handlers.get_tasks_for_project(project_id, repo)
-    data = [{"id": task.id, "name": task.name, "status": task.status} for task in tasks]
-    if not len(data):
+    status = request.args.get('status')
+    uow = unit_of_work.make_unit_of_work(db)
+    if wants_stream():
+        return stream_json_array(
+            task_handlers.stream_tasks_for_project(project_id, uow, status, batch_size()),
+            lambda task: {"id": task.id, "name": task.name, "status": task.status})
+    limit = get_limit()
+    after = request.args.get('after', type=int)
+    tasks = task_handlers.get_tasks_for_project(
+        project_id, uow, status=status, after=after, limit=limit + 1)
+    if not tasks and status is None and after is None:
       return error_response(404, "No tasks or project found")
+    data = to_collection_dict(
+        tasks, limit,
+        lambda task: {"id": task.id, "name": task.name, "status": task.status},
+        lambda task: task.id,
+        'api.get_tasks', project_id=project_id, status=status,
+    )
     return jsonify(data), 200
 
 # Adding a new task to a project
@@ -86,14 +146,86 @@ def create_task(project_id):
           description: No project found.
     """
     data = request.get_json()
-    project_repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.get_project(project_id, project_repo)
-    if not project:
-      return error_response(404, "No project found")
-    repo = task_repository.SqlAlchemyTaskRepository(db.session)
-    task = task_handlers.create_task(project_id, data.get("name"),  data.get("status"), repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    with uow:
+      project = project_handlers.get_project(project_id, uow)
+      if not project:
+        return error_response(404, "No project found")
+      task = task_handlers.create_task(project_id, data.get("name"),  data.get("status"), uow)
+      uow.commit()
     return jsonify({"id": task.id, "name": task.name, "status": task.status}), 201
 
+# Adding many tasks to a project at once
+@bp.route('/projects/<int:project_id>/tasks/bulk', methods=['POST'])
+@token_auth.login_required(role='manager')
+def create_tasks(project_id):
+    """ 
+    ---
+    post:
+      summary: Add many tasks to a project
+      description: Create a list of tasks for a specified project in a single transaction.
+      security:
+        - bearerAuth: [] # Using tokens for authentication
+      tags:
+        - Task
+      parameters:
+        - in: path
+          name: project_id
+          required: true
+          description: The ID of the project to add tasks to.
+          schema:
+            type: integer
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: object
+                required: [name]
+                properties:
+                  name:
+                    type: string
+                  status:
+                    type: string
+      responses:
+        201:
+          description: Tasks successfully created.
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  ids:
+                    type: array
+                    items:
+                      type: integer
+                    description: IDs of the created tasks, in request order.
+        400:
+          description: Bad request, invalid task list.
+        404:
+          description: No project found.
+    """
+    data = request.get_json()
+    if not isinstance(data, list) or not data:
+      return bad_request('must be a non-empty list of tasks')
+    if len(data) > current_app.config['BULK_MAX_ITEMS']:
+      return bad_request(f"at most {current_app.config['BULK_MAX_ITEMS']} tasks per request")
+    for i, item in enumerate(data):
+      if not isinstance(item, dict) or not item.get('name') or not isinstance(item['name'], str):
+        return bad_request(f'task {i} must include name')
+      if not isinstance(item.get('status'), (str, type(None))):
+        return bad_request(f'task {i} status must be a string')
+    uow = unit_of_work.make_unit_of_work(db)
+    with uow:
+      project = project_handlers.get_project(project_id, uow)
+      if not project:
+        return error_response(404, "No project found")
+      ids = task_handlers.create_tasks(project_id, data, uow, current_app.config['BULK_BATCH_SIZE'])
+      uow.commit()
+    return jsonify({"ids": ids}), 201
+
 # Changing task status
 @bp.route('/projects/<int:project_id>/tasks/<int:task_id>', methods=['PUT'])
 @token_auth.login_required(role='manager')
@@ -136,21 +268,103 @@ def update_task_status(project_id, task_id):
             application/json:
               schema: TaskSchema
         404:
-          description: No project found.      
+          description: No task or project found.
     """
     data = request.get_json()
-    project_repo = project_repository.SqlAlchemyProjectRepository(db.session)
-    project = project_handlers.get_project(project_id, project_repo)
-    if not project:
-      return error_response(404, "No project found")
-    repo = task_repository.SqlAlchemyTaskRepository(db.session)
-    task = task_handlers.update_task_status(project_id, task_id, data.get("status"), repo)
+    if not isinstance(data, dict) or 'status' not in data:
+      return bad_request('must include status')
+    uow = unit_of_work.make_unit_of_work(db)
+    # The UPDATE is scoped to the project, so it matches no row when the project is missing.
+    task = task_handlers.update_task_status(project_id, task_id, data['status'], uow)
     if not task:
       return error_response(404, "No task or project found")
     return jsonify({"id": task.id, "name": task.name, "status": task.status})
 
+# Changing the status of many tasks at once
+@bp.route('/projects/<int:project_id>/tasks', methods=['PATCH'])
+@token_auth.login_required(role='manager')
+def update_tasks_status(project_id):
+    """ 
+    ---
+    patch:
+      summary: Update the status of many tasks
+      description: Set the status of the selected tasks of a project in a single statement. Select tasks either by ID or by their current status.
+      security:
+        - bearerAuth: [] # Using tokens for authentication
+      tags:
+        - Task
+      parameters:
+        - in: path
+          name: project_id
+          required: true
+          description: The ID of the project.
+          schema:
+            type: integer
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema: 
+              type: object
+              required: [status]
+              properties:
+                status:
+                  type: string
+                  description: The new status.
+                ids:
+                  type: array
+                  items:
+                    type: integer
+                  description: IDs of the tasks to update.
+                filter:
+                  type: object
+                  properties:
+                    status:
+                      type: string
+                      description: Update tasks currently in this status.
+      responses:
+        200:
+          description: The updated tasks.
+          content:
+            application/json:
+              schema:
+                type: array
+                items: TaskSchema
+        400:
+          description: Bad request, missing status or task selection.
+        404:
+          description: No project found.
+    """
+    data = request.get_json()
+    if not isinstance(data, dict) or 'status' not in data:
+      return bad_request('must include status')
+    if not isinstance(data['status'], str):
+      return bad_request('status must be a string')
+    ids = data.get('ids')
+    task_filter = data.get('filter')
+    if ids is None and task_filter is None:
+      return bad_request('must include ids or filter')
+    if ids is not None and (not isinstance(ids, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+      return bad_request('ids must be a list of integers')
+    if task_filter is not None and (not isinstance(task_filter, dict) or set(task_filter) - {'status'}):
+      return bad_request('filter only supports status')
+    # An empty filter would select every task in the project.
+    if task_filter is not None and not isinstance(task_filter.get('status'), str):
+      return bad_request('filter must include a status')
+    uow = unit_of_work.make_unit_of_work(db)
+    tasks = task_handlers.update_tasks_status(
+        project_id, data['status'], uow,
+        ids=ids, current_status=(task_filter or {}).get('status'))
+    # Only an update that matched nothing pays for the project lookup.
+    if not tasks and not project_handlers.get_project(project_id, uow):
+      return error_response(404, "No project found")
+    return jsonify([{"id": task.id, "name": task.name, "status": task.status} for task in tasks])
+
 def register_routes_and_specs(app):
     with app.app_context(): 
         app.spec.path(view=get_tasks)
         app.spec.path(view=create_task)
+        app.spec.path(view=create_tasks)
         app.spec.path(view=update_task_status)
+        app.spec.path(view=update_tasks_status)
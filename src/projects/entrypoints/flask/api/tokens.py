@@ -5,7 +5,7 @@ from flask import current_app
 from projects.entrypoints.flask import db
 from projects.entrypoints.flask.api import bp
 from projects.entrypoints.flask.api.auth import basic_auth, token_auth
-from projects.adapters.users import repository
+from projects.service_layer import unit_of_work
 from projects.service_layer.users import handlers
 
 
@@ -36,12 +36,18 @@ def get_token():
           description: Unauthorized. User credentials are invalid.
     """
     user = basic_auth.current_user()
+    if current_app.config['TOKEN_AUTH_MODE'] == 'jwt':
+        token = handlers.issue_access_token(
+            user, current_app.config['ACCESS_TOKEN_EXPIRES_IN'],
+            current_app.config['SECRET_KEY'])
+        return {'token': token}
+
     now = datetime.now(timezone.utc)
     if user.token and user.token_expiration.replace(
             tzinfo=timezone.utc) > now + timedelta(seconds=60):
         return {'token': user.token}
 
-    token = handlers.issue_new_token(user, 86400, repository.FlaskSqlAlchemyRepository(db))
+    token = handlers.issue_new_token(user, 86400, unit_of_work.make_unit_of_work(db))
     return {'token': token}
 
 
@@ -63,8 +69,13 @@ def revoke_token():
         401:
           description: Unauthorized. User does not have permission or invalid token.
     """
+    if current_app.config['TOKEN_AUTH_MODE'] == 'jwt':
+        handlers.revoke_access_token(
+            token_auth.get_auth().token, current_app.config['SECRET_KEY'])
+        return '', 204
+
     user = token_auth.current_user()
-    handlers.revoke_token(user, repository.FlaskSqlAlchemyRepository(db))
+    handlers.revoke_token(user, unit_of_work.make_unit_of_work(db))
     return '', 204
 
 def register_routes_and_specs(app):
@@ -1,5 +1,6 @@
 #import sqlalchemy as sa
 from flask import (
+    current_app,
     request, 
     jsonify,
     #url_for, 
@@ -7,14 +8,15 @@ from flask import (
 )
 
 from projects.domain.user import User
-from projects.adapters.users import repository
+from projects.service_layer import unit_of_work
 from projects.service_layer.users import handlers
 from projects.entrypoints.flask.api import bp
 from projects.entrypoints.flask.api.auth import token_auth
 from projects.entrypoints.flask.api.errors import bad_request
 from projects.entrypoints.flask import db
-from projects.entrypoints.flask.schema import UserSchema
 from projects.entrypoints.flask.api.errors import error_response 
+from projects.entrypoints.flask.api.pagination import get_limit, to_collection_dict
+from projects.entrypoints.flask.api.streaming import batch_size, stream_json_array, wants_stream
 
 
 @bp.route('/users/<int:id>', methods=['GET'])
@@ -47,8 +49,8 @@ def get_user(id):
         404:
           description: User Not Found.
     """ 
-    repo = repository.FlaskSqlAlchemyRepository(db)
-    user = handlers.get_user(id, repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    user = handlers.get_user(id, uow)
     if not user:
         return error_response(404, "User Not Found")
     return user.to_dict()
@@ -89,8 +91,8 @@ def user_by_username(username):
         404:
           description: User Not Found.
     """  
-    repo = repository.FlaskSqlAlchemyRepository(db)
-    user = handlers.get_user_by_username(username, repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    user = handlers.get_user_by_username(username, uow)
     if not user:
         return error_response(404, "User Not Found")
     return {
@@ -105,41 +107,81 @@ def get_users():
     ---
     get:
       summary: Retrieve all users
-      description: Get a list of all users.
+      description: Get a page of users ordered by username.
       security:
         - bearerAuth: [] # Using tokens for authentication
       tags:
         - User
+      parameters:
+        - name: limit
+          in: query
+          required: false
+          schema:
+            type: integer
+            default: 100
+            maximum: 1000
+          description: Maximum number of users to return.
+        - name: after
+          in: query
+          required: false
+          schema:
+            type: string
+          description: Cursor from the previous page; returns users after this username.
+        - name: stream
+          in: query
+          required: false
+          schema:
+            type: boolean
+          description: Stream all users as one chunked JSON array instead of a page.
       responses:
         200:
-          description: Successfully retrieved all users.
+          description: Successfully retrieved a page of users.
           content:
             application/json:
               schema:
-                type: array
-                items:
-                  type: object
-                  properties:
-                    username:
-                      type: string
-                    email:
-                      type: string
+                type: object
+                properties:
+                  items:
+                    type: array
+                    items:
+                      type: object
+                      properties:
+                        username:
+                          type: string
+                        email:
+                          type: string
+                  _meta:
+                    type: object
+                    properties:
+                      limit:
+                        type: integer
+                      next_cursor:
+                        type: string
+                        nullable: true
+                  _links:
+                    type: object
+                    properties:
+                      self:
+                        type: string
+                      next:
+                        type: string
+                        nullable: true
         401:
           description: Unauthorized access.
     """    
-    #page = request.args.get('page', 1, type=int)
-    #per_page = min(request.args.get('per_page', 10, type=int), 100)
-    #return User.to_collection_dict(sa.select(User), page, per_page,
-    #                               'api.get_users')
-    repo = repository.FlaskSqlAlchemyRepository(db)
-    users = handlers.get_users(repo)
-    data = []
-    for user in users:
-        data.append({
-            "username": user.username,
-            "email": user.email,
-        })
-    return data
+    uow = unit_of_work.make_unit_of_work(db)
+    if wants_stream():
+        return stream_json_array(
+            handlers.stream_users(uow, batch_size()),
+            lambda user: {"username": user.username, "email": user.email})
+    limit = get_limit()
+    users = handlers.get_users(uow, after=request.args.get('after'), limit=limit + 1)
+    return to_collection_dict(
+        users, limit,
+        lambda user: {"username": user.username, "email": user.email},
+        lambda user: user.username,
+        'api.get_users',
+    )
 
 @bp.route('/users/promote/<username>', methods=['PATCH'])
 @token_auth.login_required(role='manager')
@@ -176,11 +218,11 @@ def promote_to_manager(username):
         404:
           description: User not found.
     """
-    repo = repository.FlaskSqlAlchemyRepository(db)
-    user = handlers.get_user_by_username(username, repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    user = handlers.get_user_by_username(username, uow)
     if not user:
         return error_response(404, "User Not Found")
-    handlers.promote_to_manager(user, repo)
+    handlers.promote_to_manager(user, uow)
     return {"status": "ok"}, 200
 
 @bp.route('/users', methods=['POST'])
@@ -226,24 +268,100 @@ def create_user():
     if 'username' not in data or 'email' not in data or 'password' not in data:
         return bad_request('must include username, email and password fields')
 
-    if handlers.get_user_by_username(data['username'], repository.FlaskSqlAlchemyRepository(db)):
+    uow = unit_of_work.make_unit_of_work(db)
+    if handlers.get_user_by_username(data['username'], uow):
         return bad_request('please use a different username')
 
-    if handlers.get_user_by_email(data['email'], repository.FlaskSqlAlchemyRepository(db)):
+    if handlers.get_user_by_email(data['email'], uow):
         return bad_request('please use a different e-mail')
 
-    repo = repository.FlaskSqlAlchemyRepository(db)
     user = User(
             username=data.get("username"),
             email=data.get("email"),
     )
     if 'password' in data:
-        user.set_password(data['password'])
+        handlers.set_password(user, data['password'])
 
-    handlers.create_user(user, repo)
+    handlers.create_user(user, uow)
 
     return user.to_dict(), 201, {}
   
+@bp.route('/users/bulk', methods=['POST'])
+@token_auth.login_required(role='manager')
+def create_users():
+    """
+    ---
+    post:
+      summary: Create many users
+      description: Create a list of user accounts in a single transaction. Rows that fail validation or conflict with existing users are reported and skipped. Only managers are allowed to create users.
+      security:
+        - bearerAuth: [] # Using tokens for authentication
+      tags:
+        - User
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  username:
+                    type: string
+                  email:
+                    type: string
+                  password:
+                    type: string
+      responses:
+        201:
+          description: At least one user was created.
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  created:
+                    type: array
+                    items:
+                      type: object
+                      properties:
+                        index:
+                          type: integer
+                        id:
+                          type: integer
+                        username:
+                          type: string
+                        email:
+                          type: string
+                  errors:
+                    type: array
+                    items:
+                      type: object
+                      properties:
+                        index:
+                          type: integer
+                        error:
+                          type: string
+        400:
+          description: Invalid input data, or no user could be created.
+        401:
+          description: Unauthorized access.
+    """
+    data = request.get_json()
+    if not isinstance(data, list) or not data:
+        return bad_request('must be a non-empty list of users')
+    if len(data) > current_app.config['BULK_MAX_ITEMS']:
+        return bad_request(f"at most {current_app.config['BULK_MAX_ITEMS']} users per request")
+
+    uow = unit_of_work.make_unit_of_work(db)
+    created, errors = handlers.create_users(data, uow, current_app.config['BULK_BATCH_SIZE'])
+    payload = {
+        "created": [dict(index=i, **user.to_dict()) for i, user in created],
+        "errors": errors,
+    }
+    return payload, 201 if created else 400
+
 # Remove user
 @bp.route('/user/<int:id>', methods=['DELETE'])
 @token_auth.login_required(role='manager')
@@ -272,8 +390,8 @@ def delete_user(id):
         404:
           description: Not Found.
     """   
-    repo = repository.FlaskSqlAlchemyRepository(db)
-    handlers.delete_user(id, repo)
+    uow = unit_of_work.make_unit_of_work(db)
+    handlers.delete_user(id, uow)
     return jsonify({"status": "User deleted"}), 204  
     
 def register_routes_and_specs(app):
@@ -283,6 +401,7 @@ def register_routes_and_specs(app):
         app.spec.path(view=get_users)
         app.spec.path(view=promote_to_manager)
         app.spec.path(view=create_user)
+        app.spec.path(view=create_users)
         app.spec.path(view=delete_user)
       
 """
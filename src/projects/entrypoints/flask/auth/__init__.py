@@ -5,7 +5,7 @@ from werkzeug import exceptions as wz_exc
 from projects.service_layer.users import handlers
 from projects.entrypoints.flask import db
 from projects.domain.user import User
-from projects.adapters.users import repository
+from projects.service_layer import unit_of_work
 
 bp = Blueprint('auth', __name__)
 
@@ -14,14 +14,14 @@ bp = Blueprint('auth', __name__)
 @click.option('--email')
 @click.option('--password')
 def create(username, email, password):
-    repo = repository.FlaskSqlAlchemyRepository(db)
+    uow = unit_of_work.make_unit_of_work(db)
     user = None
 
-    if handlers.get_user_by_username(username, repository.FlaskSqlAlchemyRepository(db)):
+    if handlers.get_user_by_username(username, uow):
         current_app.logger.info(f"user exists with username: {username}. Please select another username.")
         return
 
-    if handlers.get_user_by_email(email, repository.FlaskSqlAlchemyRepository(db)):
+    if handlers.get_user_by_email(email, uow):
         current_app.logger.info(f"user exists with e-mail: {email}. Please select another e-mail.")
         return
 
@@ -30,10 +30,12 @@ def create(username, email, password):
                 username=username,
                 email=email,
         )
-        user.set_password(password)
-        handlers.create_user(user, repo)
-        handlers.promote_to_manager(user, repo)
-        token = handlers.issue_new_token(user, 86400, repository.FlaskSqlAlchemyRepository(db))
+        handlers.set_password(user, password)
+        with uow:
+            handlers.create_user(user, uow)
+            handlers.promote_to_manager(user, uow)
+            token = handlers.issue_new_token(user, 86400, uow)
+            uow.commit()
         current_app.logger.info(f"Manager created with token {token}")
 
 from projects.entrypoints.flask.auth import routes
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint('main', __name__)
 
-from projects.entrypoints.flask.main import routes
+from projects.entrypoints.flask.main import commands, routes
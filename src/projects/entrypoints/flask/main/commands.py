@@ -0,0 +1,37 @@
+from flask import current_app
+import click
+
+from projects.entrypoints.flask import db
+from projects.entrypoints.flask.main import bp
+from projects.entrypoints.flask.spec import build_document
+from projects.service_layer import unit_of_work
+from projects.service_layer.projects import handlers as project_handlers
+
+
+@bp.cli.command('build-spec')
+@click.option('--output', help='Defaults to OPENAPI_SPEC_FILE.')
+def build_spec(output):
+    """Writes the OpenAPI spec for OPENAPI_SPEC_MODE=file."""
+    output = output or current_app.config['OPENAPI_SPEC_FILE']
+    document = build_document(current_app)
+    with open(output, 'wb') as f:
+        f.write(document.body)
+    click.echo(f"Wrote {output} ({len(document.body)} bytes, etag {document.etag})")
+
+
+@bp.cli.command('delete-project')
+@click.argument('id', type=int)
+@click.option('--chunk-size', type=int, help='Defaults to PROJECT_DELETE_CHUNK_SIZE.')
+def delete_project(id, chunk_size):
+    """Deletes a project and its tasks, finishing an interrupted background delete.
+
+    Chunks already deleted stay deleted, so this picks up where the
+    background delete stopped.
+    """
+    if chunk_size is None:
+        chunk_size = current_app.config['PROJECT_DELETE_CHUNK_SIZE']
+    uow = unit_of_work.make_unit_of_work(db)
+    if not project_handlers.get_project(id, uow):
+        raise click.ClickException(f"Project {id} not found")
+    project_handlers.delete_project(id, uow, chunk_size)
+    click.echo(f"Deleted project {id}")
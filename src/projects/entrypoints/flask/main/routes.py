@@ -1,6 +1,37 @@
+from flask import current_app
+
+from projects.adapters.cache import entity_cache
+from projects.adapters.pool import pool_stats
+from projects.adapters.routing import replica_engines
+from projects.entrypoints.flask import db
+from projects.entrypoints.flask.api.auth import token_auth
 from projects.entrypoints.flask.main import bp
+from projects.service_layer.users.token_cache import token_cache
 
 
 @bp.route('/', methods=['GET'])
 def index():
     return {"status": "ok"}
+
+
+@bp.route('/stats/cache', methods=['GET'])
+@token_auth.login_required(role='manager')
+def cache_stats():
+    return {"entities": entity_cache.stats(), "tokens": token_cache.stats()}
+
+
+@bp.route('/stats/pool', methods=['GET'])
+@token_auth.login_required(role='manager')
+def connection_pool_stats():
+    """Connection pool usage of the worker process that serves the request."""
+    stats = {"primary": pool_stats(db.engine)}
+    for i, engine in enumerate(replica_engines()):
+        stats[f"replica_{i}"] = pool_stats(engine)
+    return stats
+
+
+@bp.route('/stats/startup', methods=['GET'])
+@token_auth.login_required(role='manager')
+def startup_stats():
+    """Time spent in each phase of create_app (and warmup) in this worker."""
+    return current_app.extensions['startup_timer'].to_dict()
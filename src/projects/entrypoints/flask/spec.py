@@ -0,0 +1,124 @@
+import hashlib
+import json
+import threading
+from typing import NamedTuple
+
+from flask import Flask
+
+_build_lock = threading.Lock()
+
+
+class SpecDocument(NamedTuple):
+    """The serialized OpenAPI spec and the ETag it is served with."""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> 'SpecDocument':
+        return cls(body, hashlib.sha256(body).hexdigest()[:32])
+
+
+def build_spec(app: Flask):
+    """Builds the spec from the YAML in the API view docstrings.
+
+    apispec and marshmallow are imported here rather than at module level,
+    so processes that never build the spec do not pay for them.
+    """
+    from apispec import APISpec
+    from apispec.ext.marshmallow import MarshmallowPlugin
+    from apispec_webframeworks.flask import FlaskPlugin
+    # Registers the schemas the docstrings refer to by name.
+    import projects.entrypoints.flask.schema  # noqa: F401
+
+    spec = APISpec(
+        title="User API",
+        version="1.0.0",
+        openapi_version="3.0.3",
+        plugins=[FlaskPlugin(), MarshmallowPlugin()],
+    )
+
+    spec.components.security_scheme(
+        "bearerAuth",
+        {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+        }
+    )
+
+    spec.tag({
+        'name': 'Authentication',
+        'description': 'Operations related to user authentication',
+        'x-order': 1
+    })
+
+    spec.tag({
+        'name': 'User',
+        'description': 'Operations related to user management',
+        'x-order': 2
+    })
+
+    spec.tag({
+        'name': 'Project',
+        'description': 'Operations related to project management',
+        'x-order': 3
+    })
+
+    spec.tag({
+        'name': 'Task',
+        'description': 'Operations related to task management in a project',
+        'x-order': 4
+    })
+
+    app.spec = spec
+
+    # Registration of routes and specifications
+    from projects.entrypoints.flask.api.tokens import register_routes_and_specs
+    register_routes_and_specs(app)
+
+    from projects.entrypoints.flask.api.users import register_routes_and_specs
+    register_routes_and_specs(app)
+
+    from projects.entrypoints.flask.api.projects import register_routes_and_specs
+    register_routes_and_specs(app)
+
+    from projects.entrypoints.flask.api.tasks import register_routes_and_specs
+    register_routes_and_specs(app)
+
+    return spec
+
+
+def build_document(app: Flask) -> SpecDocument:
+    body = json.dumps(build_spec(app).to_dict(), sort_keys=True).encode()
+    return SpecDocument.from_bytes(body)
+
+
+def load_document(app: Flask) -> None:
+    """Loads the prebuilt spec when OPENAPI_SPEC_MODE is 'file', or builds it when 'eager'.
+
+    With 'lazy', or when the file is missing, the spec is built on the
+    first request for it instead.
+    """
+    mode = app.config['OPENAPI_SPEC_MODE']
+    if mode == 'eager':
+        app.extensions['openapi'] = build_document(app)
+    elif mode == 'file':
+        path = app.config['OPENAPI_SPEC_FILE']
+        try:
+            with open(path, 'rb') as f:
+                app.extensions['openapi'] = SpecDocument.from_bytes(f.read())
+        except FileNotFoundError:
+            app.logger.warning('OpenAPI spec file %s not found; building it on first use', path)
+    elif mode != 'lazy':
+        raise ValueError(f"Unknown OpenAPI spec mode: {mode}")
+
+
+def spec_document(app: Flask) -> SpecDocument:
+    """The app's spec document, built on first use if it was not loaded at startup."""
+    document = app.extensions.get('openapi')
+    if document is None:
+        with _build_lock:
+            document = app.extensions.get('openapi')
+            if document is None:
+                document = app.extensions['openapi'] = build_document(app)
+    return document
@@ -0,0 +1,103 @@
+import contextlib
+import time
+from typing import Dict
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import BuildError
+
+
+class StartupTimer:
+    """Records how long each phase of ``create_app`` takes, in milliseconds."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._last = self.started
+
+    def mark(self, phase: str) -> None:
+        """Ends ``phase``: it is charged the time since the previous mark."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def to_dict(self) -> dict:
+        return {'total_ms': round(self.total, 2),
+                'phases_ms': {phase: round(ms, 2) for phase, ms in self.phases.items()}}
+
+    def __str__(self) -> str:
+        phases = ', '.join(f'{phase} {ms:.1f}' for phase, ms in self.phases.items())
+        return f'{self.total:.1f} ms ({phases})'
+
+
+def after_fork(app: Flask) -> None:
+    """Drops the database connections a worker inherited from its parent.
+
+    With a preforking server that loads the app before forking (gunicorn's
+    ``preload_app``), the parent's pooled connections are copied into
+    every worker and would end up shared between processes. Call this
+    in each worker before it serves or warms up (gunicorn's
+    ``post_worker_init``). The copies are
+    discarded without being closed, since closing them would also close
+    the parent's sockets; each worker then opens its own connections.
+    """
+    from projects.adapters.routing import replica_engines
+    from projects.entrypoints.flask import db
+
+    with app.app_context():
+        for engine in [*db.engines.values(), *replica_engines()]:
+            engine.dispose(close=False)
+
+
+def _match_routes(app: Flask) -> None:
+    # The URL matcher compiles each converter's pattern on first use.
+    adapter = app.url_map.bind('localhost')
+    for rule in app.url_map.iter_rules():
+        with contextlib.suppress(BuildError, HTTPException):
+            adapter.match(adapter.build(rule.endpoint, dict.fromkeys(rule.arguments, 0)))
+
+
+def warmup(app: Flask, connections: int = None) -> None:
+    """Fills each pool and primes the query caches before traffic arrives.
+
+    Opens ``connections`` connections per engine (WARMUP_CONNECTIONS by
+    default, at most the pool size) and runs the token and entity lookups
+    of the hot paths once, so their statements are compiled before the
+    first request needs them; every route is matched once for the same
+    reason. In production mode ``create_app`` does not touch the database,
+    so call this from the server's worker start hook (e.g. gunicorn's
+    ``post_worker_init``), after ``after_fork``.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    from projects.adapters.routing import replica_engines
+    from projects.entrypoints.flask import db
+    from projects.service_layer.unit_of_work import make_unit_of_work
+
+    if connections is None:
+        connections = app.config['WARMUP_CONNECTIONS']
+    started = time.perf_counter()
+    configure_mappers()
+    _match_routes(app)
+    with app.app_context():
+        if app.config['REPOSITORY_BACKEND'] == 'sqlalchemy':
+            for engine in [*db.engines.values(), *replica_engines()]:
+                size = getattr(engine.pool, 'size', lambda: connections)()
+                with contextlib.ExitStack() as stack:
+                    for _ in range(max(1, min(connections, size))):
+                        stack.enter_context(engine.connect())
+        uow = make_unit_of_work(db)
+        with uow:
+            with uow.replica_reads():
+                uow.users.get_by_token('')
+            uow.users.get(0)
+            uow.projects.get(0)
+            uow.tasks.get(0)
+            uow.tasks.list(0, limit=1)
+    elapsed = (time.perf_counter() - started) * 1000
+    app.extensions['startup_timer'].phases['warmup'] = elapsed
+    app.logger.info('Projects App warmup in %.1f ms', elapsed)
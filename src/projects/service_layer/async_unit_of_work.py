@@ -0,0 +1,84 @@
+import abc
+from typing import Callable, List
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from projects.adapters.projects import async_repository as project_repository
+from projects.adapters.tasks import async_repository as task_repository
+from projects.adapters.users import async_repository as user_repository
+
+
+class AbstractAsyncUnitOfWork(abc.ABC):
+    """Async counterpart of ``unit_of_work.AbstractUnitOfWork``.
+
+    Handlers wrap their work in ``async with uow:`` and await
+    ``uow.commit()``; nesting and ``after_commit`` behave the same way.
+    """
+
+    projects: project_repository.AbstractAsyncProjectRepository
+    tasks: task_repository.AbstractAsyncTaskRepository
+    users: user_repository.AbstractAsyncRepository
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._committed = False
+        self._after_commit: List[Callable[[], None]] = []
+
+    async def __aenter__(self) -> 'AbstractAsyncUnitOfWork':
+        if self._depth == 0:
+            self._committed = False
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth == 0 and (exc_type is not None or not self._committed):
+            await self.rollback()
+
+    async def commit(self) -> None:
+        if self._depth > 1:
+            return
+        await self._commit()
+        self._committed = True
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        self._after_commit.clear()
+        await self._rollback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs ``callback`` once the enclosing transaction has committed."""
+        self._after_commit.append(callback)
+
+    async def close(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def _commit(self) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _rollback(self) -> None:
+        raise NotImplementedError
+
+
+class AsyncSqlAlchemyUnitOfWork(AbstractAsyncUnitOfWork):
+    """Unit of work over one ``AsyncSession``; ``close()`` releases it."""
+
+    def __init__(self, session_factory: async_sessionmaker):
+        super().__init__()
+        self.session = session_factory()
+        self.projects = project_repository.SqlAlchemyAsyncProjectRepository(self.session)
+        self.tasks = task_repository.SqlAlchemyAsyncTaskRepository(self.session)
+        self.users = user_repository.SqlAlchemyAsyncRepository(self.session)
+
+    async def _commit(self) -> None:
+        await self.session.commit()
+
+    async def _rollback(self) -> None:
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        await self.session.close()
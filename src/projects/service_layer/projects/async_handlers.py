@@ -0,0 +1,60 @@
+from typing import AsyncIterator, List, Optional
+
+from projects.domain.project import Project
+from projects.service_layer import async_unit_of_work
+from projects.service_layer.projects.handlers import evict_tasks
+from projects.service_layer.tasks.summary_cache import summary_cache
+
+async def get_project(id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                      include_tasks: bool = False) -> Optional[Project]:
+    """Gets a project by its ID, optionally with its tasks loaded."""
+    return await uow.projects.get(id, include_tasks=include_tasks)
+
+async def get_projects(uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                       include_tasks: bool = False) -> List[Project]:
+    """Gets a list of all projects, optionally with their tasks loaded."""
+    return await uow.projects.list(include_tasks=include_tasks)
+
+async def stream_projects(uow: async_unit_of_work.AbstractAsyncUnitOfWork, batch_size: int = 1000,
+                          include_tasks: bool = False) -> AsyncIterator[Project]:
+    """Yields all projects by id, fetched from the database in batches."""
+    return await uow.projects.stream(batch_size, include_tasks=include_tasks)
+
+async def create_project(name: str, description: str,
+                         uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Project:
+    """Creates a new project."""
+    async with uow:
+        project = Project(name=name, description=description)
+        await uow.projects.create(project)
+        await uow.commit()
+    return project
+
+async def update_project(id: int, name: str, description: str,
+                         uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Optional[Project]:
+    """Updates an existing project."""
+    async with uow:
+        project = await uow.projects.update(Project(id=id, name=name, description=description))
+        if project:
+            await uow.commit()
+    return project
+
+async def delete_project(id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                         chunk_size: int = 0) -> Optional[Project]:
+    """Deletes a project and its tasks, and returns it, or None if there was none.
+
+    ``chunk_size`` works as in ``handlers.delete_project``.
+    """
+    async with uow:
+        project = await uow.projects.get(id)
+        if project:
+            task_ids = []
+            if chunk_size:
+                while chunk := await uow.tasks.delete_for_project(id, limit=chunk_size):
+                    task_ids.extend(chunk)
+                    await uow.commit()
+            task_ids.extend(await uow.tasks.delete_for_project(id))
+            await uow.projects.delete(project)
+            uow.after_commit(lambda: summary_cache.invalidate(id))
+            uow.after_commit(lambda: evict_tasks(task_ids))
+            await uow.commit()
+    return project
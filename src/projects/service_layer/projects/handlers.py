@@ -1,36 +1,65 @@
-from typing import List
+from typing import Iterator, List
 
-from projects.adapters.projects import repository
+from projects.adapters.cache import entity_cache
 from projects.domain.project import Project
+from projects.service_layer import unit_of_work
+from projects.service_layer.tasks.summary_cache import summary_cache
 
-def get_project(id: int, repo: repository.AbstractProjectRepository) -> Project:
-    """Gets a project by its ID."""
-    return repo.get(id)
+def get_project(id: int, uow: unit_of_work.AbstractUnitOfWork, include_tasks: bool = False) -> Project:
+    """Gets a project by its ID, optionally with its tasks loaded."""
+    return uow.projects.get(id, include_tasks=include_tasks)
 
-def get_projects(repo: repository.AbstractProjectRepository) -> List[Project]:
-    """Gets a list of all projects."""
-    return repo.list()
+def get_projects(uow: unit_of_work.AbstractUnitOfWork, include_tasks: bool = False) -> List[Project]:
+    """Gets a list of all projects, optionally with their tasks loaded."""
+    with uow.replica_reads():
+        return uow.projects.list(include_tasks=include_tasks)
 
-def create_project(name: str, description: str, repo: repository.AbstractProjectRepository) -> Project:
+def stream_projects(uow: unit_of_work.AbstractUnitOfWork, batch_size: int = 1000,
+                    include_tasks: bool = False) -> Iterator[Project]:
+    """Yields all projects, fetched from the database in batches."""
+    return uow.projects.stream(batch_size, include_tasks=include_tasks)
+
+def create_project(name: str, description: str, uow: unit_of_work.AbstractUnitOfWork) -> Project:
     """Creates a new project."""
-    project = Project(name=name, description=description)
-    repo.create(project)
-    repo.session.commit()
+    with uow:
+        project = Project(name=name, description=description)
+        uow.projects.create(project)
+        uow.commit()
     return project
 
-def update_project(id: int, name: str, description: str, repo: repository.AbstractProjectRepository) -> Project:
+def update_project(id: int, name: str, description: str, uow: unit_of_work.AbstractUnitOfWork) -> Project:
     """Updates an existing project."""
-    project = repo.get(id)
-    if project:
-        project.name = name
-        project.description = description
-        repo.update(project)
-        repo.session.commit()
+    with uow:
+        project = uow.projects.update(Project(id=id, name=name, description=description))
+        if project:
+            uow.commit()
     return project
 
-def delete_project(id: int, repo: repository.AbstractProjectRepository):
-    """Deletes a project by its ID."""
-    project = repo.get(id)
-    if project:
-        repo.delete(project)
-        repo.session.commit()
+def evict_tasks(task_ids: List[int]) -> None:
+    if not entity_cache.enabled:
+        return
+    for task_id in task_ids:
+        entity_cache.invalidate('task', task_id)
+
+def delete_project(id: int, uow: unit_of_work.AbstractUnitOfWork, chunk_size: int = 0):
+    """Deletes a project by its ID together with its tasks.
+
+    The tasks go in one set-based delete in the same transaction as the
+    project. With ``chunk_size``, they are first deleted ``chunk_size`` at a
+    time, each chunk committed on its own, so no transaction holds locks
+    on all of a very large project's rows. Once the project is gone, every
+    deleted task is evicted from the entity cache.
+    """
+    with uow:
+        project = uow.projects.get(id)
+        if project:
+            task_ids = []
+            if chunk_size:
+                while chunk := uow.tasks.delete_for_project(id, limit=chunk_size):
+                    task_ids.extend(chunk)
+                    uow.commit()
+            task_ids.extend(uow.tasks.delete_for_project(id))
+            uow.projects.delete(project)
+            uow.after_commit(lambda: summary_cache.invalidate(id))
+            uow.after_commit(lambda: evict_tasks(task_ids))
+            uow.commit()
@@ -0,0 +1,70 @@
+from typing import AsyncIterator, Dict, List, Optional
+
+from projects.domain.task import Task
+from projects.service_layer import async_unit_of_work
+from projects.service_layer.tasks.summary_cache import summary_cache
+
+async def get_task(id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Optional[Task]:
+    """Gets a task by its ID."""
+    return await uow.tasks.get(id)
+
+async def get_tasks_for_project(project_id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                                status: Optional[str] = None, after: Optional[int] = None,
+                                limit: Optional[int] = None) -> List[Task]:
+    """Gets tasks for a specific project ordered by id, optionally filtered by status."""
+    return await uow.tasks.list(project_id, status=status, after=after, limit=limit)
+
+async def stream_tasks_for_project(project_id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                                   status: Optional[str] = None,
+                                   batch_size: int = 1000) -> AsyncIterator[Task]:
+    """Yields a project's tasks by id, fetched from the database in batches."""
+    return await uow.tasks.stream(project_id, status=status, batch_size=batch_size)
+
+async def create_task(project_id: int, name: str, status: str,
+                      uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Task:
+    """Creates a new task in the project."""
+    async with uow:
+        task = Task(id=None, project_id=project_id, name=name, status=status)
+        await uow.tasks.create(task)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        await uow.commit()
+    return task
+
+async def create_tasks(project_id: int, tasks: List[dict], uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                       batch_size: int = 1000) -> List[int]:
+    """Creates many tasks in the project in one transaction and returns their IDs."""
+    async with uow:
+        ids = await uow.tasks.create_many(project_id, tasks, batch_size)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        await uow.commit()
+    return ids
+
+async def update_task_status(project_id: int, task_id: int, status: str,
+                             uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Optional[Task]:
+    """Updates the task status, or returns None if the project has no such task."""
+    async with uow:
+        tasks = await uow.tasks.update_status(project_id, status, ids=[task_id])
+        task = tasks[0] if tasks else None
+        if task:
+            uow.after_commit(lambda: summary_cache.invalidate(project_id))
+            await uow.commit()
+    return task
+
+async def update_tasks_status(project_id: int, status: str, uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                              ids: Optional[List[int]] = None,
+                              current_status: Optional[str] = None) -> List[Task]:
+    """Updates the status of many tasks in one statement and one transaction."""
+    async with uow:
+        tasks = await uow.tasks.update_status(project_id, status, ids=ids, current_status=current_status)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        await uow.commit()
+    return tasks
+
+async def get_task_summary(uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                           project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+    """Counts tasks per status for one project, or for every project with tasks."""
+    summary = summary_cache.get(project_id)
+    if summary is None:
+        summary = await uow.tasks.count_by_status(project_id)
+        summary_cache.set(project_id, summary)
+    return summary
@@ -1,35 +1,77 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-from projects.adapters.tasks import repository
 from projects.domain.task import Task #TaskStatusEnum
+from projects.service_layer import unit_of_work
+from projects.service_layer.tasks.summary_cache import summary_cache
 
-def get_task(id: int, repo: repository.AbstractTaskRepository) -> Task:
+def get_task(id: int, uow: unit_of_work.AbstractUnitOfWork) -> Task:
     """Gets a task by its ID."""
-    return repo.get(id)
+    return uow.tasks.get(id)
 
-def get_tasks_for_project(project_id: int, repo: repository.AbstractTaskRepository) -> List[Task]:
-    """Gets all tasks for a specific project."""
-    return repo.list(project_id)
+def get_tasks_for_project(project_id: int, uow: unit_of_work.AbstractUnitOfWork,
+                          status: Optional[str] = None, after: Optional[int] = None,
+                          limit: Optional[int] = None) -> List[Task]:
+    """Gets tasks for a specific project ordered by id, optionally filtered by status."""
+    with uow.replica_reads():
+        return uow.tasks.list(project_id, status=status, after=after, limit=limit)
 
-def create_task(project_id: int, name: str, status:str, repo: repository.AbstractTaskRepository) -> Task:
+def stream_tasks_for_project(project_id: int, uow: unit_of_work.AbstractUnitOfWork,
+                             status: Optional[str] = None, batch_size: int = 1000) -> Iterator[Task]:
+    """Yields tasks for a specific project, fetched from the database in batches."""
+    return uow.tasks.stream(project_id, status=status, batch_size=batch_size)
+
+def create_task(project_id: int, name: str, status:str, uow: unit_of_work.AbstractUnitOfWork) -> Task:
     """Creates a new task in the project."""
-    task = Task(id=None, project_id=project_id, name=name, status=status)
-    repo.create(task)
-    repo.session.commit()
+    with uow:
+        task = Task(id=None, project_id=project_id, name=name, status=status)
+        uow.tasks.create(task)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        uow.commit()
     return task
 
-def update_task_status(project_id: int, task_id: int, status: str, repo: repository.AbstractTaskRepository) -> Task:
+def create_tasks(project_id: int, tasks: List[dict], uow: unit_of_work.AbstractUnitOfWork,
+                 batch_size: int = 1000) -> List[int]:
+    """Creates many tasks in the project in one transaction and returns their IDs."""
+    with uow:
+        ids = uow.tasks.create_many(project_id, tasks, batch_size)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        uow.commit()
+    return ids
+
+def update_task_status(project_id: int, task_id: int, status: str, uow: unit_of_work.AbstractUnitOfWork) -> Task:
     """Updates the task status."""
-    task = repo.get(task_id)
-    if task and task.project_id == project_id:
-        task.status = status  # Enum ??
-        repo.update(task)
-        repo.session.commit()
+    with uow:
+        tasks = uow.tasks.update_status(project_id, status, ids=[task_id])
+        task = tasks[0] if tasks else None
+        if task:
+            uow.after_commit(lambda: summary_cache.invalidate(project_id))
+            uow.commit()
     return task
 
-def delete_task(id: int, repo: repository.AbstractTaskRepository):
+def update_tasks_status(project_id: int, status: str, uow: unit_of_work.AbstractUnitOfWork,
+                        ids: Optional[List[int]] = None, current_status: Optional[str] = None) -> List[Task]:
+    """Updates the status of many tasks in one statement and one transaction."""
+    with uow:
+        tasks = uow.tasks.update_status(project_id, status, ids=ids, current_status=current_status)
+        uow.after_commit(lambda: summary_cache.invalidate(project_id))
+        uow.commit()
+    return tasks
+
+def delete_task(id: int, uow: unit_of_work.AbstractUnitOfWork):
     """Deletes a task by its ID."""
-    task = repo.get(id)
-    if task:
-        repo.delete(task)
-        repo.session.commit()
\ No newline at end of file
+    with uow:
+        task = uow.tasks.get(id)
+        if task:
+            project_id = task.project_id
+            uow.tasks.delete(task)
+            uow.after_commit(lambda: summary_cache.invalidate(project_id))
+            uow.commit()
+
+def get_task_summary(uow: unit_of_work.AbstractUnitOfWork,
+                     project_id: Optional[int] = None) -> Dict[int, Dict[Optional[str], int]]:
+    """Counts tasks per status for one project, or for every project with tasks."""
+    summary = summary_cache.get(project_id)
+    if summary is None:
+        summary = uow.tasks.count_by_status(project_id)
+        summary_cache.set(project_id, summary)
+    return summary
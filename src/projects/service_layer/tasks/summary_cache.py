@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Dict, Optional
+
+ALL_PROJECTS = None
+
+
+class SummaryCache:
+    """Short-lived cache of per-status task counts, keyed by project id.
+
+    The ``ALL_PROJECTS`` key holds the summary across every project and is
+    dropped whenever any single project is invalidated.
+    """
+
+    def __init__(self, ttl: float = 5) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Optional[int], tuple] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, ttl: float) -> None:
+        with self._lock:
+            self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, project_id: Optional[int]):
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[0]
+
+    def set(self, project_id: Optional[int], summary) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[project_id] = (summary, time.monotonic() + self.ttl)
+
+    def invalidate(self, project_id: int) -> None:
+        with self._lock:
+            self._entries.pop(project_id, None)
+            self._entries.pop(ALL_PROJECTS, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+summary_cache = SummaryCache()
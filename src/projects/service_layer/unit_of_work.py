@@ -0,0 +1,159 @@
+import abc
+import contextlib
+from typing import Callable, List
+
+import flask_sqlalchemy
+from flask import current_app
+
+from projects.adapters.cache import entity_cache
+from projects.adapters.routing import replica_engines
+from projects.adapters.projects import repository as project_repository
+from projects.adapters.tasks import repository as task_repository
+from projects.adapters.users import repository as user_repository
+
+
+class AbstractUnitOfWork(abc.ABC):
+    """Owns the repositories of one use case and the transaction they share.
+
+    Handlers wrap their work in ``with uow:`` and call ``uow.commit()``.
+    Blocks nest: only the outermost block's commit reaches the database, so
+    a route can compose several handlers into a single transaction. Leaving
+    the outermost block without committing, or because of an exception,
+    rolls back and drops the queued ``after_commit`` callbacks.
+    """
+
+    projects: project_repository.AbstractProjectRepository
+    tasks: task_repository.AbstractTaskRepository
+    users: user_repository.AbstractRepository
+    has_replicas = False
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._committed = False
+        self._after_commit: List[Callable[[], None]] = []
+
+    def __enter__(self) -> 'AbstractUnitOfWork':
+        if self._depth == 0:
+            self._committed = False
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth == 0 and (exc_type is not None or not self._committed):
+            self.rollback()
+
+    def commit(self) -> None:
+        if self._depth > 1:
+            return
+        self._commit()
+        self._committed = True
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        self._after_commit.clear()
+        self._rollback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Runs ``callback`` once the enclosing transaction has committed."""
+        self._after_commit.append(callback)
+
+    @contextlib.contextmanager
+    def replica_reads(self):
+        """Lets reads in the block go to a read replica, where one is configured."""
+        yield self
+
+    @abc.abstractmethod
+    def _commit(self) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _rollback(self) -> None:
+        raise NotImplementedError
+
+
+class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
+    """Unit of work over the Flask-SQLAlchemy session.
+
+    When the entity cache is enabled, the repositories are wrapped so that
+    ``get`` reads through it and writes invalidate it again after commit.
+    """
+
+    def __init__(self, db: flask_sqlalchemy.SQLAlchemy):
+        super().__init__()
+        self.session = db.session
+        self.has_replicas = bool(replica_engines())
+        self.projects = project_repository.SqlAlchemyProjectRepository(db.session)
+        self.tasks = task_repository.SqlAlchemyTaskRepository(db.session)
+        self.users = user_repository.FlaskSqlAlchemyRepository(db)
+        if entity_cache.enabled:
+            self.projects = project_repository.CachingProjectRepository(
+                self.projects, entity_cache, self.after_commit)
+            self.tasks = task_repository.CachingTaskRepository(
+                self.tasks, entity_cache, self.after_commit)
+            self.users = user_repository.CachingUserRepository(
+                self.users, entity_cache, self.after_commit)
+
+    @contextlib.contextmanager
+    def replica_reads(self):
+        previous = self.session.info.get('use_replica', False)
+        self.session.info['use_replica'] = True
+        try:
+            yield self
+        finally:
+            self.session.info['use_replica'] = previous
+
+    def _commit(self) -> None:
+        self.session.commit()
+
+    def _rollback(self) -> None:
+        self.session.rollback()
+
+
+class InMemoryUnitOfWork(AbstractUnitOfWork):
+    """Unit of work over the in-memory repositories, for tests and benchmarks.
+
+    Writes land in the repositories straight away, so there is nothing to
+    roll back; commits are only counted. Pass the same repositories to
+    several units of work to share their data.
+    """
+
+    def __init__(self, projects: project_repository.InMemoryProjectRepository = None,
+                 tasks: task_repository.InMemoryTaskRepository = None,
+                 users: user_repository.InMemoryUserRepository = None):
+        super().__init__()
+        self.tasks = tasks if tasks is not None else task_repository.InMemoryTaskRepository()
+        self.projects = projects if projects is not None else \
+            project_repository.InMemoryProjectRepository(self.tasks)
+        self.users = users if users is not None else user_repository.InMemoryUserRepository()
+        self.commits = 0
+
+    def _commit(self) -> None:
+        self.commits += 1
+
+    def _rollback(self) -> None:
+        pass
+
+
+def make_unit_of_work(db: flask_sqlalchemy.SQLAlchemy) -> AbstractUnitOfWork:
+    """The unit of work for the current app's REPOSITORY_BACKEND."""
+    repositories = current_app.extensions.get('memory_repositories')
+    if repositories is not None:
+        return InMemoryUnitOfWork(**repositories)
+    return SqlAlchemyUnitOfWork(db)
+
+
+def init_repositories(app) -> None:
+    """Sets up the app-wide repositories named by REPOSITORY_BACKEND."""
+    backend = app.config['REPOSITORY_BACKEND']
+    if backend == 'memory':
+        tasks = task_repository.InMemoryTaskRepository()
+        app.extensions['memory_repositories'] = {
+            'projects': project_repository.InMemoryProjectRepository(tasks),
+            'tasks': tasks,
+            'users': user_repository.InMemoryUserRepository(),
+        }
+    elif backend != 'sqlalchemy':
+        raise ValueError(f"Unknown repository backend: {backend}")
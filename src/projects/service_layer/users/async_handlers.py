@@ -0,0 +1,124 @@
+import asyncio
+import secrets
+import time
+from datetime import datetime, timezone, timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+
+from projects.domain.user import User
+from projects.service_layer import async_unit_of_work
+from projects.service_layer.users.handlers import new_user, reject_taken, validate_new_users
+from projects.service_layer.users.password_hasher import password_hasher
+from projects.service_layer.users.token_cache import token_cache
+from projects.service_layer.users.token_denylist import token_denylist
+
+async def get_user(id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork):
+    return await uow.users.get(id)
+
+async def get_user_by_username(username: str, uow: async_unit_of_work.AbstractAsyncUnitOfWork):
+    return await uow.users.get_by_username(username)
+
+async def get_user_by_email(email: str, uow: async_unit_of_work.AbstractAsyncUnitOfWork):
+    return await uow.users.get_by_email(email)
+
+async def get_users(uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                    after: Optional[str] = None, limit: Optional[int] = None) -> List[User]:
+    """Lists users ordered by username, starting after the given username."""
+    return await uow.users.list(after=after, limit=limit)
+
+async def stream_users(uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                       batch_size: int = 1000) -> AsyncIterator[User]:
+    """Yields all users by username, fetched from the database in batches."""
+    return await uow.users.stream(batch_size)
+
+async def set_password(user: User, password: str) -> None:
+    """Hashes off the event loop; hashing is CPU-bound."""
+    user.password_hash = await asyncio.to_thread(password_hasher.hash, password)
+
+async def verify_password(user: User, password: str,
+                          uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> bool:
+    """Checks the password and upgrades the stored hash if its method is outdated."""
+    if not await asyncio.to_thread(password_hasher.verify, user.password_hash, password):
+        return False
+    if password_hasher.needs_rehash(user.password_hash):
+        async with uow:
+            await set_password(user, password)
+            await uow.users.update(user)
+            await uow.commit()
+    return True
+
+async def create_user(user: User, uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> None:
+    async with uow:
+        await uow.users.create(user)
+        await uow.commit()
+
+async def create_users(rows: List[dict], uow: async_unit_of_work.AbstractAsyncUnitOfWork,
+                       batch_size: int = 1000) -> Tuple[List[Tuple[int, User]], List[dict]]:
+    """Creates many users in one transaction, like ``handlers.create_users``."""
+    valid, errors = validate_new_users(rows)
+    existing = await uow.users.find_conflicts(
+        [row['username'] for _, row in valid], [row['email'] for _, row in valid]) if valid else []
+    accepted = reject_taken(valid, existing, errors)
+
+    hashes = await asyncio.to_thread(
+        password_hasher.hash_many, [row['password'] for _, row in accepted])
+    users = [new_user(row, password_hash) for (_, row), password_hash in zip(accepted, hashes)]
+    async with uow:
+        await uow.users.create_many(users, batch_size)
+        await uow.commit()
+    errors.sort(key=lambda e: e['index'])
+    return [(i, user) for (i, _), user in zip(accepted, users)], errors
+
+async def issue_new_token(user: User, expires_in: int,
+                          uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> str:
+    now = datetime.now(timezone.utc)
+    token = secrets.token_hex(16)
+    user_id = user.id
+    async with uow:
+        user.token = token
+        user.token_expiration = now + timedelta(seconds=expires_in)
+        await uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate_user(user_id))
+        await uow.commit()
+    return token
+
+async def revoke_token(user: User, uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> None:
+    token = user.token
+    async with uow:
+        user.revoke_token()
+        await uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate(token))
+        # Other processes drop their cached copy on the next lookup.
+        uow.after_commit(lambda: token_denylist.add(token, time.time() + token_cache.ttl))
+        await uow.commit()
+
+async def check_token(token, uow: async_unit_of_work.AbstractAsyncUnitOfWork):
+    cached = token_cache.get(token)
+    if cached is not None and token in token_denylist:
+        token_cache.invalidate(token)
+        return None
+    if cached is not None:
+        return await uow.users.attach(cached)
+    user = await uow.users.get_by_token(token)
+    if user is None or user.token_expiration.replace(
+            tzinfo=timezone.utc) < datetime.now(timezone.utc):
+        return None
+    token_cache.set(token, uow.users.detach(user))
+    return user
+
+async def promote_to_manager(user: User, uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> None:
+    user_id = user.id
+    async with uow:
+        user.is_manager = True
+        await uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate_user(user_id))
+        await uow.commit()
+
+async def delete_user(id: int, uow: async_unit_of_work.AbstractAsyncUnitOfWork) -> Optional[User]:
+    """Deletes a user by its ID and returns it, or None if there was none."""
+    async with uow:
+        user = await uow.users.get(id)
+        if user:
+            await uow.users.delete(user)
+            uow.after_commit(lambda: token_cache.invalidate_user(id))
+            await uow.commit()
+    return user
@@ -1,58 +1,193 @@
 import secrets
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
-from projects.adapters.users import repository
 from projects.domain.user import User
+from projects.service_layer import unit_of_work
+from projects.service_layer.users.password_hasher import password_hasher
+from projects.service_layer.users.token_cache import token_cache
+from projects.service_layer.users.token_denylist import token_denylist
 
-def get_user(id: int, repo: repository.AbstractRepository):
-    return repo.get(id)
+def get_user(id: int, uow: unit_of_work.AbstractUnitOfWork):
+    return uow.users.get(id)
 
-def get_user_by_username(username: str, repo: repository.AbstractRepository):
-    return repo.get_by_username(username)
+def get_user_by_username(username: str, uow: unit_of_work.AbstractUnitOfWork):
+    return uow.users.get_by_username(username)
 
-def get_user_by_email(email: str, repo: repository.AbstractRepository):
-    return repo.get_by_email(email)
+def get_user_by_email(email: str, uow: unit_of_work.AbstractUnitOfWork):
+    return uow.users.get_by_email(email)
 
-def update_user(user: User, repo: repository.AbstractRepository):
-    user = repo.update(user)
-    repo.db.session.commit()
+def update_user(user: User, uow: unit_of_work.AbstractUnitOfWork):
+    user_id = user.id
+    with uow:
+        user = uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate_user(user_id))
+        uow.commit()
     return user
 
-def get_users(repo: repository.AbstractRepository) -> List[User]:
-    return repo.list()
+def get_users(uow: unit_of_work.AbstractUnitOfWork,
+              after: Optional[str] = None, limit: Optional[int] = None) -> List[User]:
+    """Lists users ordered by username, starting after the given username."""
+    with uow.replica_reads():
+        return uow.users.list(after=after, limit=limit)
 
-def create_user(user: User, repo: repository.AbstractRepository) -> None:
-    repo.create(user)
-    repo.db.session.commit()
+def stream_users(uow: unit_of_work.AbstractUnitOfWork, batch_size: int = 1000) -> Iterator[User]:
+    """Yields all users by username, fetched from the database in batches."""
+    return uow.users.stream(batch_size)
 
-def issue_new_token(user: User, expires_in: int, repo: repository.AbstractRepository) -> str:
+def set_password(user: User, password: str) -> None:
+    user.password_hash = password_hasher.hash(password)
+
+def verify_password(user: User, password: str, uow: unit_of_work.AbstractUnitOfWork) -> bool:
+    """Checks the password and upgrades the stored hash if its method is outdated."""
+    if not password_hasher.verify(user.password_hash, password):
+        return False
+    if password_hasher.needs_rehash(user.password_hash):
+        with uow:
+            set_password(user, password)
+            uow.users.update(user)
+            uow.commit()
+    return True
+
+def create_user(user: User, uow: unit_of_work.AbstractUnitOfWork) -> None:
+    with uow:
+        uow.users.create(user)
+        uow.commit()
+
+def validate_new_users(rows: List[dict]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """Splits bulk-create rows into valid ones, paired with their index, and errors.
+
+    Rows repeating a username or e-mail from an earlier row are rejected.
+    """
+    errors = []
+    valid = []
+    seen_usernames, seen_emails = set(), set()
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict) or not all(row.get(f) for f in ('username', 'email', 'password')):
+            errors.append({'index': i, 'error': 'must include username, email and password fields'})
+        elif not all(isinstance(row[f], str) for f in ('username', 'email', 'password')):
+            errors.append({'index': i, 'error': 'username, email and password must be strings'})
+        elif row['username'] in seen_usernames:
+            errors.append({'index': i, 'error': 'duplicate username in request'})
+        elif row['email'] in seen_emails:
+            errors.append({'index': i, 'error': 'duplicate e-mail in request'})
+        else:
+            seen_usernames.add(row['username'])
+            seen_emails.add(row['email'])
+            valid.append((i, row))
+    return valid, errors
+
+def reject_taken(valid: List[Tuple[int, dict]], existing: List[User],
+                 errors: List[dict]) -> List[Tuple[int, dict]]:
+    """Drops rows whose username or e-mail belongs to an existing user, recording an error."""
+    taken_usernames = {u.username for u in existing}
+    taken_emails = {u.email for u in existing}
+    accepted = []
+    for i, row in valid:
+        if row['username'] in taken_usernames:
+            errors.append({'index': i, 'error': 'please use a different username'})
+        elif row['email'] in taken_emails:
+            errors.append({'index': i, 'error': 'please use a different e-mail'})
+        else:
+            accepted.append((i, row))
+    return accepted
+
+def new_user(row: dict, password_hash: str) -> User:
+    user = User(username=row['username'], email=row['email'])
+    user.password_hash = password_hash
+    return user
+
+def create_users(rows: List[dict], uow: unit_of_work.AbstractUnitOfWork,
+                 batch_size: int = 1000) -> Tuple[List[Tuple[int, User]], List[dict]]:
+    """Creates many users in one transaction.
+
+    Returns the created users paired with their row index, and one error per
+    rejected row. Conflicts with existing users are checked in one query and
+    passwords are hashed in parallel.
+    """
+    valid, errors = validate_new_users(rows)
+    existing = uow.users.find_conflicts(
+        [row['username'] for _, row in valid], [row['email'] for _, row in valid]) if valid else []
+    accepted = reject_taken(valid, existing, errors)
+
+    hashes = password_hasher.hash_many([row['password'] for _, row in accepted])
+    users = [new_user(row, password_hash) for (_, row), password_hash in zip(accepted, hashes)]
+    with uow:
+        uow.users.create_many(users, batch_size)
+        created = [(i, uow.users.detach(user)) for (i, _), user in zip(accepted, users)]
+        uow.commit()
+    errors.sort(key=lambda e: e['index'])
+    return created, errors
+
+def issue_new_token(user: User, expires_in: int, uow: unit_of_work.AbstractUnitOfWork) -> str:
     now = datetime.now(timezone.utc)
     token = secrets.token_hex(16)
     token_expiration = now + timedelta(seconds=expires_in)
-    user.token = token
-    user.token_expiration = token_expiration
-    repo.db.session.commit()
-    return user.token
+    user_id = user.id
+    with uow:
+        user.token = token
+        user.token_expiration = token_expiration
+        uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate_user(user_id))
+        uow.commit()
+    return token
 
-def revoke_token(user: User, repo: repository.AbstractRepository) -> None:
-    user.revoke_token()
-    repo.db.session.commit()
+def revoke_token(user: User, uow: unit_of_work.AbstractUnitOfWork) -> None:
+    token = user.token
+    with uow:
+        user.revoke_token()
+        uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate(token))
+        # Other processes drop their cached copy on the next lookup.
+        uow.after_commit(lambda: token_denylist.add(token, time.time() + token_cache.ttl))
+        uow.commit()
 
-def check_token(token, repo: repository.AbstractRepository):
-    user = repo.get_by_token(token)
+def check_token(token, uow: unit_of_work.AbstractUnitOfWork):
+    cached = token_cache.get(token)
+    if cached is not None and token in token_denylist:
+        token_cache.invalidate(token)
+        return None
+    if cached is not None:
+        return uow.users.attach(cached)
+    with uow.replica_reads():
+        user = uow.users.get_by_token(token)
+    if user is None and uow.has_replicas:
+        # A token issued moments ago may not have reached the replica yet.
+        user = uow.users.get_by_token(token)
     if user is None or user.token_expiration.replace(
             tzinfo=timezone.utc) < datetime.now(timezone.utc):
         return None
+    token_cache.set(token, uow.users.detach(user))
     return user
 
-def promote_to_manager(user: User, repo: repository.AbstractRepository) -> None:
-    user.is_manager = True
-    repo.db.session.commit()
+def issue_access_token(user: User, expires_in: int, secret: str) -> str:
+    return user.get_access_token(secret, expires_in)
+
+def check_access_token(token: str, secret: str):
+    claims = User.decode_access_token(token, secret)
+    if claims is None or claims['jti'] in token_denylist:
+        return None
+    return User.from_access_token_claims(claims)
+
+def revoke_access_token(token: str, secret: str) -> None:
+    claims = User.decode_access_token(token, secret)
+    if claims is not None:
+        token_denylist.add(claims['jti'], claims['exp'])
+
+def promote_to_manager(user: User, uow: unit_of_work.AbstractUnitOfWork) -> None:
+    user_id = user.id
+    with uow:
+        user.is_manager = True
+        uow.users.update(user)
+        uow.after_commit(lambda: token_cache.invalidate_user(user_id))
+        uow.commit()
 from flask import abort
-def delete_user(id: int, repo: repository.AbstractRepository):
-    user = repo.get(id)
-    if not user:  
-        abort(404, description="User not found")
-    repo.delete(user) 
-    repo.db.session.commit() 
\ No newline at end of file
+def delete_user(id: int, uow: unit_of_work.AbstractUnitOfWork):
+    with uow:
+        user = uow.users.get(id)
+        if not user:  
+            abort(404, description="User not found")
+        uow.users.delete(user) 
+        uow.after_commit(lambda: token_cache.invalidate_user(id))
+        uow.commit() 
\ No newline at end of file
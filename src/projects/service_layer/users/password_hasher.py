@@ -0,0 +1,91 @@
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import List
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing jobs are already waiting."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded process pool.
+
+    With ``max_workers=0`` single hashes run inline on the calling thread
+    and batches on a shared thread pool.
+    """
+
+    def __init__(self, method: str = 'scrypt', max_workers: int = 0,
+                 max_queue: int = 64) -> None:
+        self._executor = None
+        self._lock = threading.Lock()
+        self.configure(method, max_workers, max_queue)
+
+    def configure(self, method: str, max_workers: int, max_queue: int) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.method = method
+            self.max_workers = max_workers
+            self.max_queue = max_queue
+            self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+            self._prefix = None
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hashes passwords in parallel; the whole batch counts as one queued job.
+
+        Without a process pool, the shared thread pool is used instead
+        since hashlib releases the GIL while hashing.
+        """
+        if not passwords:
+            return []
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            chunksize = max(1, len(passwords) // ((self.max_workers or 1) * 4))
+            return list(self._get_executor().map(
+                generate_password_hash, passwords, repeat(self.method), chunksize=chunksize))
+        finally:
+            slots.release()
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        if self._prefix is None:
+            self._prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def _run(self, fn, *args):
+        if not self.max_workers:
+            return fn(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                        thread_name_prefix='password-hasher')
+            return self._executor
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from projects.domain.user import User
+
+
+class TokenCache:
+    """Bounded LRU cache mapping bearer tokens to users.
+
+    Entries live for at most ``ttl`` seconds and never outlive the
+    token's own ``token_expiration``.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize: int, ttl: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def set(self, token: str, user: User) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        remaining = (user.token_expiration.replace(tzinfo=timezone.utc)
+                     - datetime.now(timezone.utc)).total_seconds()
+        lifetime = min(self.ttl, remaining)
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (user, time.monotonic() + lifetime)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: Optional[str]) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [token for token, (user, _) in self._entries.items()
+                     if user.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+            }
+
+
+token_cache = TokenCache()
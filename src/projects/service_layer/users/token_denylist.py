@@ -0,0 +1,73 @@
+import math
+import threading
+import time
+from typing import Optional
+
+from projects.adapters.cache import AbstractCacheBackend, KeyValueCacheBackend
+
+
+class TokenDenylist:
+    """Revoked access token ids, kept only until the tokens would expire.
+
+    Without a backend the ids are held in this process, so the other
+    workers and nodes keep accepting a revoked token until it expires.
+    With a ``KeyValueCacheBackend`` on a shared store, every process that
+    uses the store sees the revocation.
+    """
+
+    def __init__(self, backend: Optional[AbstractCacheBackend] = None) -> None:
+        self.backend = backend
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def configure(self, backend: Optional[AbstractCacheBackend]) -> None:
+        with self._lock:
+            self.backend = backend
+            self._revoked.clear()
+
+    def add(self, jti: str, exp: float) -> None:
+        if self.backend is not None:
+            ttl = math.ceil(exp - time.time())
+            if ttl > 0:
+                self.backend.set(jti, True, ttl)
+            return
+        with self._lock:
+            self._purge()
+            self._revoked[jti] = exp
+
+    def __contains__(self, jti: str) -> bool:
+        if self.backend is not None:
+            return self.backend.get(jti) is not None
+        with self._lock:
+            return jti in self._revoked
+
+    def __len__(self) -> int:
+        if self.backend is not None:
+            return len(self.backend)
+        with self._lock:
+            self._purge()
+            return len(self._revoked)
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+        with self._lock:
+            self._revoked.clear()
+
+    def _purge(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[jti]
+
+
+def make_denylist_backend(name: str, client) -> Optional[AbstractCacheBackend]:
+    """The backend named by TOKEN_DENYLIST_BACKEND; None keeps the ids in this process."""
+    if name == 'local':
+        return None
+    if name == 'keyvalue':
+        # Its own namespace, so clearing the entity cache keeps revocations.
+        return KeyValueCacheBackend(client, prefix='projects-revoked:')
+    raise ValueError(f"Unknown token denylist backend: {name}")
+
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,177 @@
+import asyncio
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from conftest import TestConfig, get_basic_auth_header
+from projects.domain.user import User
+from projects.entrypoints.asgi import create_app
+
+
+def run_in_transaction(scenario, config_class=TestConfig):
+    """Runs ``scenario(client, session)`` against the ASGI app inside a rolled-back transaction."""
+    app = create_app(config_class)
+
+    async def main():
+        async with app.state.engine.connect() as connection:
+            transaction = await connection.begin()
+            app.state.session_factory = async_sessionmaker(
+                bind=connection, expire_on_commit=False,
+                join_transaction_mode="create_savepoint")
+            transport = httpx.ASGITransport(app=app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    async with app.state.session_factory() as session:
+                        await scenario(client, session)
+            finally:
+                await transaction.rollback()
+        await app.state.engine.dispose()
+
+    asyncio.run(main())
+
+
+async def add_manager(session):
+    manager = User(username="manager1", email="manager@example.com", is_manager=True)
+    manager.set_password("secret")
+    manager.issue_token()
+    session.add(manager)
+    await session.commit()
+    return {"Authorization": f"Bearer {manager.token}"}
+
+
+def test_asgi_projects_and_tasks():
+    async def scenario(client, session):
+        headers = await add_manager(session)
+
+        r = await client.post("/api/projects", json={"name": "p1"}, headers=headers)
+        assert r.status_code == 201
+        project_id = r.json()["id"]
+
+        r = await client.post(f"/api/projects/{project_id}/tasks/bulk",
+                              json=[{"name": f"task-{i}", "status": "NEW"} for i in range(3)],
+                              headers=headers)
+        assert r.status_code == 201
+
+        r = await client.get(f"/api/projects/{project_id}/tasks?limit=2", headers=headers)
+        page = r.json()
+        assert [t["name"] for t in page["items"]] == ["task-0", "task-1"]
+        assert page["_links"]["next"] == (
+            f"/api/projects/{project_id}/tasks?limit=2&after={page['_meta']['next_cursor']}")
+
+        r = await client.get(f"/api/projects/{project_id}?include=tasks", headers=headers)
+        assert len(r.json()["tasks"]) == 3
+
+        r = await client.get(f"/api/projects/{project_id}/summary", headers=headers)
+        assert r.json() == {"project_id": project_id, "total": 3, "statuses": {"NEW": 3}}
+
+        r = await client.patch(f"/api/projects/{project_id}/tasks",
+                               json={"status": "ARCHIVED", "filter": {}}, headers=headers)
+        assert r.status_code == 400
+        r = await client.patch(f"/api/projects/{project_id}/tasks", json=["ARCHIVED"], headers=headers)
+        assert r.status_code == 400
+        r = await client.patch(f"/api/projects/{project_id}/tasks",
+                               json={"status": None, "ids": [True]}, headers=headers)
+        assert r.status_code == 400
+        r = await client.patch("/api/projects/0/tasks", json={"status": "DONE", "ids": [1]},
+                               headers=headers)
+        assert r.status_code == 404
+
+        assert (await client.get("/api/projects/0", headers=headers)).status_code == 404
+        assert (await client.get("/api/projects")).status_code == 401
+
+    run_in_transaction(scenario)
+
+
+def test_asgi_tokens():
+    async def scenario(client, session):
+        await add_manager(session)
+
+        r = await client.post("/api/tokens", headers=get_basic_auth_header("manager1", "secret"))
+        headers = {"Authorization": f"Bearer {r.json()['token']}"}
+        assert (await client.get("/api/users", headers=headers)).status_code == 200
+
+        assert (await client.delete("/api/tokens", headers=headers)).status_code == 204
+        assert (await client.get("/api/users", headers=headers)).status_code == 401
+
+    run_in_transaction(scenario)
+
+
+def test_asgi_streams_lists():
+    async def scenario(client, session):
+        headers = await add_manager(session)
+        r = await client.post("/api/projects", json={"name": "p1"}, headers=headers)
+        project_id = r.json()["id"]
+        await client.post(f"/api/projects/{project_id}/tasks/bulk",
+                          json=[{"name": f"task-{i}", "status": "NEW"} for i in range(3)],
+                          headers=headers)
+
+        r = await client.get(f"/api/projects/{project_id}/tasks?stream=1", headers=headers)
+        assert r.headers["content-type"] == "application/json"
+        assert [t["name"] for t in r.json()] == ["task-0", "task-1", "task-2"]
+
+        r = await client.get("/api/projects?stream=1&include=tasks", headers=headers)
+        assert [len(p["tasks"]) for p in r.json()] == [3]
+
+        r = await client.get("/api/users?stream=1", headers=headers)
+        assert r.json() == [{"username": "manager1", "email": "manager@example.com"}]
+
+    run_in_transaction(scenario)
+
+
+def test_asgi_bulk_create_users():
+    async def scenario(client, session):
+        headers = await add_manager(session)
+        rows = [
+            {"username": "u1", "email": "u1@example.com", "password": "pw"},
+            {"username": "manager1", "email": "other@example.com", "password": "pw"},
+            {"username": ["u3"], "email": "u3@example.com", "password": "pw"},
+        ]
+        r = await client.post("/api/users/bulk", json=rows, headers=headers)
+        assert r.status_code == 201
+        assert [(u["index"], u["username"]) for u in r.json()["created"]] == [(0, "u1")]
+        assert [e["index"] for e in r.json()["errors"]] == [1, 2]
+
+        r = await client.post("/api/tokens", headers=get_basic_auth_header("u1", "pw"))
+        assert r.status_code == 200
+
+        r = await client.post("/api/users/bulk", json=rows[1:], headers=headers)
+        assert r.status_code == 400
+        assert (await client.post("/api/users/bulk", json=[], headers=headers)).status_code == 400
+
+    run_in_transaction(scenario)
+
+
+class ChunkedDeleteConfig(TestConfig):
+    PROJECT_DELETE_CHUNK_SIZE = 2
+
+
+def test_asgi_updates_only_rows_of_the_given_project():
+    async def scenario(client, session):
+        headers = await add_manager(session)
+        first = (await client.post("/api/projects", json={"name": "p1"}, headers=headers)).json()["id"]
+        other = (await client.post("/api/projects", json={"name": "p2"}, headers=headers)).json()["id"]
+        r = await client.post(f"/api/projects/{other}/tasks/bulk",
+                              json=[{"name": f"task-{i}", "status": "NEW"} for i in range(3)],
+                              headers=headers)
+        task_id = r.json()["ids"][0]
+
+        r = await client.put(f"/api/projects/{first}/tasks/{task_id}", json={"status": "DONE"},
+                             headers=headers)
+        assert r.status_code == 404
+        r = await client.put(f"/api/projects/{other}/tasks/{task_id}", json=["DONE"], headers=headers)
+        assert r.status_code == 400
+        r = await client.put(f"/api/projects/{other}/tasks/{task_id}", json={"status": "DONE"},
+                             headers=headers)
+        assert r.json() == {"id": task_id, "name": "task-0", "status": "DONE"}
+
+        r = await client.put("/api/projects/0", json={"name": "missing"}, headers=headers)
+        assert r.status_code == 404
+        r = await client.put(f"/api/projects/{first}", json={"name": "renamed"}, headers=headers)
+        assert r.json() == {"id": first, "name": "renamed", "description": None}
+
+        assert (await client.delete(f"/api/projects/{other}", headers=headers)).status_code == 204
+        assert (await client.get(f"/api/projects/{other}", headers=headers)).status_code == 404
+        r = await client.get(f"/api/projects/{other}/tasks", headers=headers)
+        assert r.status_code == 404
+
+    run_in_transaction(scenario, ChunkedDeleteConfig)
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+from conftest import TestConfig
+from projects.entrypoints.flask import create_app
+from projects.entrypoints.flask.spec import build_document
+
+
+def test_spec_is_served_with_etag(test_client):
+    r = test_client.get("/static/swagger.json")
+    assert r.status_code == 200
+    assert "/api/projects" in r.get_json()["paths"]
+    assert r.headers["ETag"]
+
+    r = test_client.get("/static/swagger.json", headers={"If-None-Match": r.headers["ETag"]})
+    assert r.status_code == 304
+    assert r.data == b""
+
+
+def test_spec_is_loaded_from_prebuilt_file(test_client, tmp_path):
+    path = tmp_path / "openapi.json"
+    path.write_bytes(build_document(test_client.application).body)
+
+    class FileConfig(TestConfig):
+        OPENAPI_SPEC_MODE = "file"
+        OPENAPI_SPEC_FILE = str(path)
+
+    app = create_app(FileConfig)
+    assert not hasattr(app, "spec")
+
+    r = app.test_client().get("/static/swagger.json")
+    assert r.data == path.read_bytes()
+    assert r.headers["ETag"] == test_client.get("/static/swagger.json").headers["ETag"]
+
+
+def test_import_does_not_load_spec_or_migration_tooling():
+    code = ("import sys, projects.entrypoints.flask; "
+            "print(' '.join(m for m in ('apispec', 'marshmallow', 'flask_migrate', "
+            "'alembic', 'flask_swagger_ui') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,152 @@
+import logging
+
+from sqlalchemy import event, text
+
+from conftest import TestConfig
+from projects.adapters.cache import LocalCacheBackend, entity_cache
+from projects.domain.user import User
+from projects.entrypoints.flask import create_app
+from projects.entrypoints.flask.api import projects as projects_api
+from projects.service_layer.projects import handlers as project_handlers
+from projects.service_layer.tasks import handlers as task_handlers
+from projects.service_layer.unit_of_work import make_unit_of_work
+
+
+def test_writes_are_single_statements(test_client, manager_user, database):
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+    test_client.get("/api/users", headers=auth_header)
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "SAVEPOINT" not in statement:
+            statements.append(statement.split()[0])
+
+    def request(method, url, json):
+        statements.clear()
+        r = test_client.open(url, method=method, json=json, headers=auth_header)
+        assert r.status_code in (200, 201)
+        return r.get_json()
+
+    event.listen(database.engine, "before_cursor_execute", count)
+    try:
+        project = request("POST", "/api/projects", {"name": "project-01"})
+        assert project["name"] == "project-01"
+        assert statements == ["INSERT"]
+
+        updated = request("PUT", f"/api/projects/{project['id']}",
+                          {"name": "project-02", "description": "renamed"})
+        assert updated == {"id": project["id"], "name": "project-02", "description": "renamed"}
+        assert statements == ["UPDATE"]
+
+        task = request("POST", f"/api/projects/{project['id']}/tasks",
+                       {"name": "task-01", "status": "NEW"})
+        assert task["name"] == "task-01" and task["status"] == "NEW"
+        # The route looks the project up first; nothing is read back after the INSERT.
+        assert statements[-1:] == ["INSERT"] and "UPDATE" not in statements
+
+        updated = request("PUT", f"/api/projects/{project['id']}/tasks/{task['id']}",
+                          {"status": "DONE"})
+        assert updated == {"id": task["id"], "name": "task-01", "status": "DONE"}
+        assert statements == ["UPDATE"]
+    finally:
+        event.remove(database.engine, "before_cursor_execute", count)
+
+
+def test_update_missing_project_returns_404(test_client, manager_user):
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+    r = test_client.put("/api/projects/999999", json={"name": "missing"}, headers=auth_header)
+    assert r.status_code == 404
+
+
+def test_delete_project_with_tasks(test_client, manager_user, database, monkeypatch):
+    monkeypatch.setitem(test_client.application.config, 'PROJECT_DELETE_CHUNK_SIZE', 2)
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+    project = test_client.post("/api/projects", json={"name": "project-01"},
+                               headers=auth_header).get_json()
+    test_client.post(f"/api/projects/{project['id']}/tasks/bulk",
+                     json=[{"name": f"task-{i}", "status": "NEW"} for i in range(5)],
+                     headers=auth_header)
+
+    r = test_client.delete(f"/api/projects/{project['id']}", headers=auth_header)
+
+    assert r.status_code == 204
+    assert test_client.get(f"/api/projects/{project['id']}", headers=auth_header).status_code == 404
+    assert database.session.scalar(
+        text("SELECT count(*) FROM tasks WHERE project_id = :id"), {"id": project["id"]}) == 0
+
+
+def test_delete_project_evicts_its_tasks_from_the_entity_cache(
+        test_client, manager_user, database, monkeypatch):
+    monkeypatch.setitem(test_client.application.config, 'PROJECT_DELETE_CHUNK_SIZE', 2)
+    monkeypatch.setattr(entity_cache, 'backend', LocalCacheBackend(100))
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+    project = test_client.post("/api/projects", json={"name": "project-01"},
+                               headers=auth_header).get_json()
+    ids = test_client.post(f"/api/projects/{project['id']}/tasks/bulk",
+                           json=[{"name": f"task-{i}"} for i in range(3)],
+                           headers=auth_header).get_json()["ids"]
+    assert all(make_unit_of_work(database).tasks.get(id) for id in ids)
+
+    assert test_client.delete(f"/api/projects/{project['id']}", headers=auth_header).status_code == 204
+
+    assert [make_unit_of_work(database).tasks.get(id) for id in ids] == [None, None, None]
+
+
+def test_deleting_a_project_row_cascades_to_its_tasks(test_client, manager_user, database):
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+    project = test_client.post("/api/projects", json={"name": "project-01"},
+                               headers=auth_header).get_json()
+    test_client.post(f"/api/projects/{project['id']}/tasks/bulk",
+                     json=[{"name": f"task-{i}"} for i in range(3)], headers=auth_header)
+
+    database.session.execute(text("DELETE FROM projects WHERE id = :id"), {"id": project["id"]})
+
+    assert database.session.scalar(
+        text("SELECT count(*) FROM tasks WHERE project_id = :id"), {"id": project["id"]}) == 0
+
+
+class BackgroundDeleteConfig(TestConfig):
+    REPOSITORY_BACKEND = 'memory'
+    PROJECT_DELETE_CHUNK_SIZE = 2
+    PROJECT_DELETE_IN_BACKGROUND = True
+
+
+def test_delete_project_in_background(caplog):
+    caplog.set_level(logging.INFO)
+    app = create_app(BackgroundDeleteConfig)
+    client = app.test_client()
+    with app.app_context():
+        user = User(username="manager", email="manager@example.com", is_manager=True)
+        user.issue_token()
+        uow = make_unit_of_work(None)
+        uow.users.create(user)
+    auth_header = {'Authorization': f'Bearer {user.token}'}
+    project = client.post("/api/projects", json={"name": "project-01"}, headers=auth_header).get_json()
+    client.post(f"/api/projects/{project['id']}/tasks/bulk",
+                json=[{"name": f"task-{i}"} for i in range(5)], headers=auth_header)
+
+    assert client.delete(f"/api/projects/{project['id']}", headers=auth_header).status_code == 202
+    projects_api._background_deletes.submit(lambda: None).result()
+    assert f"flask main delete-project {project['id']}" in caplog.text
+
+    assert uow.projects.get(project['id']) is None
+    assert uow.tasks.list(project['id']) == []
+
+
+def test_delete_project_command_finishes_a_delete():
+    app = create_app(BackgroundDeleteConfig)
+    with app.app_context():
+        uow = make_unit_of_work(None)
+        project = project_handlers.create_project("project-01", None, uow)
+        task_handlers.create_tasks(project.id, [{"name": f"task-{i}"} for i in range(5)], uow)
+    runner = app.test_cli_runner()
+
+    # Commands run in the current app context, which is this app's.
+    with app.app_context():
+        result = runner.invoke(args=["main", "delete-project", str(project.id)])
+        assert result.exit_code == 0, result.output
+        assert uow.projects.get(project.id) is None
+        assert uow.tasks.list(project.id) == []
+
+        result = runner.invoke(args=["main", "delete-project", str(project.id)])
+        assert result.exit_code == 1 and "not found" in result.output
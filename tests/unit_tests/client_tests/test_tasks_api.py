@@ -0,0 +1,90 @@
+import pytest
+
+from conftest import TestConfig
+from projects.domain.user import User
+from projects.entrypoints.flask import create_app
+from projects.service_layer.unit_of_work import make_unit_of_work
+
+
+class MemoryConfig(TestConfig):
+    REPOSITORY_BACKEND = 'memory'
+
+
+@pytest.fixture
+def memory_client():
+    app = create_app(MemoryConfig)
+    with app.app_context():
+        user = User(username="manager", email="manager@example.com", is_manager=True)
+        user.issue_token()
+        make_unit_of_work(None).users.create(user)
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {user.token}'
+    return client
+
+
+def create_project_with_tasks(client, count):
+    project = client.post("/api/projects", json={"name": "project-01"}).get_json()
+    client.post(f"/api/projects/{project['id']}/tasks/bulk",
+                json=[{"name": f"task-{i}", "status": "NEW"} for i in range(count)])
+    return project['id']
+
+
+@pytest.mark.parametrize("body", [
+    {"status": "ARCHIVED", "filter": {}},
+    {"status": "ARCHIVED", "filter": {"status": None}},
+    {"status": "ARCHIVED", "filter": {"status": ["NEW"]}},
+    ["ARCHIVED"],
+    "ARCHIVED",
+    {"status": None, "ids": [1]},
+    {"status": ["ARCHIVED"], "ids": [1]},
+    {"status": {"value": "ARCHIVED"}, "filter": {"status": "NEW"}},
+    {"status": "ARCHIVED", "ids": [True]},
+])
+def test_update_tasks_status_rejects_invalid_body(memory_client, body):
+    project_id = create_project_with_tasks(memory_client, 2)
+
+    r = memory_client.patch(f"/api/projects/{project_id}/tasks", json=body)
+
+    assert r.status_code == 400
+    tasks = memory_client.get(f"/api/projects/{project_id}/tasks").get_json()["items"]
+    assert {t["status"] for t in tasks} == {"NEW"}
+
+
+@pytest.mark.parametrize("item, message", [
+    ({"name": 123}, "task 1 must include name"),
+    ({"name": ["task"]}, "task 1 must include name"),
+    ({"name": "task", "status": 1}, "task 1 status must be a string"),
+    ({"name": "task", "status": {"value": "NEW"}}, "task 1 status must be a string"),
+])
+def test_create_tasks_rejects_invalid_items(memory_client, item, message):
+    project_id = create_project_with_tasks(memory_client, 0)
+
+    r = memory_client.post(f"/api/projects/{project_id}/tasks/bulk",
+                           json=[{"name": "task-0", "status": None}, item])
+
+    assert r.status_code == 400
+    assert r.get_json()["message"] == message
+    # Nothing was created: the task list of an empty project is a 404.
+    assert memory_client.get(f"/api/projects/{project_id}/tasks").status_code == 404
+
+
+def test_update_task_status_only_in_its_own_project(memory_client):
+    first = create_project_with_tasks(memory_client, 1)
+    other = create_project_with_tasks(memory_client, 1)
+    task_id = memory_client.get(f"/api/projects/{other}/tasks").get_json()["items"][0]["id"]
+
+    assert memory_client.put(f"/api/projects/{first}/tasks/{task_id}",
+                             json={"status": "DONE"}).status_code == 404
+    assert memory_client.put(f"/api/projects/0/tasks/{task_id}",
+                             json={"status": "DONE"}).status_code == 404
+    r = memory_client.put(f"/api/projects/{other}/tasks/{task_id}", json={"status": "DONE"})
+    assert r.status_code == 200 and r.get_json()["status"] == "DONE"
+
+
+def test_update_tasks_status_of_unknown_project_returns_404(memory_client):
+    project_id = create_project_with_tasks(memory_client, 1)
+
+    r = memory_client.patch("/api/projects/0/tasks", json={"status": "DONE", "ids": [1]})
+    assert r.status_code == 404
+    r = memory_client.patch(f"/api/projects/{project_id}/tasks", json={"status": "DONE", "ids": [0]})
+    assert r.status_code == 200 and r.get_json() == []
@@ -1,3 +1,10 @@
+from sqlalchemy import select
+
+from conftest import get_basic_auth_header
+from projects.adapters import instrumentation
+from projects.adapters.users.orm import users
+from projects.domain.user import User
+
 
 #def test_get_manager(test_client, manager_user):
 #    resp = test_client.get("/api/users/user-by-username/manager1")
@@ -17,3 +24,108 @@ def test_add_user(test_client, manager_user):
     #import ipdb;ipdb.set_trace()
     #user = database.session.query(User).filter_by(username="u").one()
     #assert user is not None
+
+
+def test_revoked_token_is_rejected(test_client, manager_user):
+    auth_header = {
+        'Authorization': f'Bearer {manager_user.token}'
+    }
+    assert test_client.get("/api/users", headers=auth_header).status_code == 200
+
+    r = test_client.delete("/api/tokens", headers=auth_header)
+    assert r.status_code == 204
+
+    assert test_client.get("/api/users", headers=auth_header).status_code == 401
+
+
+def test_access_token_mode(test_client, manager_user, monkeypatch):
+    monkeypatch.setitem(test_client.application.config, 'TOKEN_AUTH_MODE', 'jwt')
+    basic_auth_header = get_basic_auth_header('manager1', 'secret')
+    token = test_client.post('/api/tokens', headers=basic_auth_header).get_json()['token']
+    assert token != manager_user.token
+
+    auth_header = {'Authorization': f'Bearer {token}'}
+    assert test_client.get("/api/users", headers=auth_header).status_code == 200
+    assert test_client.delete("/api/tokens", headers=auth_header).status_code == 204
+    assert test_client.get("/api/users", headers=auth_header).status_code == 401
+
+
+def test_get_users_is_paginated(test_client, manager_user, database):
+    for i in range(5):
+        database.session.add(User(f"test-user-0{i}", f"test-user-0{i}@example.com"))
+    database.session.commit()
+    auth_header = {
+        'Authorization': f'Bearer {manager_user.token}'
+    }
+
+    r = test_client.get("/api/users?limit=4", headers=auth_header)
+    page = r.get_json()
+    assert [u["username"] for u in page["items"]] == [
+        "manager1", "test-user-00", "test-user-01", "test-user-02"]
+    assert page["_meta"]["next_cursor"] == "test-user-02"
+
+    r = test_client.get(page["_links"]["next"], headers=auth_header)
+    page = r.get_json()
+    assert [u["username"] for u in page["items"]] == ["test-user-03", "test-user-04"]
+    assert page["_meta"]["next_cursor"] is None
+    assert page["_links"]["next"] is None
+
+
+def test_get_users_can_stream(test_client, manager_user, database):
+    for i in range(3):
+        database.session.add(User(f"test-user-0{i}", f"test-user-0{i}@example.com"))
+    database.session.commit()
+    auth_header = {
+        'Authorization': f'Bearer {manager_user.token}'
+    }
+
+    r = test_client.get("/api/users?stream=1", headers=auth_header)
+    assert r.is_streamed
+    assert [u["username"] for u in r.get_json()] == [
+        "manager1", "test-user-00", "test-user-01", "test-user-02"]
+
+
+def test_add_users_in_bulk(test_client, manager_user):
+    auth_header = {
+        'Authorization': f'Bearer {manager_user.token}'
+    }
+    data = [
+        {"username": "test-user-01", "password": "secret", "email": "test-user-01@example.com"},
+        {"username": "manager1", "password": "secret", "email": "test-user-02@example.com"},
+        {"username": ["test-user-03"], "password": "secret", "email": "test-user-03@example.com"},
+    ]
+    r = test_client.post("/api/users/bulk", json=data, headers=auth_header)
+
+    assert r.status_code == 201
+    assert [u["username"] for u in r.json["created"]] == ["test-user-01"]
+    assert r.json["created"][0]["id"] is not None
+    assert r.json["errors"] == [
+        {"index": 1, "error": "please use a different username"},
+        {"index": 2, "error": "username, email and password must be strings"},
+    ]
+
+
+def test_db_query_headers_and_budget(test_client, manager_user, monkeypatch, caplog):
+    monkeypatch.setitem(test_client.application.config, 'DB_QUERY_HEADERS', True)
+    monkeypatch.setitem(test_client.application.config, 'DB_QUERY_BUDGET', 1)
+    auth_header = {'Authorization': f'Bearer {manager_user.token}'}
+
+    r = test_client.get("/api/users", headers=auth_header)
+
+    assert int(r.headers['X-DB-Queries']) >= 2
+    assert float(r.headers['X-DB-Time']) > 0
+    assert 'GET /api/users over DB budget' in caplog.text
+
+
+def test_repeated_statements_are_flagged(database):
+    token = instrumentation.start_recording()
+    try:
+        for i in range(5):
+            database.session.execute(select(users).where(users.c.id == i)).all()
+        recorder = instrumentation.current_recorder()
+    finally:
+        instrumentation.stop_recording(token)
+
+    [(shape, count)] = recorder.repeated(5)
+    assert count == 5 and shape.startswith('SELECT users.id')
+    assert instrumentation.current_recorder() is None
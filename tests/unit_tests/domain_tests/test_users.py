@@ -7,9 +7,36 @@ def test_password_hashing():
     assert not u.check_password('notsecret')
     assert u.check_password('secret')
 
+def test_password_hashing_uses_the_configured_method(monkeypatch):
+    monkeypatch.setattr(User, 'password_hash_method', 'pbkdf2:sha256:1000')
+    u = User(username='test-user-01', email='test-user-01@example.com')
+    u.set_password('secret')
+    assert u.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert u.check_password('secret')
+
 def test_get_roles():
     u = User(username='test-user-01', email='test-user-01@example.com')
     assert not u.get_roles()
 
     u = User(username='test-user-01', email='test-user-01@example.com', is_manager=True)
     assert u.get_roles() == "manager"
+
+def test_access_token_round_trip():
+    u = User(username='test-user-01', email='test-user-01@example.com', is_manager=True)
+    u.id = 7
+    token = u.get_access_token('secret', expires_in=60)
+
+    claims = User.decode_access_token(token, 'secret')
+    assert claims['sub'] == '7'
+    assert claims['role'] == 'manager'
+    assert User.decode_access_token(token, 'other-secret') is None
+
+    restored = User.from_access_token_claims(claims)
+    assert restored.id == 7
+    assert restored.get_roles() == "manager"
+
+def test_expired_access_token_is_rejected():
+    u = User(username='test-user-01', email='test-user-01@example.com')
+    u.id = 7
+    token = u.get_access_token('secret', expires_in=-1)
+    assert User.decode_access_token(token, 'secret') is None
@@ -1,6 +1,14 @@
+from sqlalchemy import event
 from sqlalchemy.sql import text
 from projects.domain.project import Project
-from projects.adapters.projects.repository import SqlAlchemyProjectRepository
+import pytest
+
+from projects.adapters.cache import (
+    EntityCache, KeyValueCacheBackend, LocalCacheBackend,
+)
+from projects.adapters.projects.repository import (
+    CachingProjectRepository, SqlAlchemyProjectRepository,
+)
 
 # Helper function for creating a project
 def insert_project(session, name, description):
@@ -77,4 +85,63 @@ def test_repository_can_list_projects(database):
     assert projects[0].description == "Description 1"
     assert projects[1].description == "Description 2"
     assert projects[2].description == "Description 3"
-    
\ No newline at end of file
+    
+# Test that embedded tasks are loaded in one batch rather than per project
+def test_repository_can_list_projects_with_tasks(database):
+    project_ids = [
+        insert_project(database.session, f"test-project-0{i}", f"Description {i}")
+        for i in range(3)
+    ]
+    for project_id in project_ids:
+        for name in ("task-01", "task-02"):
+            database.session.execute(
+                text("INSERT INTO tasks (project_id, name, status) VALUES (:project_id, :name, 'NEW')"),
+                dict(project_id=project_id, name=name),
+            )
+    database.session.expire_all()
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(database.engine, "before_cursor_execute", count)
+    try:
+        repo = SqlAlchemyProjectRepository(database.session)
+        projects = repo.list(include_tasks=True)
+        assert [[t.name for t in p.tasks] for p in projects] == [["task-01", "task-02"]] * 3
+    finally:
+        event.remove(database.engine, "before_cursor_execute", count)
+
+    assert len(statements) == 2
+
+
+# Test that a cached project is served to a later session without a query
+@pytest.mark.parametrize("backend", [LocalCacheBackend, KeyValueCacheBackend])
+def test_caching_repository_reads_through(database, backend):
+    project_id = insert_project(database.session, "test-project-01", "Old Description")
+    cache = EntityCache(backend(), ttl=60)
+
+    repo = CachingProjectRepository(SqlAlchemyProjectRepository(database.session), cache)
+    repo.get(project_id)
+    database.session.expunge_all()
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(database.engine, "before_cursor_execute", count)
+    try:
+        retrieved = repo.get(project_id)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", count)
+
+    assert statements == []
+    assert retrieved.name == "test-project-01"
+    assert retrieved in database.session
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    retrieved.description = "New Description"
+    repo.update(retrieved)
+    database.session.commit()
+    database.session.expunge_all()
+
+    assert repo.get(project_id).description == "New Description"
+    assert cache.stats()["misses"] == 2
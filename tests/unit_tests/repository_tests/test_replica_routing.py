@@ -0,0 +1,32 @@
+from sqlalchemy import insert, select
+
+from conftest import TestConfig
+from projects.adapters.routing import RoutingSession, replica_engines
+from projects.adapters.tasks.orm import tasks
+from projects.entrypoints.flask import create_app, db
+
+
+class ReplicaConfig(TestConfig):
+    SQLALCHEMY_REPLICA_URIS = [TestConfig.SQLALCHEMY_DATABASE_URI] * 2
+
+
+def test_reads_are_routed_to_replicas_until_the_session_writes():
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        primary = db.engines[None]
+        replicas = set(replica_engines())
+        session = RoutingSession(db)
+        try:
+            assert session.get_bind(clause=select(tasks)) is primary
+
+            session.info['use_replica'] = True
+            chosen = {session.get_bind(clause=select(tasks)) for _ in range(2)}
+            assert chosen == replicas
+            assert session.get_bind(clause=select(tasks).with_for_update()) is primary
+
+            assert session.get_bind(clause=insert(tasks)) is primary
+            assert session.get_bind(clause=select(tasks)) is primary
+        finally:
+            session.close()
+            for engine in [*db.engines.values(), *replicas]:
+                engine.dispose()
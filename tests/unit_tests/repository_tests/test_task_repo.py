@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.sql import text
 from projects.domain.task import Task
 from projects.adapters.tasks.repository import SqlAlchemyTaskRepository
@@ -85,3 +86,102 @@ def test_repository_can_list_tasks(database):
     assert tasks[0].status == "pending"
     assert tasks[1].status == "completed"
     assert tasks[2].status == "pending"
+
+# Test of filtering and paging the task list
+def test_repository_can_filter_and_page_tasks(database):
+    project_id = insert_project(database.session, "test-project-01", "Test Project Description")
+    task_ids = [
+        insert_task(database.session, f"test-task-0{i}", "pending" if i % 2 else "completed", project_id)
+        for i in range(6)
+    ]
+    repo = SqlAlchemyTaskRepository(database.session)
+
+    pending = repo.list(project_id, status="pending")
+    assert [t.id for t in pending] == [task_ids[1], task_ids[3], task_ids[5]]
+
+    page = repo.list(project_id, status="pending", after=task_ids[1], limit=1)
+    assert [t.id for t in page] == [task_ids[3]]
+
+# Test of streaming the task list in batches
+def test_repository_can_stream_tasks(database):
+    project_id = insert_project(database.session, "test-project-01", "Test Project Description")
+    for i in range(5):
+        insert_task(database.session, f"test-task-0{i}", "pending", project_id)
+    repo = SqlAlchemyTaskRepository(database.session)
+    tasks = list(repo.stream(project_id, batch_size=2))
+    assert [t.name for t in tasks] == [f"test-task-0{i}" for i in range(5)]
+
+# Test of counting tasks per status
+def test_repository_can_count_tasks_by_status(database):
+    project1 = insert_project(database.session, "test-project-01", "Test Project Description")
+    project2 = insert_project(database.session, "test-project-02", "Test Project Description")
+    insert_task(database.session, "test-task-01", "pending", project1)
+    insert_task(database.session, "test-task-02", "pending", project1)
+    insert_task(database.session, "test-task-03", "completed", project1)
+    insert_task(database.session, "test-task-04", "completed", project2)
+    repo = SqlAlchemyTaskRepository(database.session)
+
+    assert repo.count_by_status() == {
+        project1: {"pending": 2, "completed": 1},
+        project2: {"completed": 1},
+    }
+    assert repo.count_by_status(project2) == {project2: {"completed": 1}}
+
+# Test of updating the status of many tasks at once
+def test_repository_can_update_status_of_many_tasks(database):
+    project1 = insert_project(database.session, "test-project-01", "Test Project Description")
+    project2 = insert_project(database.session, "test-project-02", "Test Project Description")
+    task1 = insert_task(database.session, "test-task-01", "pending", project1)
+    task2 = insert_task(database.session, "test-task-02", "pending", project1)
+    task3 = insert_task(database.session, "test-task-03", "completed", project1)
+    task4 = insert_task(database.session, "test-task-04", "pending", project2)
+    repo = SqlAlchemyTaskRepository(database.session)
+
+    updated = repo.update_status(project1, "blocked", ids=[task1, task3, task4])
+    assert [(t.id, t.status) for t in updated] == [(task1, "blocked"), (task3, "blocked")]
+
+    updated = repo.update_status(project1, "done", current_status="pending")
+    assert [t.id for t in updated] == [task2]
+    database.session.commit()
+
+    rows = database.session.execute(text("SELECT id, status FROM tasks ORDER BY id"))
+    assert list(rows) == [(task1, "blocked"), (task2, "done"), (task3, "blocked"), (task4, "pending")]
+
+# Test of creating many tasks in batches
+def test_repository_can_create_many_tasks(database):
+    project_id = insert_project(database.session, "test-project-01", "Test Project Description")
+    repo = SqlAlchemyTaskRepository(database.session)
+    ids = repo.create_many(project_id, [
+        {"name": f"test-task-0{i}", "status": "pending"} for i in range(5)
+    ], batch_size=2)
+    database.session.commit()
+
+    rows = database.session.execute(text("SELECT id, name FROM tasks ORDER BY id"))
+    assert list(rows) == [(ids[i], f"test-task-0{i}") for i in range(5)]
+
+# Test that without ordered RETURNING the batches are still one executemany each
+def test_repository_creates_many_tasks_without_ordered_returning(database, monkeypatch):
+    project_id = insert_project(database.session, "test-project-01", "Test Project Description")
+    other_id = insert_project(database.session, "test-project-02", "Test Project Description")
+    repo = SqlAlchemyTaskRepository(database.session)
+    repo.create_many(other_id, [{"name": "test-task-other"}])
+    monkeypatch.setattr(database.session.get_bind().dialect,
+                        "insert_executemany_returning_sort_by_parameter_order", False)
+
+    inserts = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(executemany)
+    event.listen(database.engine, "before_cursor_execute", count)
+    try:
+        ids = repo.create_many(project_id, [
+            {"name": f"test-task-0{i}", "status": "pending"} for i in range(5)
+        ], batch_size=2)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", count)
+    database.session.commit()
+
+    assert inserts == [True, True, False]
+    rows = database.session.execute(
+        text("SELECT id, name FROM tasks WHERE project_id = :id ORDER BY id"), dict(id=project_id))
+    assert list(rows) == [(ids[i], f"test-task-0{i}") for i in range(5)]
@@ -1,7 +1,8 @@
 from sqlalchemy.sql import text
 
 from projects.domain.user import User
-from projects.adapters.users.repository import FlaskSqlAlchemyRepository
+from projects.adapters.cache import EntityCache, InMemoryKeyValueStore, KeyValueCacheBackend
+from projects.adapters.users.repository import CachingUserRepository, FlaskSqlAlchemyRepository
 
 
 def test_repository_can_save_a_user(database):
@@ -34,3 +35,38 @@ def test_repository_can_retrieve_a_user(database):
     assert retrieved == expected  # User.__eq__ only compares reference
     assert retrieved.email == expected.email
 
+
+
+def test_repository_can_list_users_after_cursor(database):
+    for i in range(4):
+        insert_user(database.session, f"test-user-0{i}", f"test-user-0{i}@example.com")
+
+    repo = FlaskSqlAlchemyRepository(database)
+    page = list(repo.list(after="test-user-01", limit=1))
+    assert [u.username for u in page] == ["test-user-02"]
+
+
+def test_cached_users_leave_out_secrets(database):
+    user = User("test-user-01", "test-user-01@example.com")
+    user.set_password("secret")
+    user.issue_token()
+    repo = FlaskSqlAlchemyRepository(database)
+    repo.create(user)
+    database.session.commit()
+    user_id, token = user.id, user.token
+    database.session.expunge_all()
+    store = InMemoryKeyValueStore()
+    cache = EntityCache(KeyValueCacheBackend(store), ttl=60)
+    caching = CachingUserRepository(repo, cache)
+
+    caching.get(user_id)
+    database.session.expunge_all()
+    stored = store.get(f"projects:user:{user_id}")
+    cached = caching.get(user_id)
+
+    assert b"secret" not in stored and token.encode() not in stored
+    assert b"password_hash" not in stored and b"token" not in stored
+    assert cache.stats()["hits"] == 1
+    assert cached.username == "test-user-01"
+    # Left out of the cache, so loaded from the database on access.
+    assert cached.check_password("secret") and cached.token == token
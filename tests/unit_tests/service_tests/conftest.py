@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enable_transactional_tests():
+    """Service tests run against in-memory repositories and need no database."""
+    yield
@@ -0,0 +1,67 @@
+from projects.domain.user import User
+from projects.service_layer.projects import handlers as project_handlers
+from projects.service_layer.tasks import handlers as task_handlers
+from projects.service_layer.users import handlers as user_handlers
+from projects.service_layer.unit_of_work import InMemoryUnitOfWork
+
+
+def test_project_with_tasks():
+    uow = InMemoryUnitOfWork()
+    project = project_handlers.create_project("project-01", "first", uow)
+    other = project_handlers.create_project("project-02", None, uow)
+    ids = task_handlers.create_tasks(project.id, [
+        {"name": f"task-0{i}", "status": "NEW" if i % 2 else "DONE"} for i in range(6)], uow)
+    task_handlers.create_task(other.id, "task-other", "NEW", uow)
+
+    loaded = project_handlers.get_project(project.id, uow, include_tasks=True)
+    assert [t.id for t in loaded.tasks] == ids
+    assert [p.name for p in project_handlers.get_projects(uow)] == ["project-01", "project-02"]
+    assert uow.commits == 4
+
+
+def test_task_indexes_follow_status_changes():
+    uow = InMemoryUnitOfWork()
+    ids = uow.tasks.create_many(1, [{"name": f"task-0{i}", "status": "NEW"} for i in range(5)])
+
+    task_handlers.update_task_status(1, ids[1], "DONE", uow)
+    task_handlers.update_tasks_status(1, "DONE", uow, ids=ids[3:])
+    task_handlers.delete_task(ids[0], uow)
+
+    assert [t.id for t in uow.tasks.list(1, status="NEW")] == [ids[2]]
+    assert [t.id for t in uow.tasks.list(1, status="DONE", after=ids[1], limit=1)] == [ids[3]]
+    assert uow.tasks.count_by_status(1) == {1: {"NEW": 1, "DONE": 3}}
+    assert uow.tasks.list(2) == []
+
+
+def test_user_indexes_follow_updates():
+    uow = InMemoryUnitOfWork()
+    for name in ("carol", "alice", "bob"):
+        uow.users.create(User(username=name, email=f"{name}@example.com"))
+    alice = uow.users.get_by_email("alice@example.com")
+
+    token = user_handlers.issue_new_token(alice, 60, uow)
+    assert uow.users.get_by_token(token) is alice
+    user_handlers.issue_new_token(alice, 60, uow)
+    assert uow.users.get_by_token(token) is None
+
+    assert [u.username for u in uow.users.list(after="alice", limit=1)] == ["bob"]
+    assert uow.users.find_conflicts(["bob"], ["carol@example.com"]) == [
+        uow.users.get_by_username("carol"), uow.users.get_by_username("bob")]
+    user_handlers.delete_user(alice.id, uow)
+    assert uow.users.get_by_username("alice") is None
+
+
+def test_delete_project_removes_its_tasks_in_chunks():
+    uow = InMemoryUnitOfWork()
+    project = project_handlers.create_project("project-01", None, uow)
+    other = project_handlers.create_project("project-02", None, uow)
+    uow.tasks.create_many(project.id, [{"name": f"task-{i}"} for i in range(5)])
+    kept = uow.tasks.create_many(other.id, [{"name": "task-other"}])
+    commits = uow.commits
+
+    project_handlers.delete_project(project.id, uow, chunk_size=2)
+
+    assert uow.commits - commits == 4
+    assert project_handlers.get_project(project.id, uow) is None
+    assert uow.tasks.list(project.id) == []
+    assert [t.id for t in uow.tasks.list(other.id)] == kept
@@ -0,0 +1,99 @@
+from projects.domain.task import Task
+from projects.service_layer.tasks import handlers
+from projects.service_layer.tasks.summary_cache import summary_cache
+from projects.service_layer.unit_of_work import AbstractUnitOfWork
+from projects.adapters.tasks.repository import AbstractTaskRepository
+
+
+class FakeTaskRepository(AbstractTaskRepository):
+
+    def __init__(self, tasks):
+        super().__init__()
+        self._tasks = list(tasks)
+        self.summary_queries = 0
+
+    def create(self, task):
+        task.id = max((t.id for t in self._tasks), default=0) + 1
+        self._tasks.append(task)
+
+    def update(self, task):
+        return task
+
+    def get(self, id):
+        return next((t for t in self._tasks if t.id == id), None)
+
+    def delete(self, task):
+        self._tasks.remove(task)
+
+    def list(self, project_id, status=None, after=None, limit=None):
+        tasks = [t for t in self._tasks if t.project_id == project_id
+                 and (status is None or t.status == status)
+                 and (after is None or t.id > after)]
+        return tasks[:limit]
+
+    def create_many(self, project_id, tasks, batch_size=1000):
+        ids = []
+        for t in tasks:
+            task = Task(project_id=project_id, name=t["name"], status=t.get("status"))
+            self.create(task)
+            ids.append(task.id)
+        return ids
+
+    def update_status(self, project_id, status, ids=None, current_status=None):
+        tasks = [t for t in self._tasks if t.project_id == project_id
+                 and (ids is None or t.id in ids)
+                 and (current_status is None or t.status == current_status)]
+        for t in tasks:
+            t.status = status
+        return tasks
+
+    def count_by_status(self, project_id=None):
+        self.summary_queries += 1
+        counts = {}
+        for t in self._tasks:
+            if project_id is None or t.project_id == project_id:
+                statuses = counts.setdefault(t.project_id, {})
+                statuses[t.status] = statuses.get(t.status, 0) + 1
+        return counts
+
+
+class FakeUnitOfWork(AbstractUnitOfWork):
+
+    def __init__(self, tasks):
+        super().__init__()
+        self.tasks = tasks
+        self.commits = 0
+
+    def _commit(self):
+        self.commits += 1
+
+    def _rollback(self):
+        pass
+
+
+def test_task_summary_is_cached():
+    summary_cache.clear()
+    repo = FakeTaskRepository([Task(id=1, project_id=1, name="task-01", status="NEW")])
+    uow = FakeUnitOfWork(repo)
+
+    assert handlers.get_task_summary(uow) == {1: {"NEW": 1}}
+    assert handlers.get_task_summary(uow) == {1: {"NEW": 1}}
+    assert repo.summary_queries == 1
+
+
+def test_task_changes_invalidate_summary():
+    summary_cache.clear()
+    repo = FakeTaskRepository([Task(id=1, project_id=1, name="task-01", status="NEW")])
+    uow = FakeUnitOfWork(repo)
+    handlers.get_task_summary(uow)
+    handlers.get_task_summary(uow, 1)
+
+    handlers.update_task_status(1, 1, "DONE", uow)
+    assert handlers.get_task_summary(uow) == {1: {"DONE": 1}}
+    assert handlers.get_task_summary(uow, 1) == {1: {"DONE": 1}}
+
+    handlers.create_task(1, "task-02", "NEW", uow)
+    assert handlers.get_task_summary(uow, 1) == {1: {"DONE": 1, "NEW": 1}}
+
+    handlers.delete_task(1, uow)
+    assert handlers.get_task_summary(uow) == {1: {"NEW": 1}}
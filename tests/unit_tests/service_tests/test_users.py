@@ -1,33 +1,26 @@
-#import pytest
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
 
 from projects.domain.user import User
 from projects.service_layer.users import handlers
+from projects.service_layer.users.password_hasher import (
+    PasswordHasher, PasswordHasherBusy, password_hasher,
+)
+from projects.service_layer.users.token_cache import TokenCache, token_cache
+from projects.service_layer.users.token_denylist import (
+    TokenDenylist, make_denylist_backend, token_denylist)
+from projects.service_layer.unit_of_work import AbstractUnitOfWork
 from projects.adapters.users.repository import AbstractRepository as UsersAbstractRepository
-
-
-class FakeSession:
-    committed = False
-
-    def commit(self):
-        print("FakeSession.commit called --")
-        self.committed = True
-
-
-
-class FakeFlaskSQLAlchemy:
-
-    def __init__(self, session: FakeSession):
-        super().__init__()
-        self.session = session
-
+from projects.adapters.cache import InMemoryKeyValueStore, KeyValueCacheBackend
 
 
 class FakeUsersRepository(UsersAbstractRepository):
 
-    def __init__(self, users, db: FakeFlaskSQLAlchemy):
+    def __init__(self, users):
         super().__init__()
         self._users = set(users)
-        self.db = db
 
     def create(self, user):
         self._users.add(user)
@@ -35,8 +28,10 @@ class FakeUsersRepository(UsersAbstractRepository):
     def get(self, id):
         return next(u for u in self._users if u.id == id)
 
-    def list(self):
-        return list(self._users)
+    def list(self, after=None, limit=None):
+        users = sorted(self._users, key=lambda u: u.username)
+        users = [u for u in users if after is None or u.username > after]
+        return users[:limit]
 
     def delete(self, user: User) -> None: 
         self._users.remove(user)
@@ -52,7 +47,28 @@ class FakeUsersRepository(UsersAbstractRepository):
 
     def update(self, user: User) -> User:
         return user
-        
+
+    def find_conflicts(self, usernames, emails):
+        return [u for u in self._users if u.username in usernames or u.email in emails]
+
+
+class FakeUnitOfWork(AbstractUnitOfWork):
+
+    def __init__(self, users):
+        super().__init__()
+        self.users = users
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def committed(self):
+        return self.commits > 0
+
+    def _commit(self):
+        self.commits += 1
+
+    def _rollback(self):
+        self.rollbacks += 1
 
 
 
@@ -69,14 +85,13 @@ def test_returns_user():
     u5 = User(username='test-user-05', email='test-user-05@example.com')
     u5.id = 5
 
-    db = FakeFlaskSQLAlchemy(session=FakeSession())
-
-    repo = FakeUsersRepository([u1, u2, u3, u4, u5], db)
-    user1  = handlers.get_user(u1.id, repo)
-    user2 = handlers.get_user(u2.id, repo)
-    user3 = handlers.get_user(u3.id, repo)
-    user4 = handlers.get_user(u4.id, repo)
-    user5 = handlers.get_user(u5.id, repo)
+    repo = FakeUsersRepository([u1, u2, u3, u4, u5])
+    uow = FakeUnitOfWork(repo)
+    user1  = handlers.get_user(u1.id, uow)
+    user2 = handlers.get_user(u2.id, uow)
+    user3 = handlers.get_user(u3.id, uow)
+    user4 = handlers.get_user(u4.id, uow)
+    user5 = handlers.get_user(u5.id, uow)
 
     assert user1.id == 1
     assert user2.id == 2
@@ -89,8 +104,219 @@ def test_commits():
 
     u1 = User(username='test-user-01', email='test-user-01@example.com')
     u1.id = 1
-    db = FakeFlaskSQLAlchemy(session=FakeSession())
-    repo = FakeUsersRepository([u1], db)
-    _  = handlers.update_user(u1, repo)
+    repo = FakeUsersRepository([u1])
+    uow = FakeUnitOfWork(repo)
+    _  = handlers.update_user(u1, uow)
+
+    assert uow.committed
+
+
+class CountingUsersRepository(FakeUsersRepository):
+    token_lookups = 0
+
+    def get_by_token(self, token: str) -> User:
+        self.token_lookups += 1
+        return super().get_by_token(token)
+
+
+def test_check_token_is_cached():
+    token_cache.clear()
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.issue_token()
+    repo = CountingUsersRepository([u1])
+    uow = FakeUnitOfWork(repo)
+
+    assert handlers.check_token(u1.token, uow) is u1
+    assert handlers.check_token(u1.token, uow) is u1
+
+    assert repo.token_lookups == 1
+    assert token_cache.stats()['hits'] == 1
+    assert token_cache.stats()['misses'] == 1
+
+
+def test_revoke_token_invalidates_cache():
+    token_cache.clear()
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.issue_token()
+    repo = CountingUsersRepository([u1])
+    uow = FakeUnitOfWork(repo)
+
+    handlers.check_token(u1.token, uow)
+    handlers.revoke_token(u1, uow)
+
+    assert handlers.check_token(u1.token, uow) is None
+    assert repo.token_lookups == 2
+
+
+def test_revoked_token_is_rejected_by_workers_that_cached_it():
+    token_cache.clear()
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.issue_token()
+    token = u1.token
+    uow = FakeUnitOfWork(CountingUsersRepository([u1]))
+    stale = uow.users.detach(u1)
+
+    handlers.revoke_token(u1, uow)
+    # Another worker still holds the lookup from before the revocation.
+    token_cache.set(token, stale)
+
+    assert token in token_denylist
+    assert handlers.check_token(token, uow) is None
+    assert token_cache.get(token) is None
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(maxsize=2, ttl=60)
+    users = []
+    for i in range(3):
+        u = User(username=f'test-user-0{i}', email=f'test-user-0{i}@example.com')
+        u.id = i
+        u.issue_token()
+        cache.set(u.token, u)
+        users.append(u)
+
+    assert cache.get(users[0].token) is None
+    assert cache.get(users[2].token) is users[2]
+    assert cache.stats()['size'] == 2
+
+
+def test_revoked_access_token_is_rejected():
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    token = handlers.issue_access_token(u1, 60, 'secret')
+
+    assert handlers.check_access_token(token, 'secret').id == 1
+    handlers.revoke_access_token(token, 'secret')
+    assert handlers.check_access_token(token, 'secret') is None
+
+
+def test_revocations_are_shared_through_the_keyvalue_store():
+    store = InMemoryKeyValueStore()
+    worker_a = TokenDenylist(make_denylist_backend('keyvalue', store))
+    worker_b = TokenDenylist(make_denylist_backend('keyvalue', store))
+    entities = KeyValueCacheBackend(store)
+
+    worker_a.add('jti-1', time.time() + 60)
+    worker_a.add('jti-2', time.time() - 1)
+    entities.clear()
+
+    assert 'jti-1' in worker_b
+    assert 'jti-2' not in worker_b
+    assert 'jti-1' not in TokenDenylist()
+
+
+def test_verify_password_upgrades_outdated_hash():
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.password_hash = generate_password_hash('secret', 'pbkdf2:sha256:1000')
+    repo = FakeUsersRepository([u1])
+    uow = FakeUnitOfWork(repo)
+
+    assert not handlers.verify_password(u1, 'wrong', uow)
+    assert not uow.committed
+
+    assert handlers.verify_password(u1, 'secret', uow)
+    assert uow.committed
+    assert not password_hasher.needs_rehash(u1.password_hash)
+    assert u1.check_password('secret')
+
+
+def test_password_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher('pbkdf2:sha256:1000', max_workers=1, max_queue=0)
+    hasher._slots.acquire()
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash('secret')
+
+
+
+def test_hash_many_without_workers_shares_one_bounded_thread_pool():
+    hasher = PasswordHasher('pbkdf2:sha256:1000', max_workers=0, max_queue=1)
+
+    hashes = hasher.hash_many(['a', 'b'])
+    executor = hasher._executor
+    hasher.hash_many(['c'])
+
+    assert all(hasher.verify(h, p) for h, p in zip(hashes, 'ab'))
+    assert hasher._executor is executor
+    hasher._slots.acquire()
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash_many(['d'])
+
+
+def test_create_users_reports_row_errors():
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    repo = FakeUsersRepository([u1])
+    uow = FakeUnitOfWork(repo)
+
+    created, errors = handlers.create_users([
+        {'username': 'test-user-02', 'email': 'test-user-02@example.com', 'password': 'secret'},
+        {'username': 'test-user-01', 'email': 'other@example.com', 'password': 'secret'},
+        {'username': 'test-user-03', 'email': 'test-user-02@example.com', 'password': 'secret'},
+        {'username': 'test-user-04', 'email': 'test-user-04@example.com'},
+        {'username': 'test-user-05', 'email': 'test-user-05@example.com', 'password': 'secret'},
+        {'username': ['test-user-06'], 'email': 'test-user-06@example.com', 'password': 'secret'},
+        {'username': 'test-user-07', 'email': {'a': 1}, 'password': 'secret'},
+        {'username': 'test-user-08', 'email': 'test-user-08@example.com', 'password': 8},
+    ], uow)
+
+    assert [(i, u.username) for i, u in created] == [(0, 'test-user-02'), (4, 'test-user-05')]
+    assert [e['index'] for e in errors] == [1, 2, 3, 5, 6, 7]
+    assert errors[3]['error'] == 'username, email and password must be strings'
+    assert created[0][1].check_password('secret')
+    assert uow.committed
+
+
+def test_composed_handlers_commit_once():
+    token_cache.clear()
+    user = User(username='test-user-01', email='test-user-01@example.com')
+    uow = FakeUnitOfWork(FakeUsersRepository([]))
+
+    with uow:
+        handlers.create_user(user, uow)
+        handlers.promote_to_manager(user, uow)
+        handlers.issue_new_token(user, 60, uow)
+        uow.commit()
+
+    assert uow.commits == 1
+    assert user.is_manager and user.token
+
+
+def test_failed_unit_of_work_skips_cache_invalidation():
+    token_cache.clear()
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.issue_token()
+    uow = FakeUnitOfWork(FakeUsersRepository([u1]))
+    handlers.check_token(u1.token, uow)
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            handlers.promote_to_manager(u1, uow)
+            raise RuntimeError
+
+    assert uow.commits == 0
+    assert token_cache.get(u1.token) is not None
+
+
+def test_unit_of_work_left_without_commit_rolls_back():
+    token_cache.clear()
+    u1 = User(username='test-user-01', email='test-user-01@example.com')
+    u1.id = 1
+    u1.issue_token()
+    uow = FakeUnitOfWork(FakeUsersRepository([u1]))
+    handlers.check_token(u1.token, uow)
+
+    with uow:
+        handlers.promote_to_manager(u1, uow)
+    assert uow.rollbacks == 1
+
+    with uow:
+        uow.commit()
 
-    assert repo.db.session.committed
+    assert uow.commits == 1 and uow.rollbacks == 1
+    # The callback queued by the abandoned block did not run with the later commit.
+    assert token_cache.get(u1.token) is not None